@@ -0,0 +1,100 @@
+"""Shared plumbing for the benchmark scripts: environment info, result files, baseline comparison."""
+import csv
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Sequence, Tuple
+import numpy as np
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def environment() -> Dict:
+    """Where and on what the numbers were taken, stored next to every result set."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    """Minimum wall time of fn() over repeat calls (the least noisy estimate)."""
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def write_results(stem: str, records: List[Dict], meta: Dict):
+    """Writes <stem>.json (records plus meta) and <stem>.csv (records only)."""
+    os.makedirs(os.path.dirname(os.path.abspath(stem)), exist_ok=True)
+    with open(stem + ".json", "w") as f:
+        json.dump({"meta": meta, "records": records}, f, indent=1)
+    if records:
+        fields = list(dict.fromkeys(k for r in records for k in r))
+        with open(stem + ".csv", "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(records)
+
+
+def load_results(path: str) -> Tuple[Dict, List[Dict]]:
+    """(meta, records) from a file written by write_results."""
+    with open(path) as f:
+        data = json.load(f)
+    return data["meta"], data["records"]
+
+
+def load_records(path: str) -> List[Dict]:
+    return load_results(path)[1]
+
+
+def compare(records: List[Dict], baseline: List[Dict], keys: Sequence[str],
+            metrics: Dict[str, str], tolerance: float) -> List[Dict]:
+    """
+    Matches records to baseline rows on `keys` and compares each metric.
+    metrics maps a field to "higher" or "lower" (which direction is better).
+    ratio is always current/baseline; a row regresses when the metric got worse
+    by more than tolerance (0.2 = 20%).
+    """
+    index = {tuple(r[k] for k in keys): r for r in baseline}
+    rows = []
+    for rec in records:
+        base = index.get(tuple(rec[k] for k in keys))
+        if base is None:
+            continue
+        for metric, better in metrics.items():
+            cur, old = rec.get(metric), base.get(metric)
+            if not cur or not old:
+                continue
+            ratio = cur / old
+            worse = ratio < 1 / (1 + tolerance) if better == "higher" else ratio > 1 + tolerance
+            rows.append(dict({k: rec[k] for k in keys}, metric=metric, baseline=old, current=cur,
+                             ratio=ratio, regression=worse))
+    return rows
+
+
+def print_comparison(rows: List[Dict], keys: Sequence[str]):
+    if not rows:
+        print("no matching baseline entries")
+        return
+    for r in rows:
+        label = " ".join(f"{k}={r[k]}" for k in keys)
+        flag = "  REGRESSION" if r["regression"] else ""
+        print(f"  {label:<48} {r['metric']:<16} {r['baseline']:>12.4g} -> {r['current']:>12.4g}"
+              f"  x{r['ratio']:.2f}{flag}")
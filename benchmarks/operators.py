@@ -0,0 +1,204 @@
+"""
+Micro-benchmarks of the genetic operators and the fitness function: ns/call of each
+kernel over a grid of N and V with fixed seeds, plus the fitted scaling exponent in N
+(1.0 = linear). Fails (exit status 1) when a kernel regresses against stored results.
+mutate_delta / mutate_rescore mutate BROOD children with incremental cost updates
+vs. plainly followed by one batch re-score: the trade-off behind delta_eval.
+
+    python -m benchmarks.operators                   # measure and gate against the baseline
+    python -m benchmarks.operators --save-baseline   # store this run as the baseline
+
+Two gates, both configurable: a kernel is slower than the baseline by more than
+--tolerance at any grid point, or its exponent grew by more than --exponent-tolerance
+(machine independent, catches a linear kernel turning quadratic). --max-exponent
+also applies without any baseline.
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import time
+from typing import Callable, Dict, List
+import numpy as np
+from data.synthetic import generate_instance
+from ga.chromosome import Individual, random_individual
+from ga.fitness import total_distance, evaluate_population
+from ga.operators import (order_crossover, cuts_crossover, swap_mutation_perm, jitter_mutation_cuts,
+                          route_aware_mutation, swap_mutation, jitter_mutation)
+from utils import customers_to_ordered_list, distance_matrix
+from .common import RESULTS_DIR, compare, environment, load_results, print_comparison, write_results
+
+SIZES = (50, 200, 1000, 5000)
+# children per call of the mutate_* kernels, i.e. one evaluation batch
+BROOD = 16
+VEHICLES = (2, 10, 50)
+KEYS = ("kernel", "n", "vehicles")
+
+
+def _kernels(N: int, V: int, seed: int) -> Dict[str, Callable[[], object]]:
+    """Zero-argument callables per kernel on fixed-seed inputs of size N, V."""
+    rng = random.Random(seed)
+    inst = generate_instance(N, V, seed=seed)
+    _, customers_list = customers_to_ordered_list(inst["CUSTOMERS"])
+    dmat = distance_matrix(inst["DEPOT"], customers_list)
+    p1, p2 = random_individual(N, V, rng), random_individual(N, V, rng)
+    mutant = Individual(p1.perm[:], p1.cuts[:])
+    priced = Individual(p2.perm[:], p2.cuts[:])
+    total_distance(priced, dmat, V)
+    scored = Individual(p1.perm[:], p1.cuts[:])
+
+    def score():
+        scored.invalidate()
+        return total_distance(scored, dmat, V)
+
+    # the two ways genetic_algorithm keeps mutated children scored: delta_eval=True
+    # updates each cost through the mutations, delta_eval=False re-scores the brood in
+    # one evaluate_population batch
+    brood = [random_individual(N, V, rng) for _ in range(BROOD)]
+    for ind in brood:
+        total_distance(ind, dmat, V)
+
+    def mutate_delta():
+        for ind in brood:
+            swap_mutation(ind, 0.02, rng, dmat)
+            jitter_mutation(ind, 0.08, N, rng, dmat)
+
+    def mutate_rescore():
+        for ind in brood:
+            swap_mutation_perm(ind.perm, 0.02, rng)
+            jitter_mutation_cuts(ind.cuts, 0.08, N, rng)
+            ind.invalidate()
+        evaluate_population(brood, dmat, V)
+
+    return {
+        "order_crossover": lambda: order_crossover(p1.perm, p2.perm, rng),
+        "cuts_crossover": lambda: cuts_crossover(p1.cuts, p2.cuts, N, V, rng),
+        "swap_mutation_perm": lambda: swap_mutation_perm(mutant.perm, 0.02, rng),
+        "jitter_mutation_cuts": lambda: jitter_mutation_cuts(mutant.cuts, 0.08, N, rng),
+        # pm=1 so every call takes the decode / move / re-encode path
+        "route_aware_mutation": lambda: route_aware_mutation(mutant, 1.0, N, V, rng),
+        "swap_mutation_delta": lambda: swap_mutation(priced, 0.02, rng, dmat),
+        "jitter_mutation_delta": lambda: jitter_mutation(priced, 0.08, N, rng, dmat),
+        "total_distance": score,
+        "mutate_delta": mutate_delta,
+        "mutate_rescore": mutate_rescore,
+    }
+
+KERNELS = tuple(_kernels(10, 2, 0))
+
+
+def _loop_time(fn: Callable[[], object], number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return time.perf_counter() - start
+
+
+def calibrate(fn: Callable[[], object], min_time: float) -> int:
+    """Calls per timing loop so that one loop takes at least min_time."""
+    number = 1
+    while True:
+        elapsed = _loop_time(fn, number)
+        if elapsed >= min_time:
+            return number
+        number *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed * 1.2)))
+
+
+def exponents(records: List[Dict]) -> List[Dict]:
+    """Least-squares slope of log(ns) against log(N) per kernel and V."""
+    out = []
+    for kernel in dict.fromkeys(r["kernel"] for r in records):
+        for V in dict.fromkeys(r["vehicles"] for r in records if r["kernel"] == kernel):
+            pts = [(r["n"], r["ns_per_call"]) for r in records if r["kernel"] == kernel and r["vehicles"] == V]
+            if len(pts) < 2:
+                continue
+            n, ns = np.log(np.array(pts, dtype=float)).T
+            out.append({"kernel": kernel, "vehicles": V, "exponent": float(np.polyfit(n, ns, 1)[0]),
+                        "n_min": int(min(p[0] for p in pts)), "n_max": int(max(p[0] for p in pts))})
+    return out
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    p.add_argument("--vehicles", type=int, nargs="+", default=list(VEHICLES),
+                   help="V values; pairs with V > N/2 are skipped")
+    p.add_argument("--kernels", nargs="+", default=list(KERNELS), choices=KERNELS)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--min-time", type=float, default=0.02, help="seconds per timing loop")
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--out", default=os.path.join(RESULTS_DIR, "operators"), help="output path stem")
+    p.add_argument("--baseline", default=os.path.join(RESULTS_DIR, "operators_baseline.json"))
+    p.add_argument("--save-baseline", action="store_true", help="also store the results as the baseline")
+    p.add_argument("--tolerance", type=float, default=0.5,
+                   help="allowed ns/call slowdown (0.5 = 50%%); tighten on a quiet, pinned machine")
+    p.add_argument("--exponent-tolerance", type=float, default=0.3,
+                   help="allowed growth of a scaling exponent over the baseline")
+    p.add_argument("--max-exponent", type=float, default=1.5,
+                   help="fail any kernel scaling worse than N**max_exponent, baseline or not")
+    return p.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    points = []
+    for N in args.sizes:
+        for V in args.vehicles:
+            if V > N // 2:
+                continue
+            kernels = _kernels(N, V, args.seed)
+            for name in args.kernels:
+                points.append((name, N, V, kernels[name], calibrate(kernels[name], args.min_time)))
+
+    # whole passes over the grid, best per point: a burst of machine noise hits one
+    # pass of every kernel rather than all repeats of one
+    best = [float("inf")] * len(points)
+    for _ in range(max(1, args.repeat)):
+        for i, (_, _, _, fn, number) in enumerate(points):
+            best[i] = min(best[i], _loop_time(fn, number) / number)
+    records = []
+    for (name, N, V, _, number), seconds in zip(points, best):
+        records.append({"kernel": name, "n": N, "vehicles": V, "ns_per_call": seconds * 1e9, "calls": number})
+        print(f"{name:<22} N={N:<6} V={V:<4} {seconds * 1e9:14.0f} ns/call")
+
+    fits = exponents(records)
+    print("\nscaling exponents in N (ns ~ N**k):")
+    for f in fits:
+        print(f"  {f['kernel']:<22} V={f['vehicles']:<4} k={f['exponent']:5.2f}  (N {f['n_min']}..{f['n_max']})")
+
+    meta = dict(environment(), benchmark="operators", seed=args.seed, min_time=args.min_time,
+                repeat=args.repeat, exponents=fits)
+    write_results(args.out, records, meta)
+    print(f"saved {args.out}.json and {args.out}.csv")
+
+    failures = [f"{f['kernel']} V={f['vehicles']}: exponent {f['exponent']:.2f} > {args.max_exponent}"
+                for f in fits if f["exponent"] > args.max_exponent]
+    if os.path.exists(args.baseline):
+        base_meta, base_records = load_results(args.baseline)
+        print(f"comparison against {args.baseline} (tolerance {args.tolerance:.0%}):")
+        rows = compare(records, base_records, KEYS, {"ns_per_call": "lower"}, args.tolerance)
+        print_comparison(rows, KEYS)
+        failures += [f"{r['kernel']} N={r['n']} V={r['vehicles']}: x{r['ratio']:.2f} ns/call"
+                     for r in rows if r["regression"]]
+        base_fits = {(f["kernel"], f["vehicles"]): f["exponent"] for f in base_meta.get("exponents", [])}
+        for f in fits:
+            old = base_fits.get((f["kernel"], f["vehicles"]))
+            if old is not None and f["exponent"] - old > args.exponent_tolerance:
+                failures.append(f"{f['kernel']} V={f['vehicles']}: exponent {old:.2f} -> {f['exponent']:.2f}")
+    else:
+        print(f"no baseline at {args.baseline}; run with --save-baseline to create one")
+    if args.save_baseline:
+        shutil.copyfile(args.out + ".json", args.baseline)
+        print(f"baseline saved to {args.baseline}")
+
+    if failures:
+        print("\nREGRESSIONS:")
+        for line in failures:
+            print(f"  {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Scaling benchmark: distance-matrix build, per-generation cost and end-to-end solve
+time of genetic_algorithm over synthetic instances from 10 to 10,000 customers.
+
+    python -m benchmarks.scaling                    # full ladder
+    python -m benchmarks.scaling --quick            # up to 1,000 customers
+    python -m benchmarks.scaling --save-baseline    # store this run as the baseline
+
+Results go to benchmarks/results/scaling.{json,csv}; when a baseline exists each
+matching case is compared against it. Needs no network and no display.
+"""
+import argparse
+import os
+import shutil
+import sys
+import time
+from data.synthetic import generate_instance
+from ga.ga_solver import genetic_algorithm
+from ga.profiling import Profiler
+from utils import CoordinateDistances, customers_to_ordered_list, distance_matrix
+from .common import RESULTS_DIR, best_of, compare, environment, load_records, print_comparison, write_results
+
+SIZES = (10, 50, 100, 500, 1000, 2000, 5000, 10000)
+QUICK_SIZES = (10, 50, 100, 500, 1000)
+CASES = ("uniform:center", "clustered:center", "uniform:corner")
+KEYS = ("layout", "depot", "n", "vehicles", "engine", "provider")
+# direction in which each compared metric is better
+METRICS = {"build_s": "lower", "per_gen_s": "lower", "solve_s": "lower",
+           "gens_per_s": "higher", "evals_per_s": "higher"}
+
+
+def default_vehicles(n: int) -> int:
+    return max(2, n // 10)
+
+
+def run_case(layout: str, depot: str, n: int, V: int, engine: str, args) -> dict:
+    inst = generate_instance(n, V, layout=layout, depot=depot, seed=args.seed)
+    _, customers_list = customers_to_ordered_list(inst["CUSTOMERS"])
+    dense = n <= args.dense_limit
+    if dense:
+        build = lambda: distance_matrix(inst["DEPOT"], customers_list)
+    else:
+        build = lambda: CoordinateDistances.from_instance(inst["DEPOT"], customers_list)
+    build_s = best_of(build, args.repeat)
+    dmat = build()
+    dmat_mb = (dmat.nbytes if dense else dmat.coords.nbytes + dmat.knn.nbytes) / 2**20
+
+    best = None
+    for _ in range(max(1, args.repeat)):
+        profiler = Profiler()
+        start = time.perf_counter()
+        _, best_cost, _, info = genetic_algorithm(
+            dmat, n, V, pop_size=args.pop, generations=args.generations, k_tourn=3,
+            pc=0.8, pm_perm=0.02, pm_cuts=0.08, seed=args.seed, engine=engine,
+            return_info=True, profiler=profiler)
+        solve_s = time.perf_counter() - start
+        if best is None or solve_s < best[0]:
+            best = (solve_s, best_cost, info, profiler)
+    solve_s, best_cost, info, profiler = best
+
+    gens = info["generations"]
+    init_s = profiler.seconds["init"]
+    per_gen_s = (solve_s - init_s) / gens if gens else 0.0
+    return {
+        "layout": layout, "depot": depot, "n": n, "vehicles": V, "engine": engine,
+        "provider": "dense" if dense else "coordinates",
+        "pop_size": args.pop, "generations": gens,
+        "build_s": build_s, "dmat_mb": dmat_mb,
+        "init_s": init_s, "per_gen_s": per_gen_s, "solve_s": solve_s,
+        "gens_per_s": gens / (solve_s - init_s) if gens else 0.0,
+        "evals": profiler.counts["evals_computed"],
+        "evals_per_s": profiler.counts["evals_computed"] / solve_s,
+        "best_cost": best_cost,
+    }
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--sizes", type=int, nargs="+", help=f"customer counts (default {SIZES})")
+    p.add_argument("--quick", action="store_true", help=f"use the short ladder {QUICK_SIZES}")
+    p.add_argument("--cases", nargs="+", default=list(CASES), help="layout:depot pairs")
+    p.add_argument("--vehicles", type=int, help="vehicles for every size (default max(2, n // 10))")
+    p.add_argument("--engines", nargs="+", default=["objects"], choices=("objects", "arrays"))
+    p.add_argument("--pop", type=int, default=50)
+    p.add_argument("--generations", type=int, default=20)
+    p.add_argument("--repeat", type=int, default=1, help="best of this many timings per case")
+    p.add_argument("--dense-limit", type=int, default=2000,
+                   help="largest n built as a dense matrix; bigger ones use CoordinateDistances")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", default=os.path.join(RESULTS_DIR, "scaling"), help="output path stem")
+    p.add_argument("--baseline", default=os.path.join(RESULTS_DIR, "scaling_baseline.json"))
+    p.add_argument("--save-baseline", action="store_true", help="also store the results as the baseline")
+    p.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown against the baseline")
+    p.add_argument("--fail-on-regression", action="store_true", help="exit with status 1 on a regression")
+    return p.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    sizes = args.sizes or (QUICK_SIZES if args.quick else SIZES)
+    records = []
+    for case in args.cases:
+        layout, depot = case.split(":")
+        for n in sizes:
+            V = min(args.vehicles or default_vehicles(n), n)
+            for engine in args.engines:
+                rec = run_case(layout, depot, n, V, engine, args)
+                records.append(rec)
+                print(f"{layout:>9}/{depot:<6} n={n:<6} V={V:<5} {engine:<7} build {rec['build_s']:8.4f}s"
+                      f"  gen {rec['per_gen_s']*1e3:9.2f}ms  solve {rec['solve_s']:8.3f}s"
+                      f"  {rec['evals_per_s']:10.0f} evals/s  {rec['gens_per_s']:8.2f} gens/s", flush=True)
+
+    meta = dict(environment(), benchmark="scaling", pop_size=args.pop, generations=args.generations,
+                seed=args.seed, repeat=args.repeat)
+    write_results(args.out, records, meta)
+    print(f"saved {args.out}.json and {args.out}.csv")
+
+    status = 0
+    if os.path.exists(args.baseline):
+        print(f"comparison against {args.baseline} (tolerance {args.tolerance:.0%}):")
+        rows = compare(records, load_records(args.baseline), KEYS, METRICS, args.tolerance)
+        print_comparison(rows, KEYS)
+        if args.fail_on_regression and any(r["regression"] for r in rows):
+            status = 1
+    else:
+        print(f"no baseline at {args.baseline}; run with --save-baseline to create one")
+    if args.save_baseline:
+        shutil.copyfile(args.out + ".json", args.baseline)
+        print(f"baseline saved to {args.baseline}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""
+Road-network distances: shortest driving distances over a road graph instead of
+straight lines.
+
+    dmat = road_distance_matrix(depot, customers_list, "roads.edges", "roads.nodes")
+
+Files are whitespace separated, with '#' comments:
+    nodes:  <id> <x> <y>                 node positions, same units as the instance
+    edges:  <u> <v> <length> [<oneway>]  oneway 1 = drivable u -> v only (default 0)
+
+The depot and every customer snap to their nearest road node. Then one Dijkstra per
+snapped point runs across a process pool. The matrix is asymmetric wherever one-way
+streets make it so; index 0 is the depot and 1..N are the customers in
+customers_list order, as with utils.distance_matrix. Results are cached under
+utils.CACHE_DIR/roads, keyed by both files and the points, and memory-mapped on
+later calls.
+"""
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import networkx as nx
+import numpy as np
+from utils import CACHE_DIR, open_matrix
+from .vrplib import file_hash
+
+# bump when the build changes its results, so stale matrices are ignored
+ROADS_CACHE_VERSION = 1
+# query points snapped per block, bounding the (block, nodes) distance temporary
+_SNAP_BLOCK_ELEMS = 1 << 22
+
+
+def _rows(path: str):
+    with open(path) as f:
+        for line in f:
+            line = line.split("#", 1)[0].split()
+            if line:
+                yield line
+
+
+def load_road_graph(edges_path: str, nodes_path: str) -> Tuple[nx.DiGraph, List[str], np.ndarray]:
+    """
+    Directed road graph from an edge list and a node file, streamed line by line.
+    Two-way edges become a pair of arcs; parallel arcs keep the shortest length.
+    Returns (graph, node ids, (M, 2) node coordinates in the same order).
+    """
+    ids, xy = [], []
+    for row in _rows(nodes_path):
+        ids.append(row[0])
+        xy.append((float(row[1]), float(row[2])))
+    known = set(ids)
+
+    graph = nx.DiGraph()
+    graph.add_nodes_from(ids)
+
+    def add(u, v, w):
+        if not graph.has_edge(u, v) or w < graph[u][v]["weight"]:
+            graph.add_edge(u, v, weight=w)
+
+    for row in _rows(edges_path):
+        u, v, w = row[0], row[1], float(row[2])
+        if u not in known or v not in known:
+            raise ValueError(f"{edges_path}: edge {u} -> {v} uses a node missing from {nodes_path}")
+        if w < 0:
+            raise ValueError(f"{edges_path}: edge {u} -> {v} has negative length {w}")
+        add(u, v, w)
+        if len(row) < 4 or row[3] == "0":
+            add(v, u, w)
+    return graph, ids, np.array(xy, dtype=float).reshape(-1, 2)
+
+
+def snap(points: np.ndarray, node_xy: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(index of the nearest node, straight-line distance to it) for every point."""
+    points = np.asarray(points, dtype=float)
+    idx = np.empty(len(points), dtype=np.intp)
+    gap = np.empty(len(points))
+    block = max(1, _SNAP_BLOCK_ELEMS // max(len(node_xy), 1))
+    for start in range(0, len(points), block):
+        p = points[start:start + block]
+        d2 = ((p[:, None, :] - node_xy[None, :, :]) ** 2).sum(axis=2)
+        best = d2.argmin(axis=1)
+        idx[start:start + block] = best
+        gap[start:start + block] = np.sqrt(d2[np.arange(len(p)), best])
+    return idx, gap
+
+
+# per-process graph, set once by the pool initializer rather than sent with every task
+_WORKER: Dict = {}
+
+def _init_worker(graph: nx.DiGraph, targets: List[str]):
+    _WORKER.update(graph=graph, targets=targets)
+
+def _dijkstra_rows(sources: List[str]) -> np.ndarray:
+    graph, targets = _WORKER["graph"], _WORKER["targets"]
+    out = np.empty((len(sources), len(targets)))
+    for r, src in enumerate(sources):
+        dist = nx.single_source_dijkstra_path_length(graph, src, weight="weight")
+        out[r] = [dist.get(t, np.inf) for t in targets]
+    return out
+
+
+def shortest_path_matrix(graph: nx.DiGraph, nodes: List[str], workers: Optional[int] = None,
+                         chunk: int = 16) -> np.ndarray:
+    """
+    (len(nodes), len(nodes)) shortest-path lengths between the given graph nodes, one
+    Dijkstra per distinct source, `chunk` sources per pool task. inf marks unreachable.
+    workers: process count (default the core count); 1 runs in this process.
+    """
+    unique = list(dict.fromkeys(nodes))
+    tasks = [unique[i:i + chunk] for i in range(0, len(unique), chunk)]
+    workers = min(workers or os.cpu_count() or 1, max(1, len(tasks)))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(graph, unique)) as pool:
+            blocks = list(pool.map(_dijkstra_rows, tasks))
+    else:
+        _init_worker(graph, unique)
+        blocks = [_dijkstra_rows(t) for t in tasks]
+        _WORKER.clear()
+    full = np.vstack(blocks) if blocks else np.empty((0, 0))
+    pos = {node: i for i, node in enumerate(unique)}
+    sel = np.array([pos[n] for n in nodes], dtype=np.intp)
+    return full[np.ix_(sel, sel)]
+
+
+def road_distance_matrix(depot: Tuple[float, float], customers_list: List[Tuple[float, float]],
+                         edges_path: str, nodes_path: str, access: bool = True,
+                         workers: Optional[int] = None, cache_dir: Optional[str] = CACHE_DIR) -> np.ndarray:
+    """
+    Asymmetric (N+1)x(N+1) driving-distance matrix, 0 = depot, 1..N = customers_list.
+    access: add each point's straight-line distance to its snapped node on both ends
+    of a trip (off-road approach); False uses node-to-node distances only.
+    Raises ValueError when some point cannot reach another through the graph.
+    cache_dir: None disables the cache.
+    """
+    pts = np.asarray([tuple(depot)] + [tuple(c) for c in customers_list], dtype=float)
+    path = None
+    if cache_dir is not None:
+        h = hashlib.sha256(f"{file_hash(edges_path)}|{file_hash(nodes_path)}|{access}|"
+                           f"v{ROADS_CACHE_VERSION}".encode())
+        h.update(pts.tobytes())
+        path = os.path.join(cache_dir, "roads", h.hexdigest()[:32] + ".npy")
+        if os.path.exists(path):
+            return open_matrix(path)
+
+    graph, ids, node_xy = load_road_graph(edges_path, nodes_path)
+    if not ids:
+        raise ValueError(f"{nodes_path}: no road nodes")
+    idx, gap = snap(pts, node_xy)
+    dmat = shortest_path_matrix(graph, [ids[i] for i in idx], workers=workers)
+    if access:
+        dmat += gap[:, None] + gap[None, :]
+    np.fill_diagonal(dmat, 0)
+    unreachable = np.argwhere(~np.isfinite(dmat))
+    if len(unreachable):
+        i, j = unreachable[0]
+        raise ValueError(f"{len(unreachable)} point pairs have no road path, e.g. {i} -> {j} "
+                         "(0 = depot); the road graph is not strongly connected around them")
+
+    if path is not None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, dmat)
+        os.replace(tmp, path)
+    return dmat
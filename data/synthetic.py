@@ -0,0 +1,57 @@
+import math
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+LAYOUTS = ("uniform", "clustered")
+DEPOT_POSITIONS = ("center", "corner", "random")
+
+def generate_instance(n_customers: int, n_vehicles: int, layout: str = "uniform",
+                      depot: str = "center", seed: int = 0, size: float = 100.0,
+                      n_clusters: Optional[int] = None, demand: Optional[Tuple[int, int]] = None,
+                      fill: float = 0.9) -> Dict:
+    """
+    Seeded synthetic instance in the same {"DEPOT", "CUSTOMERS", "VEHICLES"} form as
+    the hand-written ones, with coordinates in the [0, size] square.
+    layout: "uniform" spreads customers evenly; "clustered" draws them around
+    n_clusters random centers (default about sqrt(n)/2).
+    depot: "center", "corner" (the origin) or "random".
+    demand: (low, high) integer demand range. When given, the instance also has
+    "DEMANDS" (customer key -> demand) and a "CAPACITY" at which n_vehicles
+    vehicles are `fill` full on average; coordinates do not change.
+    The same arguments always give the same instance.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"unknown layout {layout!r}, expected one of {LAYOUTS}")
+    if depot not in DEPOT_POSITIONS:
+        raise ValueError(f"unknown depot position {depot!r}, expected one of {DEPOT_POSITIONS}")
+    if not 1 <= n_vehicles <= n_customers:
+        raise ValueError(f"need 1 <= n_vehicles <= n_customers, got {n_vehicles} vehicles for {n_customers}")
+
+    rng = np.random.default_rng(seed)
+    if layout == "uniform":
+        pts = rng.uniform(0, size, (n_customers, 2))
+    else:
+        k = n_clusters or max(1, int(round(np.sqrt(n_customers) / 2)))
+        centers = rng.uniform(0.1 * size, 0.9 * size, (k, 2))
+        spread = size / (4 * np.sqrt(k))
+        pts = centers[rng.integers(k, size=n_customers)] + rng.normal(0, spread, (n_customers, 2))
+        pts = np.clip(pts, 0, size)
+
+    if depot == "center":
+        depot_xy = (size / 2, size / 2)
+    elif depot == "corner":
+        depot_xy = (0.0, 0.0)
+    else:
+        depot_xy = tuple(rng.uniform(0, size, 2).tolist())
+
+    pts = np.round(pts, 3)
+    inst = {
+        "DEPOT": depot_xy,
+        "CUSTOMERS": {i: (x, y) for i, (x, y) in enumerate(pts.tolist())},
+        "VEHICLES": n_vehicles,
+    }
+    if demand is not None:
+        demands = rng.integers(demand[0], demand[1] + 1, size=n_customers)
+        inst["DEMANDS"] = {i: int(d) for i, d in enumerate(demands.tolist())}
+        inst["CAPACITY"] = max(int(demands.max()), math.ceil(demands.sum() / (n_vehicles * fill)))
+    return inst
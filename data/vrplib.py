@@ -0,0 +1,251 @@
+"""
+Reader for CVRPLIB / TSPLIB .vrp files with a memory-mappable instance cache.
+
+    inst = read_vrp("A-n32-k5.vrp")
+    inst["DEPOT"], inst["CUSTOMERS"], inst["VEHICLES"]   # as in data/*_instances.py
+    inst["DMAT"]                                         # (N+1, N+1), row/col 0 = depot
+
+The first read parses the file line by line and builds the matrix with the file's
+EDGE_WEIGHT_TYPE. The coordinates, demands and matrix are then stored as .npy files
+under a key derived from the file's SHA-256. Later reads of the same content open
+them memory-mapped (utils.open_matrix) and skip both parsing and the matrix build.
+"""
+import hashlib
+import json
+import math
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from utils import CACHE_DIR, coords_distance_matrix, open_matrix
+
+# bump when the parse or the cached layout changes, so stale entries are ignored
+CACHE_VERSION = 1
+
+_SECTIONS = ("NODE_COORD_SECTION", "DEMAND_SECTION", "DEPOT_SECTION", "EDGE_WEIGHT_SECTION",
+             "DISPLAY_DATA_SECTION")
+
+
+def _nint(x: np.ndarray) -> np.ndarray:
+    return np.floor(x + 0.5)
+
+def _ceil_2d(a, b):
+    return np.ceil(np.hypot(a[..., 0] - b[..., 0], a[..., 1] - b[..., 1]))
+
+def _man_2d(a, b):
+    return _nint(np.abs(a[..., 0] - b[..., 0]) + np.abs(a[..., 1] - b[..., 1]))
+
+def _max_2d(a, b):
+    return np.maximum(_nint(np.abs(a[..., 0] - b[..., 0])), _nint(np.abs(a[..., 1] - b[..., 1])))
+
+def _att(a, b):
+    # TSPLIB pseudo-Euclidean distance
+    dx, dy = a[..., 0] - b[..., 0], a[..., 1] - b[..., 1]
+    r = np.sqrt((dx*dx + dy*dy) / 10.0)
+    t = _nint(r)
+    return np.where(t < r, t + 1, t)
+
+def _geo_radians(x):
+    # TSPLIB GEO: DDD.MM coordinates (degrees and minutes); the spec's truncated pi
+    deg = np.trunc(x)
+    return 3.141592 * (deg + 5.0 * (x - deg) / 3.0) / 180.0
+
+def _geo(a, b):
+    lat_a, lon_a = _geo_radians(a[..., 0]), _geo_radians(a[..., 1])
+    lat_b, lon_b = _geo_radians(b[..., 0]), _geo_radians(b[..., 1])
+    q1 = np.cos(lon_a - lon_b)
+    q2 = np.cos(lat_a - lat_b)
+    q3 = np.cos(lat_a + lat_b)
+    arg = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+    return np.trunc(6378.388 * np.arccos(arg) + 1.0)
+
+EDGE_WEIGHT_TYPES = {
+    "EUC_2D": "rounded_euclidean", "CEIL_2D": _ceil_2d, "MAN_2D": _man_2d, "MAX_2D": _max_2d,
+    "ATT": _att, "GEO": _geo, "EXPLICIT": None,
+}
+
+
+def file_hash(path: str, chunk: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _explicit_matrix(values: np.ndarray, n: int, fmt: str) -> np.ndarray:
+    """Full (n, n) matrix from an EDGE_WEIGHT_SECTION in any TSPLIB EDGE_WEIGHT_FORMAT."""
+    if fmt == "FUNCTION":
+        raise ValueError("EDGE_WEIGHT_FORMAT FUNCTION needs coordinates, not an EDGE_WEIGHT_SECTION")
+    if fmt == "FULL_MATRIX":
+        return values[:n*n].reshape(n, n).astype(float)
+    # column formats are the transposed row formats
+    transposed = fmt.endswith("_COL")
+    fmt = fmt.replace("_COL", "_ROW")
+    if transposed:
+        fmt = {"UPPER_ROW": "LOWER_ROW", "LOWER_ROW": "UPPER_ROW",
+               "UPPER_DIAG_ROW": "LOWER_DIAG_ROW", "LOWER_DIAG_ROW": "UPPER_DIAG_ROW"}[fmt]
+    k = {"UPPER_ROW": 1, "LOWER_ROW": -1, "UPPER_DIAG_ROW": 0, "LOWER_DIAG_ROW": 0}.get(fmt)
+    if k is None:
+        raise ValueError(f"unsupported EDGE_WEIGHT_FORMAT {fmt}")
+    if fmt.startswith("UPPER"):
+        rows, cols = np.triu_indices(n, k=k)
+    else:
+        rows, cols = np.tril_indices(n, k=k)
+    out = np.zeros((n, n))
+    out[rows, cols] = values[:len(rows)]
+    out[cols, rows] = values[:len(rows)]
+    return out
+
+
+def _parse(path: str) -> Tuple[Dict, Dict[str, np.ndarray]]:
+    """Streams the file once; returns (header/meta, arrays)."""
+    spec: Dict[str, str] = {}
+    coords: Dict[int, Tuple[float, float]] = {}
+    display: Dict[int, Tuple[float, float]] = {}
+    demand: Dict[int, float] = {}
+    depots: List[int] = []
+    weights: List[np.ndarray] = []
+    section = None
+
+    with open(path) as f:
+        for raw in f:
+            line = raw.strip()
+            if not line:
+                continue
+            if line == "EOF":
+                break
+            head = line.split(":", 1)[0].strip().upper() if ":" in line else line.split()[0].upper()
+            if head in _SECTIONS:
+                section = head
+                continue
+            if ":" in line and not line[0].isdigit() and line[0] not in "-+.":
+                key, value = line.split(":", 1)
+                spec[key.strip().upper()] = value.strip()
+                section = None
+                continue
+            parts = line.split()
+            if section in ("NODE_COORD_SECTION", "DISPLAY_DATA_SECTION"):
+                target = coords if section == "NODE_COORD_SECTION" else display
+                target[int(parts[0])] = (float(parts[1]), float(parts[2]))
+            elif section == "DEMAND_SECTION":
+                demand[int(parts[0])] = float(parts[1])
+            elif section == "DEPOT_SECTION":
+                depots.extend(int(p) for p in parts if int(p) != -1)
+            elif section == "EDGE_WEIGHT_SECTION":
+                weights.append(np.array(parts, dtype=float))
+            else:
+                raise ValueError(f"{path}: unexpected line outside any section: {line[:60]!r}")
+
+    n = int(spec.get("DIMENSION", 0)) or len(coords) or len(demand)
+    edge_type = spec.get("EDGE_WEIGHT_TYPE", "EUC_2D").upper()
+    if edge_type not in EDGE_WEIGHT_TYPES:
+        raise ValueError(f"{path}: unsupported EDGE_WEIGHT_TYPE {edge_type}, expected one of {sorted(EDGE_WEIGHT_TYPES)}")
+    node_ids = sorted(coords or display or demand) or list(range(1, n + 1))
+    if len(node_ids) != n:
+        raise ValueError(f"{path}: DIMENSION is {n} but {len(node_ids)} nodes were listed")
+    depot = depots[0] if depots else node_ids[0]
+    if len(depots) > 1:
+        raise ValueError(f"{path}: {len(depots)} depots listed, only single-depot instances are supported")
+
+    # matrix order: depot first, then the customers by node id
+    order = [depot] + [i for i in node_ids if i != depot]
+    xy = coords or display
+    pts = np.array([xy.get(i, (np.nan, np.nan)) for i in order], dtype=float)
+    dem = np.array([demand.get(i, 0.0) for i in order], dtype=float)
+
+    if edge_type == "EXPLICIT":
+        values = np.concatenate(weights) if weights else np.empty(0)
+        full = _explicit_matrix(values, n, spec.get("EDGE_WEIGHT_FORMAT", "FULL_MATRIX").upper())
+        index = {node: k for k, node in enumerate(node_ids)}
+        perm = np.array([index[i] for i in order])
+        dmat = full[np.ix_(perm, perm)]
+    else:
+        if not coords:
+            raise ValueError(f"{path}: EDGE_WEIGHT_TYPE {edge_type} needs a NODE_COORD_SECTION")
+        dmat = coords_distance_matrix(pts, metric=EDGE_WEIGHT_TYPES[edge_type])
+
+    meta = {
+        "name": spec.get("NAME", os.path.splitext(os.path.basename(path))[0]),
+        "edge_weight_type": edge_type,
+        "capacity": float(spec["CAPACITY"]) if "CAPACITY" in spec else None,
+        "vehicles": int(spec["VEHICLES"]) if "VEHICLES" in spec else None,
+        "node_ids": order,
+    }
+    return meta, {"coords": pts, "demand": dem, "dmat": dmat}
+
+
+def _vehicles(meta: Dict, demand: np.ndarray, vehicles: Optional[int]) -> int:
+    if vehicles is not None:
+        return vehicles
+    if meta["vehicles"]:
+        return meta["vehicles"]
+    # CVRPLIB names carry the fleet size, e.g. A-n32-k5
+    match = re.search(r"-k(\d+)", meta["name"])
+    if match:
+        return int(match.group(1))
+    if meta["capacity"]:
+        return max(1, math.ceil(demand.sum() / meta["capacity"]))
+    raise ValueError(f"{meta['name']}: no vehicle count in the file; pass vehicles=")
+
+
+def _cache_paths(cache_dir: str, key: str) -> Dict[str, str]:
+    stem = os.path.join(cache_dir, key)
+    return {"meta": stem + ".json", **{name: f"{stem}_{name}.npy" for name in ("coords", "demand", "dmat")}}
+
+
+def _store(paths: Dict[str, str], meta: Dict, arrays: Dict[str, np.ndarray]):
+    os.makedirs(os.path.dirname(paths["meta"]), exist_ok=True)
+    for name, arr in arrays.items():
+        tmp = paths[name] + f".{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, arr)
+        os.replace(tmp, paths[name])
+    # the meta file goes last: its presence marks a complete entry
+    tmp = paths["meta"] + f".{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp, paths["meta"])
+
+
+def read_vrp(path: str, vehicles: Optional[int] = None, cache_dir: Optional[str] = CACHE_DIR) -> Dict:
+    """
+    Loads a .vrp file into the {"DEPOT", "CUSTOMERS", "VEHICLES"} structure run_ga.py uses.
+    CUSTOMERS is keyed by the file's node ids, so its sorted order matches the rows of
+    DMAT. Also returns "NAME", "CAPACITY" (or None), "DEMANDS" (node id -> demand),
+    "DMAT" (read-only, memory-mapped when it comes from the cache), "DMAT_FILE" (the
+    cached .npy other processes can open with utils.open_matrix, None without cache)
+    and "COORDS".
+    Without NODE_COORD_SECTION (explicit matrices) the coordinates come from
+    DISPLAY_DATA_SECTION, or are NaN when that is missing too.
+    vehicles: fleet size; by default taken from a VEHICLES line, the -kN suffix of the
+    name, or total demand over capacity, in that order.
+    cache_dir: None disables the cache.
+    """
+    arrays = meta = None
+    if cache_dir is not None:
+        key = f"{file_hash(path)[:32]}_v{CACHE_VERSION}"
+        paths = _cache_paths(cache_dir, key)
+        if os.path.exists(paths["meta"]):
+            with open(paths["meta"]) as f:
+                meta = json.load(f)
+            arrays = {name: open_matrix(paths[name]) for name in ("coords", "demand", "dmat")}
+    if arrays is None:
+        meta, arrays = _parse(path)
+        if cache_dir is not None:
+            _store(paths, meta, arrays)
+
+    order = meta["node_ids"]
+    coords = arrays["coords"]
+    demand = arrays["demand"]
+    return {
+        "NAME": meta["name"],
+        "DEPOT": tuple(coords[0].tolist()),
+        "CUSTOMERS": {node: tuple(xy) for node, xy in zip(order[1:], coords[1:].tolist())},
+        "VEHICLES": _vehicles(meta, demand, vehicles),
+        "CAPACITY": meta["capacity"],
+        "DEMANDS": {node: d for node, d in zip(order[1:], demand[1:].tolist())},
+        "DMAT": arrays["dmat"],
+        "DMAT_FILE": paths["dmat"] if cache_dir is not None else None,
+        "COORDS": coords,
+    }
@@ -0,0 +1,187 @@
+"""
+Capacitated VRP: a demand per customer and one capacity shared by all vehicles.
+
+    capacity = Capacity(demand, 100, dmat=dmat)   # demand[0] is the depot's (0)
+    genetic_algorithm(..., capacity=capacity)
+
+Chromosomes are never rejected for overloading a vehicle. Their cost becomes
+distance + penalty * excess instead, where excess is the load over capacity summed
+over the routes, so a feasible solution costs exactly its distance. With repair=True,
+overloaded offspring are also re-cut greedily before evaluation (see repair_cuts).
+
+Route loads come from prefix sums of the demands along the perm: the load of the
+route between cuts a and b is prefix[b] - prefix[a], whatever the route length.
+RouteLoads keeps the per-route loads of one chromosome, so the incremental cost paths
+(ga.operators delta mutations, ga.local_search) check each swap, cut move or
+relocation in O(1) instead of re-summing routes.
+"""
+from bisect import bisect_right, insort
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+# relative slack on capacity comparisons, so float sums of integer demands are not
+# reported as a tiny overload
+_TOL = 1e-9
+
+
+class Capacity:
+    """
+    demand: (N+1,) demands indexed like dmat, depot at 0 (its entry is ignored).
+    capacity: load limit of every vehicle.
+    penalty: cost per unit of excess load. The default, computed from dmat, is the
+    round trip to the farthest customer per unit of the largest demand, so moving one
+    customer out of an overloaded route always pays.
+    repair: re-cut overloaded offspring greedily before they are evaluated.
+    limit is the capacity plus a relative float slack, used for every fit check.
+    """
+    def __init__(self, demand: Sequence[float], capacity: float, penalty: Optional[float] = None,
+                 dmat=None, repair: bool = False):
+        demand = np.array(demand, dtype=float)
+        if demand.ndim != 1 or len(demand) < 1:
+            raise ValueError("demand must be a 1-D sequence with the depot at index 0")
+        demand[0] = 0.0
+        if (demand < 0).any():
+            raise ValueError("demands must be non-negative")
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        if penalty is None:
+            if dmat is None:
+                raise ValueError("Capacity needs a penalty or a dmat to derive one")
+            n = len(demand)
+            far = float(np.max(np.asarray(dmat[0, np.arange(1, n)], dtype=float)
+                               + np.asarray(dmat[np.arange(1, n), 0], dtype=float))) if n > 1 else 1.0
+            penalty = max(far, 1e-9) / max(float(demand.max()), 1e-9)
+        self.demand = demand
+        self.capacity = float(capacity)
+        self.penalty = float(penalty)
+        self.repair = repair
+        self.limit = self.capacity * (1 + _TOL)
+
+    @classmethod
+    def from_instance(cls, inst: Dict, cust_keys: Sequence, **kwargs) -> Optional["Capacity"]:
+        """
+        Capacity of an instance dict with "CAPACITY" and "DEMANDS" (customer key ->
+        demand, missing keys count as 0), customers in cust_keys order as in
+        customers_to_ordered_list. None when the instance has no capacity.
+        """
+        if inst.get("CAPACITY") is None:
+            return None
+        demands = inst.get("DEMANDS") or {}
+        return cls([0.0] + [demands.get(k, 0.0) for k in cust_keys], inst["CAPACITY"], **kwargs)
+
+    def prefix(self, perm: Sequence[int]) -> np.ndarray:
+        """(N+1,) loads of perm[:k] for k = 0..N."""
+        out = np.zeros(len(perm) + 1)
+        np.cumsum(self.demand[np.asarray(perm, dtype=np.intp)], out=out[1:])
+        return out
+
+    def route_loads(self, perm: Sequence[int], cuts: Sequence[int]) -> np.ndarray:
+        """Load of every route between consecutive (sorted) cuts, empty routes included."""
+        prefix = self.prefix(perm)
+        bounds = np.concatenate(([0], np.clip(np.sort(np.asarray(cuts, dtype=np.intp)), 0, len(perm)),
+                                 [len(perm)]))
+        return prefix[bounds[1:]] - prefix[bounds[:-1]]
+
+    def overload(self, loads) -> np.ndarray:
+        """Excess of each load over the capacity (0 where it fits)."""
+        return np.where(np.asarray(loads) > self.limit, np.asarray(loads) - self.capacity, 0.0)
+
+    def excess(self, perm: Sequence[int], cuts: Sequence[int]) -> float:
+        """Total load over capacity of the chromosome's routes."""
+        over = self.overload(self.route_loads(perm, cuts))
+        return float(np.cumsum(over)[-1])
+
+    def batch_excess(self, perms: np.ndarray, cuts: np.ndarray) -> np.ndarray:
+        """excess for every row; cuts (P, V-1) may be padded with 0 or N and unsorted."""
+        perms = np.asarray(perms, dtype=np.intp)
+        P, N = perms.shape
+        prefix = np.zeros((P, N + 1))
+        np.cumsum(self.demand[perms], axis=1, out=prefix[:, 1:])
+        cuts = np.asarray(cuts, dtype=np.intp).reshape(P, -1)
+        bounds = np.zeros((P, cuts.shape[1] + 2), dtype=np.intp)
+        bounds[:, 1:-1] = np.sort(np.clip(cuts, 0, N), axis=1)
+        bounds[:, -1] = N
+        ends = np.take_along_axis(prefix, bounds, axis=1)
+        return np.cumsum(self.overload(ends[:, 1:] - ends[:, :-1]), axis=1)[:, -1]
+
+    def penalize(self, cost: float, perm: Sequence[int], cuts: Sequence[int]) -> float:
+        """cost plus the penalty for perm/cuts' excess load."""
+        return float(cost + self.penalty * self.excess(perm, cuts))
+
+    def batch_penalize(self, costs: np.ndarray, perms: np.ndarray, cuts: np.ndarray) -> np.ndarray:
+        return costs + self.penalty * self.batch_excess(perms, cuts)
+
+    def repair_cuts(self, perm: Sequence[int], cuts: Sequence[int], dmat) -> Optional[List[int]]:
+        """
+        New cuts for an overloaded chromosome, or None when it fits or cannot be fixed.
+        Routes are filled greedily along the perm up to the capacity (one searchsorted
+        on the prefix sums per route). If that needs more than len(cuts) + 1 routes the
+        chromosome is left to the penalty; if it needs fewer, the remaining cuts go
+        where a depot visit adds the least distance.
+        """
+        n = len(perm)
+        prefix = self.prefix(perm)
+        bounds = np.concatenate(([0], np.clip(np.sort(np.asarray(cuts, dtype=np.intp)), 0, n), [n]))
+        if not (np.diff(prefix[bounds]) > self.limit).any():
+            return None
+        new, start = [], 0
+        while start < n:
+            end = int(np.searchsorted(prefix, prefix[start] + self.limit, side="right")) - 1
+            start = max(end, start + 1)
+            if start < n:
+                new.append(start)
+            if len(new) > len(cuts):
+                return None
+        if len(new) < len(cuts):
+            p = np.asarray(perm, dtype=np.intp)
+            added = (np.asarray(dmat[p[:-1], 0], dtype=float) + np.asarray(dmat[0, p[1:]], dtype=float)
+                     - np.asarray(dmat[p[:-1], p[1:]], dtype=float))  # added[k-1]: depot visit at k
+            added[np.asarray(new, dtype=np.intp) - 1] = np.inf
+            extra = np.argsort(added, kind="stable")[:len(cuts) - len(new)] + 1
+            new = sorted(new + extra.tolist())
+        return new
+
+
+class RouteLoads:
+    """
+    Per-route loads of one chromosome, for incremental cost
+    updates: route_of() finds a position's route by bisection over the cuts, and each
+    customer moved between routes is an O(1) shift() returning the penalty change.
+    Routes are numbered as in decode_routes over the sorted cuts.
+    """
+    def __init__(self, capacity: Capacity, perm: Sequence[int], cuts: Sequence[int]):
+        self.capacity = capacity
+        self.demand = capacity.demand
+        self.bounds = sorted(int(c) for c in cuts)
+        self.loads: List[float] = capacity.route_loads(perm, self.bounds).tolist()
+
+    def route_of(self, pos: int) -> int:
+        return bisect_right(self.bounds, pos)
+
+    def _over(self, load: float) -> float:
+        return load - self.capacity.capacity if load > self.capacity.limit else 0.0
+
+    def shift(self, src: int, dst: int, amount: float) -> float:
+        """Moves `amount` of load from route src to route dst; returns the penalty change."""
+        if src == dst or amount == 0:
+            return 0.0
+        loads = self.loads
+        before = self._over(loads[src]) + self._over(loads[dst])
+        loads[src] -= amount
+        loads[dst] += amount
+        return self.capacity.penalty * (self._over(loads[src]) + self._over(loads[dst]) - before)
+
+    def move_cut(self, perm: Sequence[int], old: int, new: int) -> float:
+        """
+        One cut moves from old to new = old +- 1, handing a single customer to the
+        neighboring route; returns the penalty change.
+        """
+        if new == old + 1:
+            r = self.route_of(old)
+            delta = self.shift(r, r - 1, self.demand[perm[old]])
+        else:
+            r = self.route_of(new)
+            delta = self.shift(r, r + 1, self.demand[perm[new]])
+        self.bounds.remove(old)
+        insort(self.bounds, new)
+        return delta
@@ -0,0 +1,157 @@
+import functools
+import glob
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from .chromosome import Individual
+from .stopping import StoppingCriteria
+
+CHECKPOINT_VERSION = 1
+
+
+def array_digest(*arrays) -> str:
+    """Short SHA-256 of the arrays' shapes, dtypes and contents."""
+    h = hashlib.sha256()
+    for a in arrays:
+        a = np.ascontiguousarray(a)
+        h.update(f"{a.shape}|{a.dtype.str}|".encode())
+        h.update(memoryview(a).cast("B"))
+    return h.hexdigest()[:16]
+
+
+def matrix_digest(dmat) -> str:
+    """
+    Content hash of a distance provider, so a checkpoint is never resumed against
+    other distances: the coordinates and metric of a utils.CoordinateDistances, the
+    packed triangle of a utils.TriangularMatrix, else the dense (possibly memory-mapped)
+    matrix itself.
+    """
+    coords = getattr(dmat, "coords", None)
+    if coords is not None:
+        metric = getattr(dmat, "metric", None)
+        metric = metric if isinstance(metric, str) else getattr(metric, "__qualname__", repr(metric))
+        return array_digest(coords, np.array(f"{metric}|{np.dtype(dmat.dtype).str}"))
+    packed = getattr(dmat, "packed", None)
+    return array_digest(packed if packed is not None else np.asarray(dmat))
+
+
+@functools.lru_cache(maxsize=None)
+def code_digest() -> str:
+    """
+    Hash of the ga package sources. A checkpoint only resumes bit-for-bit under the
+    code that wrote it, so any edit to the GA makes older files stale.
+    """
+    h = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "*.py"))):
+        h.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+def _pack(seqs: Sequence[Sequence[int]]):
+    """Ragged int rows (cuts may be shorter than V-1) as one flat array plus row lengths."""
+    lens = np.fromiter((len(s) for s in seqs), dtype=np.int64, count=len(seqs))
+    flat = np.fromiter((v for s in seqs for v in s), dtype=np.int64, count=int(lens.sum()))
+    return flat, lens
+
+
+def _unpack(flat: np.ndarray, lens: np.ndarray) -> List[List[int]]:
+    bounds = np.concatenate(([0], np.cumsum(lens)))
+    values = flat.tolist()
+    return [values[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+class Checkpoint:
+    """
+    Periodic snapshot of a genetic_algorithm run in one compressed .npz file: the
+    population (perms, cuts, cached costs), the random state of either engine, the
+    generation counter, the convergence history and the stopping state.
+
+    A run given the same path resumes from the file and continues bit-for-bit as
+    if it had never stopped; a finished run resumes straight to its result.
+    fingerprint: the run settings; a file written under other settings is refused
+    rather than silently continued. genetic_algorithm includes the matrix_digest of
+    the distances and the code_digest of the GA.
+    resumed_gens: generations the last load() restored (None before any load, 0 when
+    there was no file).
+    """
+    def __init__(self, path: str, every: int = 25, fingerprint: Optional[Dict] = None):
+        if every < 1:
+            raise ValueError(f"checkpoint interval must be >= 1, got {every}")
+        self.path = path
+        self.every = every
+        # JSON round trip so tuples and lists compare equal after a reload
+        self.fingerprint = json.loads(json.dumps(fingerprint or {}))
+        self.resumed_gens = None
+
+    def due(self, gen: int) -> bool:
+        """Whether a snapshot is due after generation index gen (0-based)."""
+        return (gen + 1) % self.every == 0
+
+    def save(self, pop: Sequence[Individual], rng_state, histories: List[float],
+             stopper: StoppingCriteria, profiler=None):
+        """Writes the snapshot atomically (temporary file, then rename)."""
+        perm_flat, perm_lens = _pack([ind.perm for ind in pop])
+        cut_flat, cut_lens = _pack([ind.cuts for ind in pop])
+        cost = np.array([np.nan if ind.cost is None else ind.cost for ind in pop], dtype=float)
+        meta = {"version": CHECKPOINT_VERSION, "fingerprint": self.fingerprint,
+                "stopper": stopper.get_state(),
+                "profiler": profiler.get_state() if profiler is not None else None}
+        arrays = {}
+        if isinstance(rng_state, tuple):  # random.Random.getstate()
+            version, internal, gauss = rng_state
+            meta["rng"] = {"kind": "random", "version": version, "gauss": gauss}
+            arrays["mt"] = np.asarray(internal, dtype=np.uint32)
+        else:  # numpy bit_generator.state, a JSON-able dict
+            meta["rng"] = {"kind": "numpy", "state": rng_state}
+        best = stopper.best
+        if best is not None:
+            arrays["best_perm"] = np.asarray(best.perm, dtype=np.int64)
+            arrays["best_cuts"] = np.asarray(best.cuts, dtype=np.int64)
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, meta=np.array(json.dumps(meta)), perm_flat=perm_flat, perm_lens=perm_lens,
+                                cut_flat=cut_flat, cut_lens=cut_lens, cost=cost,
+                                histories=np.asarray(histories, dtype=float), **arrays)
+        os.replace(tmp, self.path)
+
+    def load(self, stopper: StoppingCriteria, profiler=None):
+        """
+        Returns (individuals, rng_state, histories) from an existing file and restores
+        stopper (and the profiler, if both sides have one) in place, or None when there
+        is nothing to resume.
+        """
+        if not os.path.exists(self.path):
+            self.resumed_gens = 0
+            return None
+        with np.load(self.path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("version") != CHECKPOINT_VERSION:
+                raise ValueError(f"{self.path}: unsupported checkpoint version {meta.get('version')}")
+            if meta["fingerprint"] != self.fingerprint:
+                raise ValueError(f"{self.path} was written by a run with different settings: "
+                                 f"{meta['fingerprint']} != {self.fingerprint}")
+            perms = _unpack(data["perm_flat"], data["perm_lens"])
+            cuts = _unpack(data["cut_flat"], data["cut_lens"])
+            pop = [Individual(p, c, None if np.isnan(cost) else float(cost))
+                   for p, c, cost in zip(perms, cuts, data["cost"].tolist())]
+            rng = meta["rng"]
+            if rng["kind"] == "random":
+                rng_state = (rng["version"], tuple(data["mt"].tolist()), rng["gauss"])
+            else:
+                rng_state = rng["state"]
+            best = None
+            if "best_perm" in data:
+                best = (data["best_perm"].tolist(), data["best_cuts"].tolist())
+            histories = data["histories"].tolist()
+        stopper.set_state(meta["stopper"], best)
+        self.resumed_gens = stopper.gens_done
+        if profiler is not None and meta.get("profiler") is not None:
+            profiler.set_state(meta["profiler"])
+        return pop, rng_state, histories
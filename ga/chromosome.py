@@ -1,10 +1,37 @@
 import random
-from typing import List
+from typing import List, Optional
 
 class Individual:
-    def __init__(self, perm: List[int], cuts: List[int]):
-        self.perm = perm
-        self.cuts = cuts
+    """
+    Giant-tour chromosome: `perm` holds customers 1..N, `cuts` the V-1 split positions.
+    `cost` caches the total distance; assigning `perm`/`cuts` (or calling
+    `invalidate()` after an in-place edit) clears it.
+    """
+    def __init__(self, perm: List[int], cuts: List[int], cost: Optional[float] = None):
+        self._perm = perm
+        self._cuts = cuts
+        self.cost = cost
+
+    @property
+    def perm(self) -> List[int]:
+        return self._perm
+
+    @perm.setter
+    def perm(self, value: List[int]):
+        self._perm = value
+        self.cost = None
+
+    @property
+    def cuts(self) -> List[int]:
+        return self._cuts
+
+    @cuts.setter
+    def cuts(self, value: List[int]):
+        self._cuts = value
+        self.cost = None
+
+    def invalidate(self):
+        self.cost = None
 
 def random_individual(N: int, V: int, rng: random.Random) -> Individual:
     perm = list(range(1, N+1))
@@ -16,7 +43,7 @@ def random_individual(N: int, V: int, rng: random.Random) -> Individual:
 def decode_routes(ind: Individual, n_vehicles: int) -> List[List[int]]:
     routes = []
     prev = 0
-    cuts = ind.cuts + [len(ind.perm)]
+    cuts = list(ind.cuts) + [len(ind.perm)]
     for c in cuts:
         routes.append(ind.perm[prev:c])
         prev = c
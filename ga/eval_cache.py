@@ -0,0 +1,154 @@
+"""
+Optional memo of evaluations. Populations fill up with duplicates (elite copies,
+children copied without crossover, repeated tournament winners), and children
+inherit whole routes unchanged from their parents.
+
+    cache = EvalCache(max_entries=50_000, routes=True)
+    genetic_algorithm(..., eval_cache=cache)
+    cache.hit_rate(), cache.stats
+
+Chromosomes are keyed by the normalized (perm, cuts) pair itself, hashed by the
+dict: a tuple for list chromosomes, raw int32 bytes for Population rows. Duplicate
+cuts and cuts at 0 or N add no depot visit, so they are dropped first. Keys are
+compared in full, so there are no false hits. Both the chromosome table and the
+route table are LRU, bounded by entry count, and one estimated byte budget covers
+the two tables together.
+
+A lookup costs a few microseconds (building and hashing the key). That pays off
+when evaluations are expensive or duplicates are common, e.g. small instances or
+low mutation rates. On large dense Euclidean instances the vectorized batch
+evaluation is usually cheaper than the lookup.
+"""
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Sequence, Tuple
+import numpy as np
+
+# rough bytes per table entry besides the key items (dict slot, ordered-dict link, value objects)
+ENTRY_OVERHEAD = 160
+
+
+def _seq_key(seq) -> Tuple[Hashable, int]:
+    """(hashable key, estimated bytes) of an int sequence."""
+    if isinstance(seq, np.ndarray):
+        raw = seq.astype(np.int32, copy=False).tobytes()
+        return raw, len(raw)
+    key = tuple(seq)
+    return key, 8 * len(key)
+
+
+class _LRU:
+    def __init__(self, max_entries: Optional[int], max_bytes: Optional[int]):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.data: "OrderedDict[Hashable, Tuple[object, int]]" = OrderedDict()
+        self.bytes = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable):
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        self.data.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: Hashable, value, size: int):
+        old = self.data.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        self.data[key] = (value, size)
+        self.bytes += size
+        while self.data and ((self.max_entries is not None and len(self.data) > self.max_entries)
+                             or (self.max_bytes is not None and self.bytes > self.max_bytes)):
+            _, (_, freed) = self.data.popitem(last=False)
+            self.bytes -= freed
+            self.evictions += 1
+
+    def clear(self):
+        self.data.clear()
+        self.bytes = 0
+
+
+class EvalCache:
+    """
+    LRU memo of chromosome costs and, with routes=True, of single route lengths.
+    max_entries / max_route_entries bound each table's entries and max_bytes the whole
+    cache (None = unbounded on that axis); with routes=True, route_bytes_share of
+    max_bytes goes to the route table and the rest to the chromosome table.
+    Byte sizes are estimates (key items + ENTRY_OVERHEAD, plus stored cuts).
+    stats counts lookups and hits per table; hit_rate() and info() summarize them.
+    Costs read back are exactly what a fresh evaluation would give, so a cache never
+    changes a run. Route memoization sums a chromosome's cost route by route; its
+    costs can therefore differ from the cache-less totals in the last bits.
+    """
+    def __init__(self, max_entries: Optional[int] = 100_000, max_bytes: Optional[int] = None,
+                 routes: bool = False, max_route_entries: Optional[int] = 200_000,
+                 route_bytes_share: float = 0.5):
+        if max_entries is None and max_bytes is None:
+            raise ValueError("EvalCache needs max_entries or max_bytes")
+        if not 0 < route_bytes_share < 1:
+            raise ValueError(f"need 0 < route_bytes_share < 1, got {route_bytes_share}")
+        self.routes = routes
+        route_bytes = None
+        if max_bytes is not None and routes:
+            route_bytes = int(max_bytes * route_bytes_share)
+            max_bytes -= route_bytes
+        self._chromosomes = _LRU(max_entries, max_bytes)
+        self._routes = _LRU(max_route_entries, route_bytes)
+        self.stats: Dict[str, int] = {"lookups": 0, "hits": 0, "route_lookups": 0, "route_hits": 0}
+
+    @staticmethod
+    def key(perm: Sequence[int], cuts: Sequence[int], decoder: str = "cuts") -> Hashable:
+        n = len(perm)
+        perm_key, _ = _seq_key(perm)
+        if decoder != "cuts":
+            # split decoders derive the cuts from the perm alone
+            return decoder, perm_key
+        if isinstance(cuts, np.ndarray):
+            cuts = cuts.tolist()
+        return perm_key, tuple(sorted({c for c in cuts if 0 < c < n}))
+
+    def get(self, key: Hashable):
+        """Cached cost (or (cost, cuts) under a split decoder) for key, or None."""
+        self.stats["lookups"] += 1
+        value = self._chromosomes.get(key)
+        if value is not None:
+            self.stats["hits"] += 1
+        return value
+
+    def put(self, key: Hashable, value):
+        perm_key = key[1] if isinstance(key[0], str) else key[0]
+        size = len(perm_key) * (1 if isinstance(perm_key, bytes) else 8) + ENTRY_OVERHEAD
+        if isinstance(value, tuple):
+            size += 8 * len(value[1])
+        self._chromosomes.put(key, value, size)
+
+    def route_length(self, route: Sequence[int], compute: Callable[[Sequence[int]], float]) -> float:
+        """compute(route) through the route table (direction matters: keys keep the order)."""
+        self.stats["route_lookups"] += 1
+        key, size = _seq_key(route)
+        length = self._routes.get(key)
+        if length is None:
+            length = compute(route)
+            self._routes.put(key, length, size + ENTRY_OVERHEAD)
+        else:
+            self.stats["route_hits"] += 1
+        return length
+
+    def hit_rate(self) -> float:
+        """Fraction of chromosome lookups answered from the cache."""
+        return self.stats["hits"] / self.stats["lookups"] if self.stats["lookups"] else 0.0
+
+    def route_hit_rate(self) -> float:
+        return self.stats["route_hits"] / self.stats["route_lookups"] if self.stats["route_lookups"] else 0.0
+
+    def info(self) -> Dict[str, float]:
+        """stats plus table sizes, evictions and hit rates, e.g. for a results row."""
+        return dict(self.stats, entries=len(self._chromosomes.data), route_entries=len(self._routes.data),
+                    bytes=self._chromosomes.bytes + self._routes.bytes,
+                    evictions=self._chromosomes.evictions + self._routes.evictions,
+                    hit_rate=self.hit_rate(), route_hit_rate=self.route_hit_rate())
+
+    def clear(self):
+        """Drops every entry; needed before reusing the cache with another dmat."""
+        self._chromosomes.clear()
+        self._routes.clear()
@@ -1,9 +1,22 @@
 from ga.chromosome import decode_routes, Individual
-from typing import List
+from typing import Dict, List, Sequence
 import numpy as np
 
-def route_distance(route: List[int], dmat: np.ndarray) -> float:
-    if not route:
+# evaluations asked for vs. actually decoded and summed (the rest hit Individual.cost)
+EVAL_COUNTS = {"requested": 0, "computed": 0}
+
+def reset_eval_counts():
+    EVAL_COUNTS["requested"] = 0
+    EVAL_COUNTS["computed"] = 0
+
+def eval_counts() -> Dict[str, int]:
+    return dict(EVAL_COUNTS)
+
+def route_distance(route: List[int], dmat: np.ndarray, cache=None) -> float:
+    """Length of depot -> route -> depot; memoized when cache is an EvalCache with routes=True."""
+    if cache is not None and cache.routes:
+        return cache.route_length(route, lambda r: route_distance(r, dmat))
+    if not len(route):
         return 0
     total = dmat[0, route[0]]  # depot to first
     for i in range(len(route)-1):
@@ -11,9 +24,167 @@ def route_distance(route: List[int], dmat: np.ndarray) -> float:
     total += dmat[route[-1], 0]  # return to depot
     return total
 
-def total_distance(ind: Individual, dmat: np.ndarray, V: int) -> float:
-    routes = decode_routes(ind, V)
-    return sum(route_distance(r, dmat) for r in routes)
+def _routes_cost(perm: Sequence[int], cuts: Sequence[int], dmat: np.ndarray, cache) -> float:
+    """Total as a sum of memoized route lengths (same routes as decode_routes)."""
+    total = 0.0
+    prev = 0
+    for c in list(cuts) + [len(perm)]:
+        route = perm[prev:c]
+        prev = c
+        if len(route):
+            total += float(route_distance(route, dmat, cache))
+    return total
+
+def total_distance(ind: Individual, dmat: np.ndarray, V: int, cache=None, capacity=None) -> float:
+    """
+    Total route length of `ind`, cached on `ind.cost`.
+    The cache assumes one dmat (and capacity) per Individual, which holds within a GA run.
+    cache: optional ga.eval_cache.EvalCache consulted before computing.
+    capacity: optional ga.capacity.Capacity; its load penalty is added to the length.
+    """
+    EVAL_COUNTS["requested"] += 1
+    if ind.cost is None:
+        if cache is not None:
+            key = cache.key(ind.perm, ind.cuts)
+            cost = cache.get(key)
+            if cost is not None:
+                ind.cost = cost
+                return ind.cost
+            if cache.routes:
+                EVAL_COUNTS["computed"] += 1
+                ind.cost = _routes_cost(ind.perm, ind.cuts, dmat, cache)
+                if capacity is not None:
+                    ind.cost = capacity.penalize(ind.cost, ind.perm, ind.cuts)
+                cache.put(key, ind.cost)
+                return ind.cost
+        EVAL_COUNTS["computed"] += 1
+        # one running sum over all legs, in tour order, so batch_total_distance
+        # (which accumulates the same legs with cumsum) agrees bit for bit
+        total = 0.0
+        for route in decode_routes(ind, V):
+            if not route:
+                continue
+            total += dmat[0, route[0]]
+            for i in range(len(route)-1):
+                total += dmat[route[i], route[i+1]]
+            total += dmat[route[-1], 0]
+        ind.cost = float(total)
+        if capacity is not None:
+            ind.cost = capacity.penalize(ind.cost, ind.perm, ind.cuts)
+        if cache is not None:
+            cache.put(key, ind.cost)
+    return ind.cost
+
+def batch_total_distance(perms: np.ndarray, cuts: np.ndarray, dmat: np.ndarray) -> np.ndarray:
+    """
+    Total distance of a whole population at once.
+    perms: (P, N) customer ids, cuts: (P, V-1) sorted cut positions.
+    Cut values 0 and N add no depot visit, so ragged cut lists can be padded with 0.
+    Returns a (P,) array equal to total_distance for every row.
+    """
+    perms = np.asarray(perms, dtype=np.intp)
+    cuts = np.asarray(cuts, dtype=np.intp).reshape(perms.shape[0], -1)
+    P, N = perms.shape
+    if N == 0:
+        return np.zeros(P)
+
+    # boundary[:, k] is True when a route starts at position k (k = N closes the last one)
+    boundary = np.zeros((P, N+1), dtype=bool)
+    boundary[np.arange(P)[:, None], cuts] = True
+    boundary[:, 0] = True
+    boundary[:, N] = True
+
+    prev = np.empty_like(perms)
+    prev[:, 0] = 0
+    prev[:, 1:] = perms[:, :-1]
+    prev[boundary[:, :N]] = 0  # route starts come from the depot
+
+    # legs in tour order: arrival at position k, then the return to depot if a route ends there
+    arrive = dmat[prev, perms]
+    legs = np.zeros((P, 2*N), dtype=arrive.dtype)
+    legs[:, 0::2] = arrive
+    legs[:, 1::2] = np.where(boundary[:, 1:], dmat[perms, 0], 0)
+    return np.cumsum(legs, axis=1)[:, -1]  # cumsum adds strictly left to right
+
+DECODERS = ("cuts", "split", "split_all")
+
+def evaluate_population(pop: List[Individual], dmat: np.ndarray, V: int, decoder: str = "cuts",
+                        cache=None, capacity=None):
+    """
+    Fill Individual.cost for every member of `pop` that lacks it, in one batch.
+    decoder "cuts" takes the evolved cuts literally; "split" / "split_all" ignore them,
+    optimally split each perm into at most / exactly V routes (ga.split.batch_split)
+    and write the resulting cuts back onto the individual.
+    cache: optional ga.eval_cache.EvalCache; only its misses are evaluated, and
+    repeats within pop are evaluated once.
+    capacity: optional ga.capacity.Capacity, as in total_distance; the split decoders
+    then only cut routes that fit (see batch_split).
+    """
+    EVAL_COUNTS["requested"] += len(pop)
+    todo = [ind for ind in pop if ind.cost is None]
+    if cache is None:
+        _evaluate(todo, dmat, V, decoder, capacity=capacity)
+        return
+
+    def entry(ind):
+        return ind.cost if decoder == "cuts" else (ind.cost, tuple(int(c) for c in ind.cuts))
+
+    def restore(ind, value):
+        if decoder == "cuts":
+            ind.cost = value
+        else:
+            ind.cuts = list(value[1])
+            ind.cost = value[0]
+
+    first, fresh, repeats = {}, [], []
+    for ind in todo:
+        key = cache.key(ind.perm, ind.cuts, decoder)
+        if key in first:
+            # same chromosome as an earlier miss of this batch: answered by that evaluation
+            cache.stats["lookups"] += 1
+            cache.stats["hits"] += 1
+            repeats.append((ind, first[key]))
+            continue
+        value = cache.get(key)
+        if value is None:
+            first[key] = ind
+            fresh.append((key, ind))
+        else:
+            restore(ind, value)
+    _evaluate([ind for _, ind in fresh], dmat, V, decoder, cache, capacity)
+    for key, ind in fresh:
+        cache.put(key, entry(ind))
+    for ind, src in repeats:
+        restore(ind, entry(src))
+
+def _evaluate(todo: List[Individual], dmat: np.ndarray, V: int, decoder: str, cache=None, capacity=None):
+    if not todo:
+        return
+    EVAL_COUNTS["computed"] += len(todo)
+    if decoder != "cuts":
+        from .split import batch_split
+        perms = np.array([ind.perm for ind in todo], dtype=np.intp)
+        costs, cuts = batch_split(perms, dmat, V, use_all=decoder == "split_all", capacity=capacity)
+        for ind, cost, row in zip(todo, costs, cuts.tolist()):
+            ind.cuts = row
+            ind.cost = float(cost)
+        return
+    if cache is not None and cache.routes:
+        for ind in todo:
+            ind.cost = _routes_cost(ind.perm, ind.cuts, dmat, cache)
+            if capacity is not None:
+                ind.cost = capacity.penalize(ind.cost, ind.perm, ind.cuts)
+        return
+    n_cuts = max(len(ind.cuts) for ind in todo)
+    cuts = np.zeros((len(todo), n_cuts), dtype=np.intp)
+    for row, ind in enumerate(todo):
+        cuts[row, :len(ind.cuts)] = ind.cuts
+    perms = np.array([ind.perm for ind in todo], dtype=np.intp)
+    costs = batch_total_distance(perms, cuts, dmat)
+    if capacity is not None:
+        costs = capacity.batch_penalize(costs, perms, cuts)
+    for ind, cost in zip(todo, costs):
+        ind.cost = float(cost)
 
 def fitness(ind: Individual, dmat: np.ndarray, V: int) -> float:
     return -total_distance(ind, dmat, V)  # GA maximizes fitness
@@ -1,90 +1,563 @@
 import random
 from typing import List, Tuple
+import numpy as np
 from .chromosome import Individual, random_individual, decode_routes
-from .operators import order_crossover, cuts_crossover, swap_mutation_perm, jitter_mutation_cuts, route_aware_mutation
-from .fitness import total_distance
+from .operators import (order_crossover, cuts_crossover, swap_mutation_perm, jitter_mutation_cuts, route_aware_mutation,
+                        swap_mutation, jitter_mutation, order_crossover_batch, cuts_crossover_batch)
+from .fitness import DECODERS, total_distance, evaluate_population
+from .population import Population, swap_mutation_rows, jitter_mutation_rows, route_aware_mutation_row
+from .local_search import LocalSearch
+from .seeding import Seeding
+from .capacity import Capacity
+from .stopping import StoppingCriteria
+from .checkpoint import Checkpoint, array_digest, code_digest, matrix_digest
+from .eval_cache import EvalCache
+from .profiling import NULL_PROFILER, Profiler
+from .selection import WorstHeap, best_indices, select_parents, tournament, worst_indices
+
+SCHEMES = ("generational", "steady_state")
+REPLACEMENTS = ("worst", "tournament")
 
 def genetic_algorithm(dmat: "np.ndarray", N: int, V: int,
                       pop_size: int, generations: int, k_tourn: int,
                       pc: float, pm_perm: float, pm_cuts: float,
-                      seed: int = None, log_convergence: bool = False
+                      seed: int = None, log_convergence: bool = False,
+                      batch_eval: bool = True, engine: str = "objects",
+                      delta_eval: bool = False, local_search: LocalSearch = None,
+                      ls_rate: float = 0.1, ls_elites: int = 1, decoder: str = "cuts",
+                      seeding: Seeding = None, capacity: Capacity = None, elites: int = 1, scheme: str = "generational", replacement: str = "worst",
+                      eval_cache: EvalCache = None, time_limit: float = None, max_evals: int = None, patience: int = None,
+                      target_cost: float = None, return_info: bool = False,
+                      checkpoint_path: str = None, checkpoint_every: int = 25,
+                      profiler: Profiler = None
                      ) -> Tuple[Individual, float, List[float]]:
+    """
+    batch_eval: score each new generation with one vectorized batch_total_distance
+    call instead of decoding individuals one by one on first use.
+    batch_eval=False and delta_eval=True are objects-engine, "cuts"-decoder options;
+    combining them with engine="arrays" or a split decoder raises ValueError.
+    delta_eval: children copied without crossover inherit their parent's cost and the
+    mutations update it incrementally, so only crossover children get a full evaluation.
+    Off by default: each tracked swap is priced in Python, which costs more than
+    re-scoring the child in the batch (compare the mutate_delta and mutate_rescore
+    kernels of benchmarks.operators).
+    engine: "objects" evolves a list of Individual; "arrays" keeps the population in
+    preallocated numpy buffers (see ga.population) and draws from a numpy Generator,
+    so the two engines give different runs for the same seed.
+    local_search: optional memetic stage (ga.local_search.LocalSearch) applied to a
+    ls_rate fraction of the offspring and to the ls_elites best of every generation.
+    Its time share of the run is left in local_search.stats.
+    decoder: "cuts" decodes the evolved cuts; "split" / "split_all" ignore them and
+    optimally split each perm into at most / exactly V routes (ga.split), so only the
+    perm evolves. Split needs batch evaluation and no delta updates.
+    seeding: optional ga.seeding.Seeding that builds seeding.fraction of the initial
+    population with savings / sweep / nearest-neighbor heuristics instead of random
+    shuffles; its per-method counts are left in seeding.stats.
+    capacity: optional ga.capacity.Capacity for capacitated instances. Overloaded
+    routes are penalized (and, with capacity.repair, offspring re-cut), so all costs,
+    the histories and the returned distance include the penalty; a feasible solution
+    costs exactly its distance. A local_search must be built with the same capacity.
+    elites: the best `elites` of each generation replace the worst offspring of the next
+    (from generation 0 on with seeding, so the seeds' quality is not lost).
+    Parents come from tournaments drawn for the whole generation at once (ga.selection).
+    scheme: "generational" replaces the whole population every generation;
+    "steady_state" (objects engine only) breeds two children at a time and writes them
+    into the population in place, see evolve_steady_state. There the replaced member
+    is chosen by replacement ("worst" or "tournament") and elites is not used.
+    eval_cache: optional ga.eval_cache.EvalCache memoizing evaluations (and, with
+    routes=True, route lengths); its hit rates are left in eval_cache.stats, and a
+    profiler records them too.
+    time_limit / max_evals / patience / target_cost: optional extra stopping criteria
+    (see ga.stopping.StoppingCriteria); generations stays the upper bound. Whichever
+    criterion fires, the best individual seen during the run is returned.
+    return_info: also return a dict with stop_reason ("generations", "time_limit",
+    "max_evals", "stagnation" or "target_cost"), generations, evaluations, seconds
+    and best_cost, as a fourth element; with a capacity also the best solution's
+    load_excess (0 when it is feasible).
+    checkpoint_path: snapshot the run there every checkpoint_every generations and when
+    it stops (ga.checkpoint.Checkpoint). If the file already exists the run resumes from
+    it and gives bit-for-bit the result of an uninterrupted run; resuming a finished run
+    just returns its result. The file is refused if written under other settings,
+    other distances (or demands) or another version of the ga package. return_info
+    then also reports resumed_gens, the generations reloaded from the file.
+    profiler: optional ga.profiling.Profiler filled with per-phase timers, evaluation
+    and allocation counts; without one the hooks are no-ops.
+    """
+    if engine not in ("objects", "arrays"):
+        raise ValueError(f"unknown engine {engine!r}, expected 'objects' or 'arrays'")
+    if decoder not in DECODERS:
+        raise ValueError(f"unknown decoder {decoder!r}, expected one of {DECODERS}")
+    if not 0 <= elites <= pop_size:
+        raise ValueError(f"need 0 <= elites <= pop_size, got {elites} for a population of {pop_size}")
+    if scheme not in SCHEMES:
+        raise ValueError(f"unknown scheme {scheme!r}, expected one of {SCHEMES}")
+    if replacement not in REPLACEMENTS:
+        raise ValueError(f"unknown replacement {replacement!r}, expected one of {REPLACEMENTS}")
+    if scheme == "steady_state" and engine != "objects":
+        raise ValueError("scheme='steady_state' needs engine='objects'")
+    if engine == "arrays" and (not batch_eval or delta_eval):
+        raise ValueError("engine='arrays' always evaluates in batches without delta updates; "
+                         "batch_eval=False and delta_eval=True need engine='objects'")
+    _check_decoder_eval(decoder, batch_eval, delta_eval)
+    if local_search is not None and local_search.capacity is not capacity:
+        raise ValueError("local_search must be built with the run's capacity")
+    options = dict(local_search=local_search, ls_rate=ls_rate, ls_elites=ls_elites, decoder=decoder,
+                   seeding=seeding, capacity=capacity, elites=elites, eval_cache=eval_cache)
+    stopper = StoppingCriteria(generations, time_limit, max_evals, patience, target_cost)
+    if checkpoint_path is not None:
+        fingerprint = dict(N=N, V=V, pop_size=pop_size, generations=generations, k_tourn=k_tourn,
+                           pc=pc, pm_perm=pm_perm, pm_cuts=pm_cuts, seed=seed, engine=engine,
+                           batch_eval=batch_eval, delta_eval=delta_eval, decoder=decoder,
+                           local_search=local_search is not None, ls_rate=ls_rate, ls_elites=ls_elites,
+                           seeding=None if seeding is None else [list(seeding.methods), seeding.fraction],
+                           capacity=None if capacity is None else [capacity.capacity, capacity.penalty,
+                                                                   capacity.repair,
+                                                                   array_digest(capacity.demand)],
+                           elites=elites, scheme=scheme, replacement=replacement, eval_cache_routes=eval_cache is not None and eval_cache.routes,
+                           time_limit=time_limit, max_evals=max_evals, patience=patience,
+                           target_cost=target_cost, data=matrix_digest(dmat), code=code_digest())
+        options["checkpoint"] = Checkpoint(checkpoint_path, checkpoint_every, fingerprint)
+    if profiler is not None:
+        options["profiler"] = profiler
+        profiler.start(eval_cache)
+    try:
+        if engine == "arrays":
+            result = _genetic_algorithm_arrays(dmat, N, V, pop_size, generations, k_tourn,
+                                               pc, pm_perm, pm_cuts, seed, log_convergence, stopper, **options)
+        else:
+            result = _genetic_algorithm_objects(dmat, N, V, pop_size, generations, k_tourn,
+                                                pc, pm_perm, pm_cuts, seed, log_convergence, batch_eval,
+                                                delta_eval, stopper, scheme, replacement, **options)
+    finally:
+        if profiler is not None:
+            profiler.stop()
+        if local_search is not None:
+            local_search.stats["run_seconds"] += stopper.seconds()
+    if not return_info:
+        return result
+    info = stopper.info()
+    info["best_cost"] = result[1]
+    if capacity is not None:
+        info["load_excess"] = capacity.excess(result[0].perm, result[0].cuts)
+    if "checkpoint" in options:
+        info["resumed_gens"] = options["checkpoint"].resumed_gens
+    return result + (info,)
+
 
-    
+def _genetic_algorithm_objects(dmat, N, V, pop_size, generations, k_tourn, pc, pm_perm, pm_cuts,
+                               seed, log_convergence, batch_eval, delta_eval, stopper, scheme, replacement,
+                               checkpoint=None, **options):
+    prof = options.get("profiler") or NULL_PROFILER
+    seeding = options.pop("seeding")
     rng = random.Random(seed)
-    pop = [random_individual(N, V, rng) for _ in range(pop_size)]
     histories = []
+    restored = checkpoint.load(stopper, prof) if checkpoint is not None else None
+    if restored is None:
+        with prof.phase("init"):
+            pop = []
+            if seeding is not None:
+                pop = seeding.individuals(seeding.count(pop_size), N, V, np.random.default_rng(rng.getrandbits(64)))
+            pop += [random_individual(N, V, rng) for _ in range(pop_size - len(pop))]
+            prof.count("allocations", pop_size)
+            if batch_eval:
+                evaluate_population(pop, dmat, V, options["decoder"], options["eval_cache"], options["capacity"])
+            stopper.offer(min(pop, key=lambda ind: total_distance(ind, dmat, V, options["eval_cache"],
+                                                                  options["capacity"])))
+    else:
+        pop, rng_state, histories = restored
+        rng.setstate(rng_state)
+
+    evolve = evolve_population
+    if scheme == "steady_state":
+        # replacement never drops the best member, so seeds need no special care there
+        evolve = evolve_steady_state
+        del options["elites"]
+        options["replacement"] = replacement
+    else:
+        options["seeded"] = seeding is not None
+
+    # Without a checkpoint this is a single call; with one, chunks end on snapshot
+    # boundaries and evolve(start_gen=...) makes them join up seamlessly.
+    while stopper.reason is None:
+        gen = stopper.gens_done
+        chunk = generations - gen if checkpoint is None else checkpoint.every - gen % checkpoint.every
+        pop = evolve(pop, rng, dmat, N, V, chunk, k_tourn, pc, pm_perm, pm_cuts,
+                     histories=histories if log_convergence else None, batch_eval=batch_eval,
+                     start_gen=gen, delta_eval=delta_eval, stopper=stopper, **options)
+        if checkpoint is not None:
+            with prof.phase("bookkeeping"):
+                checkpoint.save(pop, rng.getstate(), histories, stopper, prof)
+
+    best_ind = min(pop, key=lambda ind: total_distance(ind, dmat, V, capacity=options["capacity"]))
+    if stopper.best is not None and stopper.best_cost < best_ind.cost:
+        best_ind = stopper.best
+    if delta_eval:
+        best_ind.invalidate()  # report a from-scratch cost, not one accumulated through deltas
+    best_dist = total_distance(best_ind, dmat, V, capacity=options["capacity"])
+    return best_ind, best_dist, histories
+
+
+def _check_decoder_eval(decoder: str, batch_eval: bool, delta_eval: bool):
+    """The split decoders re-derive the cuts at evaluation, which only batch evaluation does."""
+    if decoder != "cuts" and (not batch_eval or delta_eval):
+        raise ValueError(f"decoder={decoder!r} needs batch_eval=True and delta_eval=False")
+
+
+def _breed(p1: Individual, p2: Individual, rng: random.Random, dmat, N: int, V: int, pc: float,
+           pm_perm: float, pm_cuts: float, split: bool, delta_eval: bool, prof,
+           capacity: Capacity = None) -> Tuple[Individual, Individual]:
+    """
+    Two children of p1 and p2: crossover with probability pc, then the mutations and,
+    with capacity.repair, the capacity repair.
+    """
+    def mutate(perm, cuts, cost):
+        with prof.phase("mutation"):
+            if split:
+                # cuts are re-derived at evaluation, so only the perm is mutated
+                changed = swap_mutation_perm(perm, pm_perm, rng)
+                child = Individual(perm, cuts, None if changed else cost)
+            elif not delta_eval:
+                swap_mutation_perm(perm, pm_perm, rng)
+                jitter_mutation_cuts(cuts, pm_cuts, N, rng)
+                child = Individual(perm, cuts)
+            else:
+                child = Individual(perm, cuts, cost)
+                swap_mutation(child, pm_perm, rng, dmat, capacity)
+                jitter_mutation(child, pm_cuts, N, rng, dmat, capacity)
+        with prof.phase("route_aware"):
+            route_aware_mutation(child, pm_perm * 0.5, N, V, rng, dmat if delta_eval else None, capacity)
+        if capacity is not None and capacity.repair and not split:
+            with prof.phase("mutation"):
+                cuts = capacity.repair_cuts(child.perm, child.cuts, dmat)
+                if cuts is not None:
+                    child.cuts = cuts
+        return child
+
+    with prof.phase("crossover"):
+        if rng.random() < pc:
+            child1_perm = order_crossover(p1.perm, p2.perm, rng)
+            child1_cuts = cuts_crossover(p1.cuts, p2.cuts, N, V, rng) if not split else p1.cuts[:]
+
+            child2_perm = order_crossover(p2.perm, p1.perm, rng)
+            child2_cuts = cuts_crossover(p2.cuts, p1.cuts, N, V, rng) if not split else p2.cuts[:]
+            cost1 = cost2 = None
+        else:
+            child1_perm = p1.perm[:]
+            child1_cuts = p1.cuts[:]
+            child2_perm = p2.perm[:]
+            child2_cuts = p2.cuts[:]
+            cost1, cost2 = p1.cost, p2.cost
+
+    # Apply mutations
+    return mutate(child1_perm, child1_cuts, cost1), mutate(child2_perm, child2_cuts, cost2)
 
 
-    def tournament(pop):
-        best = rng.choice(pop)
-        for _ in range(k_tourn-1):
-            ind = rng.choice(pop)
-            if total_distance(ind, dmat, V) < total_distance(best, dmat, V):
-                best = ind
-        return best
+def evolve_population(pop: List[Individual], rng: random.Random, dmat: "np.ndarray", N: int, V: int,
+                      generations: int, k_tourn: int, pc: float, pm_perm: float, pm_cuts: float,
+                      histories: List[float] = None, batch_eval: bool = True, start_gen: int = 0,
+                      delta_eval: bool = False, local_search: LocalSearch = None,
+                      ls_rate: float = 0.1, ls_elites: int = 1, decoder: str = "cuts",
+                      elites: int = 1, eval_cache: EvalCache = None, stopper: StoppingCriteria = None,
+                      profiler: Profiler = None, capacity: Capacity = None, seeded: bool = False) -> List[Individual]:
+    """
+    Runs `generations` generations of the objects engine on an existing population and
+    returns the new one. Best distances are appended to `histories` when given.
+    A stopper is updated after every generation and may end the run early; a profiler
+    collects per-phase timings.
+    See genetic_algorithm for the remaining options.
+    start_gen is the generation index of the first step (elitism starts after generation 0),
+    so resuming a run in chunks reproduces one uninterrupted call.
+    seeded: the initial population comes from a Seeding, so elitism already applies in
+    generation 0 and the best seeds are carried into generation 1.
+    """
+    pop_size = len(pop)
+    _check_decoder_eval(decoder, batch_eval, delta_eval)
+    split = decoder != "cuts"
+    prof = profiler if profiler is not None else NULL_PROFILER
 
-    for gen in range(generations):  # This line should be here
+    def breed(p1, p2):
+        return _breed(p1, p2, rng, dmat, N, V, pc, pm_perm, pm_cuts, split, delta_eval, prof, capacity)
+
+    def costs(pop):
+        return np.fromiter((total_distance(ind, dmat, V, eval_cache, capacity) for ind in pop),
+                           dtype=float, count=len(pop))
+
+    cost = costs(pop)
+    for gen in range(start_gen, start_gen + generations):
         new_pop = []
-        
+
+        # All tournaments of the generation at once over the cost vector; the numpy
+        # generator is seeded from rng so the run still depends on rng's state alone
+        with prof.phase("selection"):
+            sel_rng = np.random.default_rng(rng.getrandbits(64))
+            parents = select_parents(cost, pop_size // 2, k_tourn, sel_rng)
+
         # Create offspring pairs 
-        for _ in range(pop_size // 2):
-            p1, p2 = tournament(pop), tournament(pop)
-            
-            # Ensure parents are different
-            attempts = 0
-            while p1 is p2 and attempts < 5:
-                p2 = tournament(pop)
-                attempts += 1
-            
-            # Create two children
-            if rng.random() < pc:
-                child1_perm = order_crossover(p1.perm, p2.perm, rng)
-                child1_cuts = cuts_crossover(p1.cuts, p2.cuts, N, V, rng)
-                
-                child2_perm = order_crossover(p2.perm, p1.perm, rng)
-                child2_cuts = cuts_crossover(p2.cuts, p1.cuts, N, V, rng)
-            else:
-                child1_perm = p1.perm[:]
-                child1_cuts = p1.cuts[:]
-                child2_perm = p2.perm[:]
-                child2_cuts = p2.cuts[:]
-            
-            # Apply mutations
-            swap_mutation_perm(child1_perm, pm_perm, rng)
-            jitter_mutation_cuts(child1_cuts, pm_cuts, N, rng)
-            child1 = Individual(child1_perm, child1_cuts)
-            route_aware_mutation(child1, pm_perm * 0.5, N, V, rng)
-            
-            swap_mutation_perm(child2_perm, pm_perm, rng)
-            jitter_mutation_cuts(child2_cuts, pm_cuts, N, rng)
-            child2 = Individual(child2_perm, child2_cuts)
-            route_aware_mutation(child2, pm_perm * 0.5, N, V, rng)
-            
-            new_pop.append(child1)
-            new_pop.append(child2)
+        for i, j in parents.tolist():
+            new_pop.extend(breed(pop[i], pop[j]))
         
         # Handle odd population size
         if len(new_pop) < pop_size:
-            p1 = tournament(pop)
-            new_pop.append(Individual(p1.perm[:], p1.cuts[:]))
-        
-        # Elitism - keep best individual from previous generation
-        if gen > 0:
-            current_best = min(pop, key=lambda ind: total_distance(ind, dmat, V))
-            # Replace worst individual in new population
-            worst_idx = max(range(len(new_pop)), 
-                           key=lambda i: total_distance(new_pop[i], dmat, V))
-            new_pop[worst_idx] = current_best
+            with prof.phase("selection"):
+                p1 = pop[int(tournament(cost, 1, k_tourn, sel_rng)[0])]
+                new_pop.append(Individual(p1.perm[:], p1.cuts[:], p1.cost))
+        prof.count("allocations", len(new_pop))
+
+        if batch_eval:
+            with prof.phase("evaluation"):
+                evaluate_population(new_pop, dmat, V, decoder, eval_cache, capacity)
+
+        # Memetic stage on a random share of the offspring
+        if local_search is not None:
+            with prof.phase("local_search"):
+                for child in new_pop:
+                    if rng.random() < ls_rate:
+                        local_search.improve(child, V)
         
-        pop = new_pop[:pop_size]  # maintain population size
+        # Elitism - the best of the previous generation replace the worst offspring
+        with prof.phase("elitism"):
+            new_cost = costs(new_pop)
+            if (gen > 0 or seeded) and elites > 0:
+                best = best_indices(cost, elites)
+                for w, e in zip(worst_indices(new_cost, len(best)).tolist(), best.tolist()):
+                    new_pop[w] = pop[e]
+                    new_cost[w] = cost[e]
+
+            pop, cost = new_pop[:pop_size], new_cost[:pop_size]  # maintain population size
 
+        if local_search is not None and ls_elites > 0:
+            with prof.phase("local_search"):
+                for i in best_indices(cost, ls_elites).tolist():
+                    local_search.improve(pop[i], V)
+                    cost[i] = pop[i].cost
         
-        if log_convergence:
-            best_dist = min(total_distance(ind, dmat, V) for ind in pop)
-            histories.append(best_dist)
+        with prof.phase("bookkeeping"):
+            prof.count("generations")
+            best = int(np.argmin(cost))
+            if histories is not None:
+                histories.append(float(cost[best]))
+
+            stopped = stopper is not None and stopper.update(pop[best])
+        if stopped:
+            break
+
+    return pop
+
+
+def evolve_steady_state(pop: List[Individual], rng: random.Random, dmat: "np.ndarray", N: int, V: int,
+                        generations: int, k_tourn: int, pc: float, pm_perm: float, pm_cuts: float,
+                        histories: List[float] = None, batch_eval: bool = True, start_gen: int = 0,
+                        delta_eval: bool = False, local_search: LocalSearch = None,
+                        ls_rate: float = 0.1, ls_elites: int = 1, decoder: str = "cuts",
+                        replacement: str = "worst", eval_cache: EvalCache = None,
+                        stopper: StoppingCriteria = None, profiler: Profiler = None,
+                        capacity: Capacity = None) -> List[Individual]:
+    """
+    Steady-state counterpart of evolve_population: every step breeds two children from
+    the current population with the same operators, evaluates them and writes them
+    into it in place, so improvements can be parents in the very next step.
+    A "generation" is pop_size // 2 steps (the same evaluation budget as a generational
+    one); histories, ls_elites, the stopper and the profiler work per generation.
+    replacement: "worst" - a child replaces the current worst member if it is better
+    (found through a WorstHeap in O(log P)); "tournament" - it replaces the loser of a
+    k_tourn tournament unconditionally, except that the best member is never replaced.
+    """
+    pop = list(pop)
+    pop_size = len(pop)
+    _check_decoder_eval(decoder, batch_eval, delta_eval)
+    split = decoder != "cuts"
+    prof = profiler if profiler is not None else NULL_PROFILER
+    steps = max(1, pop_size // 2)
+    k = max(1, k_tourn)
+
+    cost = np.fromiter((total_distance(ind, dmat, V, eval_cache, capacity) for ind in pop),
+                       dtype=float, count=pop_size)
+    heap = WorstHeap(cost) if replacement == "worst" else None
+    best = int(np.argmin(cost))
+
+    def place(i, child, c):
+        nonlocal best
+        improves = c < cost[best]
+        pop[i] = child
+        if heap is not None:
+            heap.update(i, c)
+        else:
+            cost[i] = c
+        if improves:
+            best = i
+        elif i == best:
+            best = int(np.argmin(cost))
+
+    for gen in range(start_gen, start_gen + generations):
+        # Tournament entrants for the whole generation, drawn up front from a generator
+        # seeded by rng; winners and losers are picked against the costs at each step
+        with prof.phase("selection"):
+            sel_rng = np.random.default_rng(rng.getrandbits(64))
+            draws = sel_rng.integers(pop_size, size=(steps, 2, k)).tolist()
+            losers = sel_rng.integers(pop_size, size=(steps, 2, k)).tolist() if heap is None else None
+
+        for step in range(steps):
+            with prof.phase("selection"):
+                a, b = draws[step]
+                i = min(a, key=cost.__getitem__)
+                # second parent: the best entrant other than the first, if there is one
+                j = min(b, key=lambda x: (x == i, cost[x]))
+            children = _breed(pop[i], pop[j], rng, dmat, N, V, pc, pm_perm, pm_cuts, split, delta_eval, prof,
+                              capacity)
+            prof.count("allocations", 2)
+
+            if batch_eval:
+                with prof.phase("evaluation"):
+                    evaluate_population(children, dmat, V, decoder, eval_cache, capacity)
+            if local_search is not None:
+                with prof.phase("local_search"):
+                    for child in children:
+                        if rng.random() < ls_rate:
+                            local_search.improve(child, V)
+
+            with prof.phase("elitism"):
+                taken = -1
+                for n, child in enumerate(children):
+                    c = total_distance(child, dmat, V, eval_cache, capacity)
+                    if heap is not None:
+                        w = heap.worst()
+                        if c < cost[w]:
+                            place(w, child, c)
+                    else:
+                        entrants = [x for x in losers[step][n] if x != best and x != taken]
+                        if entrants:
+                            taken = max(entrants, key=cost.__getitem__)
+                            place(taken, child, c)
+
+        if local_search is not None and ls_elites > 0:
+            with prof.phase("local_search"):
+                for i in best_indices(cost, ls_elites).tolist():
+                    local_search.improve(pop[i], V)
+                    place(i, pop[i], pop[i].cost)
+
+        with prof.phase("bookkeeping"):
+            prof.count("generations")
+            if histories is not None:
+                histories.append(float(cost[best]))
+
+            stopped = stopper is not None and stopper.update(pop[best])
+        if stopped:
+            break
+
+    return pop
+
+
+def _genetic_algorithm_arrays(dmat, N, V, pop_size, generations, k_tourn,
+                              pc, pm_perm, pm_cuts, seed, log_convergence, stopper, checkpoint=None,
+                              local_search=None, ls_rate=0.1, ls_elites=1, decoder="cuts", seeding=None,
+                              capacity=None, elites=1, eval_cache=None, profiler=None):
+    """Same generational scheme as genetic_algorithm over two swapping Population buffers."""
+    split = decoder != "cuts"
+    gen_rng = np.random.default_rng(seed)
+    pop = Population(pop_size, N, V)
+    offspring = Population(pop_size, N, V)
+    histories = []
+    prof = profiler if profiler is not None else NULL_PROFILER
+    restored = checkpoint.load(stopper, prof) if checkpoint is not None else None
+    if restored is None:
+        with prof.phase("init"):
+            pop.randomize(gen_rng)
+            if seeding is not None:
+                for i, ind in enumerate(seeding.individuals(seeding.count(pop_size), N, V, gen_rng)):
+                    pop.perms[i], pop.cuts[i] = ind.perm, ind.cuts
+            pop.evaluate(dmat, decoder, eval_cache, capacity)
+            stopper.offer(pop[int(np.argmin(pop.cost))])
+    else:
+        individuals, rng_state, histories = restored
+        pop.perms[:] = [ind.perm for ind in individuals]
+        pop.cuts[:] = [ind.cuts for ind in individuals]
+        pop.cost[:] = [np.nan if ind.cost is None else ind.cost for ind in individuals]
+        gen_rng.bit_generator.state = rng_state
+    draw = np.empty((pop_size, N))
+    n_pairs = pop_size // 2
+
+    for gen in range(stopper.gens_done if stopper.reason is None else generations, generations):
+        # Pick all parent pairs, then breed the whole generation into the offspring buffer
+        with prof.phase("selection"):
+            parents = select_parents(pop.cost, n_pairs, k_tourn, gen_rng)
+
+        with prof.phase("crossover"):
+            crossed = gen_rng.random(n_pairs) < pc
+            cx, cp = np.flatnonzero(crossed), np.flatnonzero(~crossed)
+            a, b = parents[cx, 0], parents[cx, 1]
+            offspring.perms[2*cx] = order_crossover_batch(pop.perms[a], pop.perms[b], gen_rng)
+            offspring.perms[2*cx+1] = order_crossover_batch(pop.perms[b], pop.perms[a], gen_rng)
+            if split:
+                # cuts are re-derived at evaluation
+                offspring.cuts[2*cx], offspring.cuts[2*cx+1] = pop.cuts[a], pop.cuts[b]
+            else:
+                offspring.cuts[2*cx] = cuts_crossover_batch(pop.cuts[a], pop.cuts[b], N, V, gen_rng)
+                offspring.cuts[2*cx+1] = cuts_crossover_batch(pop.cuts[b], pop.cuts[a], N, V, gen_rng)
+            offspring.cost[2*cx] = offspring.cost[2*cx+1] = np.nan
+            for child, col in ((2*cp, 0), (2*cp+1, 1)):
+                src = parents[cp, col]
+                offspring.perms[child] = pop.perms[src]
+                offspring.cuts[child] = pop.cuts[src]
+                offspring.cost[child] = pop.cost[src]
+
+        # Handle odd population size
+        if pop_size % 2:
+            with prof.phase("selection"):
+                offspring.copy_row(pop, int(tournament(pop.cost, 1, k_tourn, gen_rng)[0]), pop_size - 1)
+
+        # Mutations over the whole buffer
+        with prof.phase("mutation"):
+            offspring.cost[swap_mutation_rows(offspring.perms, pm_perm, gen_rng, draw)] = np.nan
+            if not split:
+                offspring.cost[jitter_mutation_rows(offspring.cuts, pm_cuts, N, gen_rng)] = np.nan
+        with prof.phase("route_aware"):
+            for j in np.flatnonzero(gen_rng.random(pop_size) < pm_perm * 0.5):
+                if route_aware_mutation_row(offspring.perms[j], offspring.cuts[j], V, gen_rng):
+                    offspring.cost[j] = np.nan
+        if capacity is not None and capacity.repair and not split:
+            with prof.phase("mutation"):
+                for j in np.flatnonzero(np.isnan(offspring.cost)):
+                    cuts = capacity.repair_cuts(offspring.perms[j], offspring.cuts[j], dmat)
+                    if cuts is not None:
+                        offspring.cuts[j] = cuts
+
+        with prof.phase("evaluation"):
+            offspring.evaluate(dmat, decoder, eval_cache, capacity)
+
+        # Memetic stage on a random share of the offspring (views write back into the buffer)
+        if local_search is not None:
+            with prof.phase("local_search"):
+                for j in np.flatnonzero(gen_rng.random(pop_size) < ls_rate):
+                    local_search.improve(offspring[j], V)
+
+        # Elitism - the best of the previous generation replace the worst offspring
+        with prof.phase("elitism"):
+            # from generation 0 on for a seeded population, so its best seeds survive
+            if (gen > 0 or seeding is not None) and elites > 0:
+                best = best_indices(pop.cost, elites)
+                for w, e in zip(worst_indices(offspring.cost, len(best)).tolist(), best.tolist()):
+                    offspring.copy_row(pop, e, w)
+
+            pop, offspring = offspring, pop
+
+        if local_search is not None and ls_elites > 0:
+            with prof.phase("local_search"):
+                for j in best_indices(pop.cost, ls_elites):
+                    local_search.improve(pop[j], V)
+
+        with prof.phase("bookkeeping"):
+            prof.count("generations")
+            if log_convergence:
+                histories.append(float(pop.cost.min()))
 
+            stopped = stopper.update(pop[int(np.argmin(pop.cost))])
+            if checkpoint is not None and (stopped or checkpoint.due(gen)):
+                checkpoint.save([pop[i] for i in range(pop_size)], gen_rng.bit_generator.state, histories,
+                                stopper, prof)
+        if stopped:
+            break
 
-    best_ind = min(pop, key=lambda ind: total_distance(ind, dmat, V))
-    best_dist = total_distance(best_ind, dmat, V)
-    return best_ind, best_dist, histories
\ No newline at end of file
+    best_ind = pop[int(np.argmin(pop.cost))].detach()
+    if stopper.best is not None and stopper.best_cost < best_ind.cost:
+        best_ind = stopper.best
+    return best_ind, best_ind.cost, histories
@@ -0,0 +1,127 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from .capacity import Capacity
+from .chromosome import Individual, random_individual
+from .fitness import evaluate_population
+from .ga_solver import evolve_population
+from .shared import SharedArrays, resolve
+
+TOPOLOGIES = ("ring", "full", "random")
+
+# per-process state set once by the pool initializer, so dmat is not re-sent every epoch
+_WORKER = {}
+
+def _init_island_worker(dmat, N: int, V: int, capacity: Optional[Capacity] = None):
+    _WORKER.update(dmat=resolve(dmat), N=N, V=V, capacity=capacity)
+
+def _run_epoch(pop: List[Individual], rng_state, params: Dict, generations: int, start_gen: int):
+    rng = random.Random()
+    rng.setstate(rng_state)
+    hist = []
+    pop = evolve_population(pop, rng, _WORKER["dmat"], _WORKER["N"], _WORKER["V"], generations,
+                            params["k_tourn"], params["pc"], params["pm_perm"], params["pm_cuts"],
+                            histories=hist, start_gen=start_gen, capacity=_WORKER["capacity"])
+    return pop, rng.getstate(), hist
+
+
+def _migration_sources(topology: str, n_islands: int, rng: random.Random) -> List[List[int]]:
+    """For each destination island, the islands it receives migrants from."""
+    if topology == "ring":
+        return [[(i - 1) % n_islands] for i in range(n_islands)]
+    if topology == "full":
+        return [[j for j in range(n_islands) if j != i] for i in range(n_islands)]
+    sources = [[] for _ in range(n_islands)]
+    for j in range(n_islands):
+        dest = rng.randrange(n_islands - 1)
+        sources[dest if dest < j else dest + 1].append(j)
+    return sources
+
+
+def migrate(pops: List[List[Individual]], n_migrants: int, topology: str, rng: random.Random):
+    """
+    Copies the best n_migrants of each source island over the worst members of its
+    destinations (in place). Emigrants are picked before anything is replaced.
+    """
+    if len(pops) < 2 or n_migrants <= 0:
+        return
+    emigrants = [sorted(pop, key=lambda ind: ind.cost)[:n_migrants] for pop in pops]
+    for dest, sources in enumerate(_migration_sources(topology, len(pops), rng)):
+        incoming = sorted((ind for j in sources for ind in emigrants[j]), key=lambda ind: ind.cost)[:n_migrants]
+        pop = pops[dest]
+        worst = sorted(range(len(pop)), key=lambda i: pop[i].cost, reverse=True)[:len(incoming)]
+        for i, ind in zip(worst, incoming):
+            pop[i] = Individual(ind.perm[:], ind.cuts[:], ind.cost)
+
+
+def island_genetic_algorithm(dmat: "np.ndarray", N: int, V: int,
+                             pop_size: int, generations: int, k_tourn: int,
+                             pc: float, pm_perm: float, pm_cuts: float,
+                             n_islands: int = 4, migration_interval: int = 25, n_migrants: int = 2,
+                             topology: str = "ring", island_params: Optional[List[Dict]] = None,
+                             seed: int = None, workers: Optional[int] = None,
+                             capacity: Optional[Capacity] = None
+                            ) -> Tuple[Individual, float, List[float]]:
+    """
+    Island-model GA: n_islands populations of pop_size evolve in separate worker processes
+    and exchange their best n_migrants every migration_interval generations over a
+    "ring", "full" (fully connected) or "random" topology.
+    island_params: optional per-island overrides of k_tourn/pc/pm_perm/pm_cuts.
+    workers: process count (default min(n_islands, cores)); 1 runs the islands in this process.
+    capacity: optional ga.capacity.Capacity, penalizing overloaded routes on every island.
+    Returns the best individual over all islands, its distance and the per-generation best
+    over all islands. Results depend only on seed, not on the worker count.
+    """
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"unknown topology {topology!r}, expected one of {TOPOLOGIES}")
+    if island_params is not None and len(island_params) != n_islands:
+        raise ValueError(f"island_params has {len(island_params)} entries for {n_islands} islands")
+
+    base = {"k_tourn": k_tourn, "pc": pc, "pm_perm": pm_perm, "pm_cuts": pm_cuts}
+    params = [dict(base, **(island_params[i] if island_params else {})) for i in range(n_islands)]
+
+    master = random.Random(seed)
+    rngs = [random.Random(master.getrandbits(64)) for _ in range(n_islands)]
+    pops = []
+    for rng in rngs:
+        pop = [random_individual(N, V, rng) for _ in range(pop_size)]
+        evaluate_population(pop, dmat, V, capacity=capacity)
+        pops.append(pop)
+    states = [rng.getstate() for rng in rngs]
+    island_hists = [[] for _ in range(n_islands)]
+
+    workers = workers or min(n_islands, os.cpu_count() or 1)
+    with ExitStack() as stack:
+        worker_dmat = dmat
+        if workers > 1 and isinstance(dmat, np.ndarray):
+            # workers attach to one shared-memory copy instead of each unpickling the matrix
+            worker_dmat = stack.enter_context(SharedArrays({"dmat": dmat})).handles["dmat"]
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_island_worker,
+                                   initargs=(worker_dmat, N, V, capacity)) if workers > 1 else None
+        if pool is None:
+            _init_island_worker(dmat, N, V, capacity)
+        else:
+            stack.callback(pool.shutdown)
+        gen = 0
+        while gen < generations:
+            epoch = min(migration_interval, generations - gen)
+            if pool is None:
+                done = [_run_epoch(pops[i], states[i], params[i], epoch, gen) for i in range(n_islands)]
+            else:
+                futures = [pool.submit(_run_epoch, pops[i], states[i], params[i], epoch, gen)
+                           for i in range(n_islands)]
+                done = [f.result() for f in futures]
+            for i, (pop, state, hist) in enumerate(done):
+                pops[i], states[i] = pop, state
+                island_hists[i].extend(hist)
+            gen += epoch
+            if gen < generations:
+                migrate(pops, n_migrants, topology, master)
+
+    # island costs all come from batch evaluation (no delta updates), so they are exact
+    best_ind = min((ind for pop in pops for ind in pop), key=lambda ind: ind.cost)
+    histories = [min(h[g] for h in island_hists) for g in range(generations)]
+    return best_ind, best_ind.cost, histories
@@ -0,0 +1,239 @@
+import time
+from typing import Dict, List, Sequence
+import numpy as np
+from .chromosome import Individual, decode_routes
+
+MOVES = ("two_opt", "or_opt", "relocate", "swap")
+
+# improvements smaller than this are treated as float noise
+_EPS = 1e-9
+# rows of the distance matrix scanned at once when building neighbor lists
+_BLOCK_ELEMS = 1 << 22
+
+
+def neighbor_lists(dmat, k: int) -> np.ndarray:
+    """
+    (n, k) array whose row c lists the k customers closest to c (depot and c itself
+    excluded), nearest first. Row 0 holds the customers closest to the depot.
+    Distance providers with their own index (utils.CoordinateDistances) answer
+    through dmat.neighbors(k) instead of a scan over the full matrix.
+    """
+    if hasattr(dmat, "neighbors"):
+        return np.asarray(dmat.neighbors(k), dtype=np.intp)
+    n = dmat.shape[0]
+    k = max(0, min(k, n - 2))
+    out = np.zeros((n, k), dtype=np.intp)
+    if k == 0:
+        return out
+    cols = np.arange(n)
+    block = max(1, _BLOCK_ELEMS // n)
+    for start in range(0, n, block):
+        rows = np.arange(start, min(start + block, n))
+        dist = np.array(dmat[rows[:, None], cols[None, :]], dtype=float)
+        dist[:, 0] = np.inf
+        dist[np.arange(len(rows)), rows] = np.inf
+        nearest = np.argpartition(dist, k - 1, axis=1)[:, :k]
+        order = np.argsort(np.take_along_axis(dist, nearest, axis=1), axis=1)
+        out[rows] = np.take_along_axis(nearest, order, axis=1)
+    return out
+
+
+class LocalSearch:
+    """
+    First-improvement local search over granular neighborhoods: a move involving
+    customers u and v is only tried when v is among u's k nearest neighbors.
+
+    moves: any of "two_opt" (intra-route segment reversal), "or_opt" (move a run of
+    1-3 customers within its route), "relocate" and "swap" (between routes).
+    max_moves: improving moves applied per improve() call at most.
+    symmetric: whether dmat is symmetric; detected when None. With an asymmetric
+    matrix two_opt prices the reversed segment explicitly.
+    capacity: optional ga.capacity.Capacity. Route loads are kept per route, and
+    relocate and swap moves include the change of the load penalty, which is then
+    part of the costs improve() reports.
+
+    stats accumulates calls, applied moves and seconds spent, so the share of a
+    GA run spent here can be reported separately (see time_share).
+    """
+    def __init__(self, dmat, k: int = 10, max_moves: int = 100,
+                 moves: Sequence[str] = MOVES, symmetric: bool = None, capacity=None):
+        unknown = set(moves) - set(MOVES)
+        if unknown:
+            raise ValueError(f"unknown local search moves {sorted(unknown)}, expected some of {MOVES}")
+        self.dmat = dmat
+        self.neighbors: List[List[int]] = neighbor_lists(dmat, k).tolist()
+        self.max_moves = max_moves
+        self.moves = tuple(moves)
+        if symmetric is None:
+            symmetric = getattr(dmat, "symmetric", None)
+        if symmetric is None:
+            symmetric = isinstance(dmat, np.ndarray) and np.array_equal(dmat, dmat.T)
+        self.symmetric = symmetric
+        self.capacity = capacity
+        self.stats: Dict[str, float] = {"calls": 0, "moves": 0, "seconds": 0.0, "run_seconds": 0.0}
+
+    def time_share(self) -> float:
+        """Fraction of the recorded GA run time spent in improve()."""
+        run = self.stats["run_seconds"]
+        return self.stats["seconds"] / run if run else 0.0
+
+    def improve(self, ind: Individual, V: int) -> float:
+        """Improves ind in place (perm, cuts and a known cost); returns the cost change."""
+        start = time.perf_counter()
+        routes = [[int(c) for c in r] for r in decode_routes(ind, V)]
+        delta = self._search(routes)
+        if delta < 0:
+            cost = ind.cost
+            perm, cuts, pos = [], [], 0
+            for r in routes[:-1]:
+                perm.extend(r)
+                pos += len(r)
+                cuts.append(pos)
+            perm.extend(routes[-1])
+            ind.perm = perm
+            ind.cuts = cuts
+            if cost is not None:
+                ind.cost = float(cost + delta)
+        self.stats["calls"] += 1
+        self.stats["seconds"] += time.perf_counter() - start
+        return delta
+
+    def _search(self, routes: List[List[int]]) -> float:
+        d = self.dmat
+        n = len(self.neighbors)
+        route_of = [0] * n
+        pos = [0] * n
+
+        def index(r):
+            for p, c in enumerate(routes[r]):
+                route_of[c] = r
+                pos[c] = p
+
+        for r in range(len(routes)):
+            index(r)
+
+        cap = self.capacity
+        if cap is not None:
+            dem = cap.demand.tolist()
+            loads = [sum(dem[c] for c in route) for route in routes]
+
+            def over(load):
+                return load - cap.capacity if load > cap.limit else 0.0
+
+            # penalty change when `amount` of load moves from route ra to rb
+            def load_change(ra, rb, amount):
+                if ra == rb or amount == 0:
+                    return 0.0
+                return cap.penalty * (over(loads[ra] - amount) + over(loads[rb] + amount)
+                                      - over(loads[ra]) - over(loads[rb]))
+
+        def pred(route, i):
+            return route[i-1] if i > 0 else 0
+
+        def succ(route, i):
+            return route[i+1] if i + 1 < len(route) else 0
+
+        def two_opt(u, v):
+            route = routes[route_of[u]]
+            a, b = sorted((pos[u], pos[v]))
+            if b - a < 2:
+                return None
+            x, y = route[a], route[b]
+            x1, y1 = route[a+1], succ(route, b)
+            gain = d[x, y] + d[x1, y1] - d[x, x1] - d[y, y1]
+            if not self.symmetric:
+                seg = route[a+1:b+1]
+                gain += sum(d[seg[i+1], seg[i]] - d[seg[i], seg[i+1]] for i in range(len(seg) - 1))
+            if gain >= -_EPS:
+                return None
+            route[a+1:b+1] = route[a+1:b+1][::-1]
+            index(route_of[u])
+            return gain
+
+        def or_opt(u, v):
+            r = route_of[u]
+            route = routes[r]
+            i = pos[u]
+            for length in (1, 2, 3):
+                if i + length > len(route):
+                    break
+                seg = route[i:i+length]
+                if v in seg or v == pred(route, i):
+                    continue
+                p, nx = pred(route, i), succ(route, i + length - 1)
+                sv = succ(route, pos[v])
+                gain = (d[p, nx] - d[p, seg[0]] - d[seg[-1], nx]
+                        + d[v, seg[0]] + d[seg[-1], sv] - d[v, sv])
+                if gain < -_EPS:
+                    del route[i:i+length]
+                    j = route.index(v) + 1
+                    route[j:j] = seg
+                    index(r)
+                    return gain
+            return None
+
+        def relocate(u, v):
+            ru, rv = routes[route_of[u]], routes[route_of[v]]
+            i, j = pos[u], pos[v]
+            pu, su = pred(ru, i), succ(ru, i)
+            removal = d[pu, su] - d[pu, u] - d[u, su]
+            pv, sv = pred(rv, j), succ(rv, j)
+            after = removal + d[v, u] + d[u, sv] - d[v, sv]
+            before = removal + d[pv, u] + d[u, v] - d[pv, v]
+            if cap is not None:
+                penalty = load_change(route_of[u], route_of[v], dem[u])
+                after, before = after + penalty, before + penalty
+            if min(after, before) >= -_EPS:
+                return None
+            if cap is not None:
+                loads[route_of[u]] -= dem[u]
+                loads[route_of[v]] += dem[u]
+            ru.pop(i)
+            rv.insert(j + 1 if after <= before else j, u)
+            index(route_of[u])
+            index(route_of[v])
+            return min(after, before)
+
+        def swap(u, v):
+            ru, rv = routes[route_of[u]], routes[route_of[v]]
+            i, j = pos[u], pos[v]
+            pu, su = pred(ru, i), succ(ru, i)
+            pv, sv = pred(rv, j), succ(rv, j)
+            gain = (d[pu, v] + d[v, su] - d[pu, u] - d[u, su]
+                    + d[pv, u] + d[u, sv] - d[pv, v] - d[v, sv])
+            if cap is not None:
+                gain += load_change(route_of[u], route_of[v], dem[u] - dem[v])
+            if gain >= -_EPS:
+                return None
+            if cap is not None:
+                loads[route_of[u]] -= dem[u] - dem[v]
+                loads[route_of[v]] += dem[u] - dem[v]
+            ru[i], rv[j] = v, u
+            route_of[u], route_of[v] = route_of[v], route_of[u]
+            pos[u], pos[v] = j, i
+            return gain
+
+        intra = [m for m in (two_opt, or_opt) if m.__name__ in self.moves]
+        inter = [m for m in (relocate, swap) if m.__name__ in self.moves]
+
+        total, applied = 0.0, 0
+        improved = True
+        while improved and applied < self.max_moves:
+            improved = False
+            for u in [c for route in routes for c in route]:
+                for v in self.neighbors[u]:
+                    candidates = intra if route_of[u] == route_of[v] else inter
+                    for move in candidates:
+                        gain = move(u, v)
+                        if gain is not None:
+                            total += gain
+                            applied += 1
+                            improved = True
+                            break
+                    else:
+                        continue
+                    break
+                if applied >= self.max_moves:
+                    break
+        self.stats["moves"] += applied
+        return total
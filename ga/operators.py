@@ -1,5 +1,7 @@
 import random
-from typing import List
+from typing import List, Optional
+import numpy as np
+from .capacity import RouteLoads
 
 def order_crossover(p1: List[int], p2: List[int], rng: random.Random) -> List[int]:
     N = len(p1)
@@ -13,19 +15,16 @@ def order_crossover(p1: List[int], p2: List[int], rng: random.Random) -> List[in
     child = [None] * N
     child[a:b+1] = p1[a:b+1]  # Fixed: include endpoint
     
-    # Fill remaining positions with p2 in order
-    p2_filtered = [x for x in p2 if x not in child[a:b+1]]
+    # Fill remaining positions with p2 in order; a membership mask over customer
+    # ids (1..N) keeps this O(N) instead of a list scan per element
+    in_segment = bytearray(N+1)
+    for x in child[a:b+1]:
+        in_segment[x] = 1
+    p2_filtered = [x for x in p2 if not in_segment[x]]
     
-    # Fill positions before crossover segment
-    fill_idx = 0
-    for i in range(a):
-        child[i] = p2_filtered[fill_idx]
-        fill_idx += 1
-    
-    # Fill positions after crossover segment
-    for i in range(b+1, N):
-        child[i] = p2_filtered[fill_idx]
-        fill_idx += 1
+    # Fill positions before and after the crossover segment
+    child[:a] = p2_filtered[:a]
+    child[b+1:] = p2_filtered[a:]
     
     return child
 
@@ -35,30 +34,225 @@ def cuts_crossover(c1: List[int], c2: List[int], N: int, V: int, rng: random.Ran
     else:
         point = rng.randint(1, V-2)
     child = c1[:point] + c2[point:]
-    child = sorted(set([x for x in child if 1 <= x < N]))
-    while len(child) < V-1:
-        val = rng.randint(1, N-1)
-        if val not in child:
-            child.append(val)
-    child.sort()
+    taken = {x for x in child if 1 <= x < N}
+    while len(taken) < V-1:
+        taken.add(rng.randint(1, N-1))
+    return sorted(taken)
+
+def order_crossover_batch(P1: np.ndarray, P2: np.ndarray, gen: np.random.Generator) -> np.ndarray:
+    """
+    OX for many parent pairs at once: row i of the result is order_crossover(P1[i], P2[i])
+    with its own random segment. P1, P2: (M, N) arrays of customer ids 1..N.
+    """
+    M, N = P1.shape
+    if M == 0 or N <= 2:
+        pick = gen.random(M) < 0.5
+        return np.where(pick[:, None], P1, P2)
+    # two distinct points per row
+    x = gen.integers(N, size=M)
+    y = gen.integers(N - 1, size=M)
+    y += y >= x
+    a = np.minimum(x, y)[:, None]
+    b = np.maximum(x, y)[:, None]
+    cols = np.arange(N)
+    segment = (cols >= a) & (cols <= b)
+
+    rows = np.arange(M)[:, None]
+    in_segment = np.zeros((M, N+1), dtype=bool)
+    in_segment[rows, np.where(segment, P1, 0)] = True
+    in_segment[:, 0] = False
+    keep = ~in_segment[rows, P2]
+
+    child = np.empty_like(P1)
+    child[segment] = P1[segment]
+    # each row keeps exactly as many p2 genes as it has free slots, so the
+    # row-major boolean selections line up row by row
+    child[~segment] = P2[keep]
+    return child
+
+def cuts_crossover_batch(C1: np.ndarray, C2: np.ndarray, N: int, V: int,
+                         gen: np.random.Generator) -> np.ndarray:
+    """
+    cuts_crossover for many pairs at once. Rows whose merged cuts collide or fall
+    outside 1..N-1 are refilled with fresh distinct cuts, the rest stay vectorized.
+    """
+    M = C1.shape[0]
+    if V <= 1:
+        return np.empty((M, 0), dtype=C1.dtype)
+    point = np.ones(M, dtype=np.intp) if V <= 2 else gen.integers(1, V-1, size=M)
+    child = np.where(np.arange(V-1) < point[:, None], C1, C2)
+    child.sort(axis=1)
+    bad = ((child < 1) | (child >= N)).any(axis=1) | (np.diff(child, axis=1) == 0).any(axis=1)
+    for i in np.flatnonzero(bad):
+        taken = np.unique(child[i][(child[i] >= 1) & (child[i] < N)])
+        free = np.setdiff1d(np.arange(1, N), taken, assume_unique=True)
+        extra = gen.choice(free, size=V-1-len(taken), replace=False)
+        child[i] = np.sort(np.concatenate((taken, extra)))
     return child
 
-def swap_mutation_perm(perm: List[int], pm: float, rng: random.Random):
+def swap_mutation_perm(perm: List[int], pm: float, rng: random.Random) -> bool:
+    """In-place; returns True if perm changed (caller must invalidate a cached cost)."""
+    changed = False
     for i in range(len(perm)):
         if rng.random() < pm:
             j = rng.randint(0, len(perm)-1)
-            perm[i], perm[j] = perm[j], perm[i]
+            if i != j:
+                perm[i], perm[j] = perm[j], perm[i]
+                changed = True
+    return changed
 
-def jitter_mutation_cuts(cuts: List[int], pm: float, N: int, rng: random.Random):
+def jitter_mutation_cuts(cuts: List[int], pm: float, N: int, rng: random.Random) -> bool:
+    """In-place; returns True if cuts changed (caller must invalidate a cached cost)."""
+    changed = False
     for i in range(len(cuts)):
         if rng.random() < pm:
             delta = rng.randint(-1, 1)
-            cuts[i] = min(max(1, cuts[i]+delta), N-1)
+            new_cut = min(max(1, cuts[i]+delta), N-1)
+            if new_cut != cuts[i]:
+                cuts[i] = new_cut
+                changed = True
+    cuts.sort()
+    return changed
+
+# ---------------- incremental (delta) cost evaluation ----------------
+# A chromosome's cost is the sum of its N+1 "gaps": gap k is the leg(s) between
+# positions k-1 and k, i.e. depot->perm[0] for k = 0, perm[N-1]->depot for k = N,
+# perm[k-1]->depot->perm[k] when a route starts at k, else perm[k-1]->perm[k].
+# Swapping two positions or moving one cut only changes a few gaps, so the cost
+# change is computed from those alone. Legs keep their direction (asymmetric dmat is fine).
+# With a ga.capacity.Capacity the cost also carries the load penalty; a RouteLoads
+# tracker prices each swap or cut move from the two route loads it changes.
+# Legs are read as Python floats (ndarray.item) and route starts are flags built on
+# the first tracked move of a call. Even so each tracked swap costs a few Python-level
+# lookups, while batch_total_distance re-scores a whole child at numpy speed, which is
+# why genetic_algorithm leaves delta_eval off by default (see benchmarks.operators).
+
+def _leg_fn(dmat):
+    """Scalar dmat[i, j] as a Python float; ndarray.item skips the numpy scalar."""
+    item = getattr(dmat, "item", None)
+    if item is not None:
+        return item
+    return lambda i, j: float(dmat[i, j])
+
+def _gap_cost(perm: List[int], starts, leg, k: int) -> float:
+    """Gap k of perm; starts[k] is nonzero when a route starts at position k."""
+    if k == 0:
+        return leg(0, perm[0])
+    if k == len(perm):
+        return leg(perm[-1], 0)
+    if starts[k]:
+        return leg(perm[k-1], 0) + leg(0, perm[k])
+    return leg(perm[k-1], perm[k])
+
+def _gaps_cost(perm: List[int], starts, leg, gaps) -> float:
+    """Sum of _gap_cost over gaps, inlined since it runs twice per tracked swap."""
+    n = len(perm)
+    total = 0.0
+    for k in gaps:
+        if k == 0:
+            total += leg(0, perm[0])
+        elif k == n:
+            total += leg(perm[-1], 0)
+        elif starts[k]:
+            total += leg(perm[k-1], 0) + leg(0, perm[k])
+        else:
+            total += leg(perm[k-1], perm[k])
+    return total
+
+def swap_mutation(ind, pm: float, rng: random.Random, dmat, capacity=None) -> Optional[float]:
+    """
+    swap_mutation_perm on ind.perm (same random draws) that keeps ind.cost current
+    from the <= 4 gaps around each swapped pair. Returns the cost change, or None
+    when ind.cost was unknown and nothing was tracked.
+    capacity: Capacity whose penalty is part of ind.cost, kept current as well.
+    """
+    perm = ind.perm
+    n = len(perm)
+    track = ind.cost is not None
+    starts = loads = leg = None
+    delta = 0.0
+    for i in range(n):
+        if rng.random() < pm:
+            j = rng.randint(0, n-1)
+            if i == j:
+                continue
+            if track:
+                if starts is None:
+                    starts = bytearray(n + 1)
+                    for c in ind.cuts:
+                        starts[c] = 1
+                    leg = _leg_fn(dmat)
+                    if capacity is not None:
+                        loads = RouteLoads(capacity, perm, ind.cuts)
+                if loads is not None:
+                    delta += loads.shift(loads.route_of(i), loads.route_of(j),
+                                         loads.demand[perm[i]] - loads.demand[perm[j]])
+                a, b = (i, j) if i < j else (j, i)
+                gaps = (a, b, b+1) if b == a+1 else (a, a+1, b, b+1)
+                before = _gaps_cost(perm, starts, leg, gaps)
+                perm[i], perm[j] = perm[j], perm[i]
+                delta += _gaps_cost(perm, starts, leg, gaps) - before
+            else:
+                perm[i], perm[j] = perm[j], perm[i]
+    if not track:
+        return None
+    ind.cost = float(ind.cost + delta)
+    return delta
+
+def jitter_mutation(ind, pm: float, N: int, rng: random.Random, dmat, capacity=None) -> Optional[float]:
+    """
+    jitter_mutation_cuts on ind.cuts (same random draws) that keeps ind.cost current:
+    moving a cut from a to b only changes gaps a and b (and, with a capacity, the
+    loads of the two routes that trade a customer). Returns the cost change, or
+    None when ind.cost was unknown.
+    """
+    cuts = ind.cuts
+    perm = ind.perm
+    track = ind.cost is not None
+    starts = loads = leg = None
+    delta = 0.0
+    for i in range(len(cuts)):
+        if rng.random() < pm:
+            step = rng.randint(-1, 1)
+            new_cut = min(max(1, cuts[i]+step), N-1)
+            if new_cut == cuts[i]:
+                continue
+            if track:
+                if starts is None:
+                    # counts, not flags: jittered cuts may coincide
+                    starts = [0] * (len(perm) + 1)
+                    for c in cuts:
+                        starts[c] += 1
+                    leg = _leg_fn(dmat)
+                    if capacity is not None:
+                        loads = RouteLoads(capacity, perm, cuts)
+                if loads is not None:
+                    delta += loads.move_cut(perm, cuts[i], new_cut)
+                old = cuts[i]
+                before = _gap_cost(perm, starts, leg, old) + _gap_cost(perm, starts, leg, new_cut)
+                starts[old] -= 1
+                starts[new_cut] += 1
+                delta += _gap_cost(perm, starts, leg, old) + _gap_cost(perm, starts, leg, new_cut) - before
+            cuts[i] = new_cut
     cuts.sort()
-def route_aware_mutation(individual, pm: float, N: int, V: int, rng: random.Random):
-    """Route-aware mutation that can move customers between routes"""
+    if not track:
+        return None
+    ind.cost = float(ind.cost + delta)
+    return delta
+
+def route_aware_mutation(individual, pm: float, N: int, V: int, rng: random.Random,
+                         dmat=None, capacity=None) -> Optional[float]:
+    """
+    Route-aware mutation that can move customers between routes.
+    With dmat and a known individual.cost, the cost is updated from the legs around
+    the removed and inserted customer and the change is returned; capacity adds the
+    penalty change of the two route loads. When re-encoding
+    has to pad the cuts (which splits a route) the cost is dropped for a full
+    re-evaluation instead and None is returned.
+    """
     from .chromosome import decode_routes, Individual
-    
+
+    old_cost = individual.cost
     if rng.random() < pm:
         routes = decode_routes(individual, V)
         non_empty_routes = [i for i, route in enumerate(routes) if route]
@@ -70,12 +264,28 @@ def route_aware_mutation(individual, pm: float, N: int, V: int, rng: random.Rand
             
             if routes[source_idx]:  # Ensure source route is not empty
                 # Remove customer from source route
-                customer_pos = rng.randint(0, len(routes[source_idx])-1)
-                customer = routes[source_idx].pop(customer_pos)
+                source = routes[source_idx]
+                customer_pos = rng.randint(0, len(source)-1)
+                customer = source[customer_pos]
+                if dmat is not None:
+                    leg = _leg_fn(dmat)
+                    prev = source[customer_pos-1] if customer_pos > 0 else 0
+                    nxt = source[customer_pos+1] if customer_pos + 1 < len(source) else 0
+                    delta = leg(prev, nxt) - leg(prev, customer) - leg(customer, nxt)
+                source.pop(customer_pos)
                 
+                if dmat is not None and capacity is not None and old_cost is not None:
+                    loads = RouteLoads(capacity, individual.perm, individual.cuts)
+                    delta += loads.shift(source_idx, target_idx, loads.demand[customer])
+
                 # Add to target route
-                insert_pos = rng.randint(0, len(routes[target_idx]))
-                routes[target_idx].insert(insert_pos, customer)
+                target = routes[target_idx]
+                insert_pos = rng.randint(0, len(target))
+                if dmat is not None:
+                    prev = target[insert_pos-1] if insert_pos > 0 else 0
+                    nxt = target[insert_pos] if insert_pos < len(target) else 0
+                    delta += leg(prev, customer) + leg(customer, nxt) - leg(prev, nxt)
+                target.insert(insert_pos, customer)
                 
                 # Convert back to permutation + cuts format
                 new_perm = []
@@ -90,11 +300,18 @@ def route_aware_mutation(individual, pm: float, N: int, V: int, rng: random.Rand
                             new_cuts.append(current_pos)
                 
                 # Ensure we have exactly V-1 cuts
+                padded = False
                 while len(new_cuts) < V-1 and len(new_cuts) > 0:
                     new_cuts.append(min(N-1, max(new_cuts) + 1))
+                    padded = True
                 new_cuts = new_cuts[:V-1]  # Trim if too many
                 new_cuts.sort()
                 
-                # Update individual
+                # Update individual (the setters drop the cached cost)
                 individual.perm = new_perm
-                individual.cuts = new_cuts
\ No newline at end of file
+                individual.cuts = new_cuts
+                if dmat is not None and old_cost is not None and not padded:
+                    individual.cost = float(old_cost + delta)
+                    return delta
+                return None
+    return 0.0 if old_cost is not None else None
\ No newline at end of file
@@ -0,0 +1,166 @@
+from typing import Optional
+import numpy as np
+from .chromosome import Individual
+from .fitness import EVAL_COUNTS, batch_total_distance, evaluate_population
+
+
+class IndividualView(Individual):
+    """Individual backed by one row of a Population; reads and writes go straight to the buffers."""
+    def __init__(self, population: "Population", index: int):
+        self._population = population
+        self._index = index
+
+    @property
+    def perm(self) -> np.ndarray:
+        return self._population.perms[self._index]
+
+    @perm.setter
+    def perm(self, value):
+        self._population.perms[self._index] = value
+        self.cost = None
+
+    @property
+    def cuts(self) -> np.ndarray:
+        return self._population.cuts[self._index]
+
+    @cuts.setter
+    def cuts(self, value):
+        self._population.cuts[self._index] = value
+        self.cost = None
+
+    @property
+    def cost(self) -> Optional[float]:
+        c = self._population.cost[self._index]
+        return None if np.isnan(c) else float(c)
+
+    @cost.setter
+    def cost(self, value: Optional[float]):
+        self._population.cost[self._index] = np.nan if value is None else value
+
+    def detach(self) -> Individual:
+        """Standalone copy with plain lists, safe to keep after the buffers are reused."""
+        return Individual(self.perm.tolist(), self.cuts.tolist(), self.cost)
+
+
+class Population:
+    """
+    Struct-of-arrays population: perms (P, N), cuts (P, V-1) and cost (P,) in
+    preallocated buffers. A NaN cost marks a row that still needs evaluating.
+    """
+    def __init__(self, pop_size: int, N: int, V: int):
+        self.N = N
+        self.V = V
+        self.perms = np.empty((pop_size, N), dtype=np.int32)
+        self.cuts = np.empty((pop_size, max(V-1, 0)), dtype=np.int32)
+        self.cost = np.full(pop_size, np.nan)
+
+    def __len__(self) -> int:
+        return len(self.cost)
+
+    def __getitem__(self, i: int) -> IndividualView:
+        return IndividualView(self, i)
+
+    def randomize(self, gen: np.random.Generator):
+        """Random shuffles and distinct sorted cuts, like random_individual."""
+        P, N = self.perms.shape
+        self.perms[:] = np.argsort(gen.random((P, N)), axis=1) + 1
+        for i in range(P):
+            self.cuts[i] = np.sort(gen.choice(np.arange(1, N), size=self.V-1, replace=False))
+        self.cost[:] = np.nan
+
+    def evaluate(self, dmat: np.ndarray, decoder: str = "cuts", cache=None, capacity=None):
+        """
+        Score every row whose cost is NaN with one batch call; the split decoders
+        (see evaluate_population) also overwrite those rows' cuts.
+        cache: optional ga.eval_cache.EvalCache, consulted row by row through views.
+        capacity: optional ga.capacity.Capacity whose load penalty is added.
+        """
+        if cache is not None:
+            evaluate_population([self[i] for i in range(len(self))], dmat, self.V, decoder, cache, capacity)
+            return
+        rows = np.flatnonzero(np.isnan(self.cost))
+        EVAL_COUNTS["requested"] += len(self.cost)
+        if len(rows) == 0:
+            return
+        EVAL_COUNTS["computed"] += len(rows)
+        if decoder != "cuts":
+            from .split import batch_split
+            self.cost[rows], self.cuts[rows] = batch_split(self.perms[rows], dmat, self.V,
+                                                           use_all=decoder == "split_all", capacity=capacity)
+            return
+        if len(rows) == len(self.cost):
+            self.cost[:] = batch_total_distance(self.perms, self.cuts, dmat)
+            if capacity is not None:
+                self.cost[:] = capacity.batch_penalize(self.cost, self.perms, self.cuts)
+        else:
+            perms, cuts = self.perms[rows], self.cuts[rows]
+            costs = batch_total_distance(perms, cuts, dmat)
+            self.cost[rows] = costs if capacity is None else capacity.batch_penalize(costs, perms, cuts)
+
+    def copy_row(self, src: "Population", i: int, j: int):
+        """Row j of this population becomes a copy of row i of src (cost included)."""
+        self.perms[j] = src.perms[i]
+        self.cuts[j] = src.cuts[i]
+        self.cost[j] = src.cost[i]
+
+
+# ---------------- in-place array kernels used by the arrays engine ----------------
+
+def swap_mutation_rows(perms: np.ndarray, pm: float, gen: np.random.Generator,
+                       draw: np.ndarray) -> np.ndarray:
+    """
+    Per-gene swap mutation over a whole (P, N) buffer. `draw` is a reusable float
+    buffer of the same shape. Returns the rows that changed.
+    """
+    gen.random(out=draw)
+    rows, cols = np.nonzero(draw < pm)
+    if len(rows) == 0:
+        return rows
+    partners = gen.integers(0, perms.shape[1], size=len(rows))
+    for r, i, j in zip(rows, cols, partners):
+        perms[r, i], perms[r, j] = perms[r, j], perms[r, i]
+    return np.unique(rows[cols != partners])
+
+
+def jitter_mutation_rows(cuts: np.ndarray, pm: float, N: int, gen: np.random.Generator) -> np.ndarray:
+    """Moves each cut by -1/0/+1 with probability pm, keeps rows sorted. Returns the rows that changed."""
+    if cuts.size == 0:
+        return np.empty(0, dtype=np.intp)
+    hit = gen.random(cuts.shape) < pm
+    if not hit.any():
+        return np.empty(0, dtype=np.intp)
+    moved = np.clip(cuts + gen.integers(-1, 2, size=cuts.shape), 1, N-1)
+    changed = hit & (moved != cuts)
+    cuts[changed] = moved[changed]
+    rows = np.flatnonzero(changed.any(axis=1))
+    cuts[rows] = np.sort(cuts[rows], axis=1)
+    return rows
+
+
+def route_aware_mutation_row(perm: np.ndarray, cuts: np.ndarray, V: int,
+                             gen: np.random.Generator) -> bool:
+    """
+    Moves one customer from a random non-empty route to a random position of a
+    random route, shifting perm and cuts in place. Returns True if a move was made.
+    """
+    N = len(perm)
+    bounds = np.concatenate(([0], cuts, [N]))
+    non_empty = np.flatnonzero(np.diff(bounds) > 0)
+    if len(non_empty) < 2:
+        return False
+    src = int(non_empty[gen.integers(len(non_empty))])
+    dst = int(gen.integers(V))
+    s = int(bounds[src] + gen.integers(bounds[src+1] - bounds[src]))
+    customer = perm[s]
+
+    # remove: everything after s shifts left, routes src.. end one earlier
+    perm[s:N-1] = perm[s+1:]
+    cuts[src:] -= 1
+    # insert into dst at a random offset, routes dst.. end one later
+    start = 0 if dst == 0 else int(cuts[dst-1])
+    end = N-1 if dst == V-1 else int(cuts[dst])
+    t = start + int(gen.integers(end - start + 1))
+    perm[t+1:N] = perm[t:N-1]
+    perm[t] = customer
+    cuts[dst:] += 1
+    return True
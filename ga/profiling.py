@@ -0,0 +1,165 @@
+import time
+import tracemalloc
+from typing import Dict, Optional
+from .fitness import EVAL_COUNTS
+
+PHASES = ("init", "selection", "crossover", "mutation", "route_aware", "evaluation",
+          "local_search", "elitism", "bookkeeping")
+# EvalCache.info() counters accumulated per run as cache_* counts
+CACHE_COUNTS = ("lookups", "hits", "route_lookups", "route_hits", "evictions")
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "start", "mem")
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        if self.profiler.memory:
+            self.mem = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        p = self.profiler
+        p.seconds[self.name] += time.perf_counter() - self.start
+        p.calls[self.name] += 1
+        if p.memory:
+            peak = tracemalloc.get_traced_memory()[1] - self.mem
+            p.peak_bytes[self.name] = max(p.peak_bytes[self.name], peak)
+        return False
+
+
+class Profiler:
+    """
+    Opt-in per-phase instrumentation for genetic_algorithm(profiler=...).
+
+    seconds / calls: cumulative wall time and entries per phase (see PHASES). Without
+    batch_eval, individuals are scored on first use, which lands in "selection".
+    counts: evaluations requested / computed during the run, generations, and
+    chromosome allocations (new Individual objects; the arrays engine reuses its
+    buffers and allocates none after init).
+    With an eval_cache, counts also get its lookups, hits, route lookups, route hits
+    and evictions during the run as cache_* counts, plus its final entries and bytes;
+    as_row adds the resulting cache_hit_rate and cache_route_hit_rate.
+    memory: also track the peak bytes allocated inside each phase with tracemalloc,
+    which slows the run down noticeably; off by default.
+    """
+    def __init__(self, memory: bool = False):
+        self.memory = memory
+        self.seconds: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.calls: Dict[str, int] = dict.fromkeys(PHASES, 0)
+        self.peak_bytes: Dict[str, int] = dict.fromkeys(PHASES, 0)
+        self.counts: Dict[str, int] = {"evals_requested": 0, "evals_computed": 0,
+                                       "generations": 0, "allocations": 0}
+        self._phases = {name: _Phase(self, name) for name in PHASES}
+        self._evals = None
+        self._cache = None
+        self._cache_start = None
+
+    def phase(self, name: str) -> _Phase:
+        return self._phases[name]
+
+    def count(self, name: str, n: int = 1):
+        self.counts[name] += n
+
+    def start(self, eval_cache=None):
+        """Called by genetic_algorithm when the run begins, with the run's EvalCache if any."""
+        self._evals = (EVAL_COUNTS["requested"], EVAL_COUNTS["computed"])
+        if eval_cache is not None:
+            self._cache = eval_cache
+            self._cache_start = eval_cache.info()
+            for name in CACHE_COUNTS + ("entries", "bytes"):
+                self.counts.setdefault("cache_" + name, 0)
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _add_cache_counts(self, counts: Dict[str, int]):
+        """Adds the cache's counts since start() to counts and records its current size."""
+        info = self._cache.info()
+        for name in CACHE_COUNTS:
+            counts["cache_" + name] += info[name] - self._cache_start[name]
+        counts["cache_entries"] = info["entries"] + info["route_entries"]
+        counts["cache_bytes"] = info["bytes"]
+
+    def stop(self):
+        """Called by genetic_algorithm when the run ends (also on errors)."""
+        if self._evals is not None:
+            self.counts["evals_requested"] += EVAL_COUNTS["requested"] - self._evals[0]
+            self.counts["evals_computed"] += EVAL_COUNTS["computed"] - self._evals[1]
+            self._evals = None
+        if self._cache is not None:
+            self._add_cache_counts(self.counts)
+            self._cache = self._cache_start = None
+        if self.memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def total_seconds(self) -> float:
+        return sum(self.seconds.values())
+
+    def as_row(self, prefix: str = "") -> Dict[str, float]:
+        """Flat {column: value} view for a results table, e.g. time_selection, evals_computed."""
+        row = {f"{prefix}time_{name}": self.seconds[name] for name in PHASES}
+        row.update({f"{prefix}{name}": value for name, value in self.counts.items()})
+        if "cache_lookups" in self.counts:
+            c = self.counts
+            row[f"{prefix}cache_hit_rate"] = c["cache_hits"] / c["cache_lookups"] if c["cache_lookups"] else 0.0
+            row[f"{prefix}cache_route_hit_rate"] = (c["cache_route_hits"] / c["cache_route_lookups"]
+                                                    if c["cache_route_lookups"] else 0.0)
+        if self.memory:
+            row.update({f"{prefix}peak_bytes_{name}": self.peak_bytes[name] for name in PHASES})
+        return row
+
+    def get_state(self) -> Dict:
+        """JSON-able snapshot, so a checkpointed run keeps the profile of earlier sessions."""
+        counts = dict(self.counts)
+        if self._evals is not None:
+            counts["evals_requested"] += EVAL_COUNTS["requested"] - self._evals[0]
+            counts["evals_computed"] += EVAL_COUNTS["computed"] - self._evals[1]
+        if self._cache is not None:
+            self._add_cache_counts(counts)
+        return {"seconds": self.seconds, "calls": self.calls, "peak_bytes": self.peak_bytes,
+                "counts": counts}
+
+    def set_state(self, state: Dict):
+        for key in ("seconds", "calls", "peak_bytes", "counts"):
+            getattr(self, key).update(state[key])
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class NullProfiler:
+    """Stand-in used when profiling is off: every hook is a no-op."""
+    _PHASE = _NullPhase()
+
+    def phase(self, name: str) -> _NullPhase:
+        return self._PHASE
+
+    def count(self, name: str, n: int = 1):
+        pass
+
+    def start(self, eval_cache=None):
+        pass
+
+    def stop(self):
+        pass
+
+    def get_state(self) -> Optional[Dict]:
+        return None
+
+    def set_state(self, state: Dict):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,231 @@
+"""
+Constructive seeding of the initial population: instead of random shuffles, a share
+of the first generation comes from classic VRP heuristics converted into the
+perm + cuts encoding.
+
+    seeding = Seeding(dmat, coords=pts, fraction=0.2)
+    genetic_algorithm(..., seeding=seeding)
+
+"savings"  Clarke-Wright: merge routes tail -> head in order of the saving
+           d[i,0] + d[0,j] - d[i,j] until V routes are left.
+"sweep"    customers by angle around the depot from a random start ray and
+           direction, split optimally into V sectors, each one then visited in
+           nearest-neighbor order (needs coordinates).
+"nearest"  nearest-neighbor giant tour from the depot, split optimally into V routes.
+
+Every seed is randomized (perturbed savings, random sweep ray, random pick among the
+few nearest customers), so repeated seeds stay diverse. Savings and nearest neighbor
+only look at the k nearest neighbors of each customer (the LocalSearch lists), so
+building a seed stays cheap on large instances.
+"""
+import math
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from .chromosome import Individual, decode_routes
+from .local_search import neighbor_lists
+from .split import batch_split
+
+SEEDERS = ("savings", "sweep", "nearest")
+
+
+def routes_to_individual(routes: Sequence[Sequence[int]]) -> Individual:
+    """Giant-tour chromosome of the given routes (empty ones are dropped)."""
+    perm, cuts = [], []
+    for r in routes:
+        if len(r) == 0:
+            continue
+        if perm:
+            cuts.append(len(perm))
+        perm.extend(int(c) for c in r)
+    return Individual(perm, cuts)
+
+
+def _split_tour(perm: List[int], dmat, V: int, capacity=None) -> Individual:
+    """perm cut into exactly min(V, N) non-empty routes by the optimal (capacitated) Split."""
+    if V <= 1 or len(perm) <= 1:
+        return Individual(perm, [])
+    _, cuts = batch_split(np.asarray([perm]), dmat, min(V, len(perm)), use_all=True, capacity=capacity)
+    return Individual(perm, cuts[0].tolist())
+
+
+def savings_routes(dmat, N: int, V: int, neighbors: np.ndarray, gen: np.random.Generator,
+                   noise: float = 0.1, capacity=None) -> List[List[int]]:
+    """
+    Clarke-Wright savings over the arcs i -> j with j among i's neighbors, each saving
+    scaled by a random factor in [1, 1 + noise]. Merges only join a route's last
+    customer to another route's first one, so arc directions are kept (asymmetric dmat
+    is fine), and with a capacity only when the joined route fits. If the neighbor arcs
+    run out before V routes are left, the remaining routes are merged on the best
+    saving among all their end points, preferring merges that fit.
+    """
+    i = np.repeat(np.arange(1, N + 1), neighbors.shape[1])
+    j = neighbors[1:N + 1].ravel()
+    keep = (j != 0) & (j != i)
+    i, j = i[keep], j[keep]
+    saving = (np.asarray(dmat[i, 0], dtype=float) + np.asarray(dmat[0, j], dtype=float)
+              - np.asarray(dmat[i, j], dtype=float))
+    saving *= 1.0 + noise * gen.random(len(saving))
+    order = np.argsort(-saving, kind="stable")
+
+    nxt = [0] * (N + 1)
+    head_of = list(range(N + 1))  # head_of[t]: first customer of the route ending at t
+    tail_of = list(range(N + 1))  # tail_of[h]: last customer of the route starting at h
+    is_tail = [True] * (N + 1)
+    is_head = [True] * (N + 1)
+    n_routes = N
+    # load[h]: load of the route starting at h
+    load = capacity.demand.tolist() if capacity is not None else None
+    limit = capacity.limit if capacity is not None else np.inf
+
+    def merge(a, b):
+        h, t = head_of[a], tail_of[b]
+        nxt[a] = b
+        is_tail[a] = is_head[b] = False
+        tail_of[h], head_of[t] = t, h
+        if load is not None:
+            load[h] += load[b]
+
+    for a, b in zip(i[order].tolist(), j[order].tolist()):
+        if n_routes <= V:
+            break
+        if (is_tail[a] and is_head[b] and head_of[a] != b
+                and (load is None or load[head_of[a]] + load[b] <= limit)):
+            merge(a, b)
+            n_routes -= 1
+
+    while n_routes > V:
+        heads = [c for c in range(1, N + 1) if is_head[c]]
+        tails = [tail_of[h] for h in heads]
+        s = (np.asarray(dmat[np.asarray(tails)[:, None], 0], dtype=float)
+             + np.asarray(dmat[0, np.asarray(heads)[None, :]], dtype=float)
+             - np.asarray(dmat[np.asarray(tails)[:, None], np.asarray(heads)[None, :]], dtype=float))
+        np.fill_diagonal(s, -np.inf)
+        if load is not None:
+            fit = np.asarray([load[h] for h in heads])
+            fit = fit[:, None] + fit[None, :] <= limit
+            if (fit & np.isfinite(s)).any():
+                s = np.where(fit, s, -np.inf)
+        a, b = np.unravel_index(int(np.argmax(s)), s.shape)
+        merge(tails[a], heads[b])
+        n_routes -= 1
+
+    routes = []
+    for h in range(1, N + 1):
+        if is_head[h]:
+            route = [h]
+            while not is_tail[route[-1]]:
+                route.append(nxt[route[-1]])
+            routes.append(route)
+    return routes
+
+
+def sweep_perm(coords: np.ndarray, gen: np.random.Generator) -> List[int]:
+    """Customers 1..N by polar angle around coords[0], from a random ray and direction."""
+    delta = np.asarray(coords[1:], dtype=float) - np.asarray(coords[0], dtype=float)
+    angle = np.arctan2(delta[:, 1], delta[:, 0])
+    angle = (angle - gen.uniform(-math.pi, math.pi)) % (2 * math.pi)
+    if gen.random() < 0.5:
+        angle = -angle
+    return (np.argsort(angle, kind="stable") + 1).tolist()
+
+
+def _nearest_order(dmat, route: List[int]) -> List[int]:
+    """route's customers reordered greedily: nearest unvisited one next, from the depot."""
+    nodes = np.asarray([0] + route)
+    sub = np.array(dmat[nodes[:, None], nodes[None, :]], dtype=float)
+    sub[:, 0] = np.inf
+    order, cur = [], 0
+    for _ in range(len(route)):
+        cur = int(np.argmin(sub[cur]))
+        sub[:, cur] = np.inf
+        order.append(route[cur - 1])
+    return order
+
+
+def nearest_neighbor_perm(dmat, N: int, neighbors: Sequence[Sequence[int]], gen: np.random.Generator,
+                          candidates: int = 3) -> List[int]:
+    """
+    Nearest-neighbor tour from the depot, each step choosing at random among the
+    `candidates` nearest unvisited customers. Candidates come from the neighbor lists;
+    when all of those are visited, the whole row is scanned.
+    """
+    visited = np.zeros(N + 1, dtype=bool)
+    visited[0] = True
+    tour, cur = [], 0
+    for _ in range(N):
+        near = [c for c in neighbors[cur] if not visited[c]][:candidates]
+        if not near:
+            row = np.asarray(dmat[cur, np.arange(N + 1)], dtype=float)
+            row[visited] = np.inf
+            k = min(candidates, N - len(tour))
+            near = np.argpartition(row, k - 1)[:k]
+            near = near[np.argsort(row[near], kind="stable")].tolist()
+        cur = near[int(gen.integers(len(near)))]
+        visited[cur] = True
+        tour.append(cur)
+    return tour
+
+
+class Seeding:
+    """
+    Builds `fraction` of an initial population with constructive heuristics, taking
+    the methods in turn; the rest stays random.
+
+    methods: any of SEEDERS; None uses all of them, without "sweep" when no
+    coordinates are known.
+    coords: (N+1, 2) points with the depot in row 0. Defaults to dmat.coords for
+    distance providers that have them (utils.CoordinateDistances).
+    k: neighbor-list length for savings and nearest neighbor.
+    noise: maximum relative perturbation of the savings.
+    candidates: nearest unvisited customers the nearest-neighbor tour picks from.
+    capacity: optional ga.capacity.Capacity; savings merges and the splits of the
+    sweep and nearest-neighbor tours then keep routes within it where possible.
+    stats counts the seeds built per method.
+    """
+    def __init__(self, dmat, coords: Optional[np.ndarray] = None, methods: Optional[Sequence[str]] = None,
+                 fraction: float = 0.2, k: int = 20, noise: float = 0.1, candidates: int = 3,
+                 capacity=None):
+        if coords is None:
+            coords = getattr(dmat, "coords", None)
+        if methods is None:
+            methods = [m for m in SEEDERS if m != "sweep" or coords is not None]
+        unknown = set(methods) - set(SEEDERS)
+        if unknown:
+            raise ValueError(f"unknown seeding methods {sorted(unknown)}, expected some of {SEEDERS}")
+        if not methods:
+            raise ValueError("Seeding needs at least one method")
+        if "sweep" in methods and coords is None:
+            raise ValueError("sweep seeding needs coords (depot in row 0)")
+        if not 0 <= fraction <= 1:
+            raise ValueError(f"need 0 <= fraction <= 1, got {fraction}")
+        self.dmat = dmat
+        self.coords = None if coords is None else np.asarray(coords, dtype=float)
+        self.methods = tuple(methods)
+        self.fraction = fraction
+        self.noise = noise
+        self.candidates = max(1, candidates)
+        self.capacity = capacity
+        self.neighbors = neighbor_lists(dmat, k)
+        self._neighbor_rows: List[List[int]] = self.neighbors.tolist()
+        self.stats: Dict[str, int] = {m: 0 for m in SEEDERS}
+
+    def count(self, pop_size: int) -> int:
+        """Seeded members in a population of pop_size."""
+        return int(round(self.fraction * pop_size))
+
+    def individual(self, method: str, N: int, V: int, gen: np.random.Generator) -> Individual:
+        """One randomized seed from `method`; its cost is left to the caller's evaluation."""
+        self.stats[method] += 1
+        if method == "savings":
+            return routes_to_individual(savings_routes(self.dmat, N, V, self.neighbors, gen, self.noise,
+                                                       self.capacity))
+        if method == "sweep":
+            sectors = _split_tour(sweep_perm(self.coords, gen), self.dmat, V, self.capacity)
+            routes = decode_routes(sectors, V)
+            return routes_to_individual([_nearest_order(self.dmat, r) for r in routes])
+        return _split_tour(nearest_neighbor_perm(self.dmat, N, self._neighbor_rows, gen, self.candidates),
+                           self.dmat, V, self.capacity)
+
+    def individuals(self, n: int, N: int, V: int, gen: np.random.Generator) -> List[Individual]:
+        """n seeds, cycling through the methods."""
+        return [self.individual(self.methods[s % len(self.methods)], N, V, gen) for s in range(n)]
@@ -0,0 +1,78 @@
+"""
+Vectorized selection over a population's cost vector: every tournament of a
+generation is drawn at once as an index matrix and reduced with argmin, and elites /
+replacement slots come from np.argpartition instead of sorting the population.
+WorstHeap keeps the worst slot at hand for steady-state replacement.
+"""
+import heapq
+from typing import List, Tuple
+import numpy as np
+
+# redraws of the second parent when a tournament pair picked the same individual
+_DISTINCT_ATTEMPTS = 5
+
+
+def tournament(cost: np.ndarray, n: int, k_tourn: int, gen: np.random.Generator) -> np.ndarray:
+    """Winners of n independent size-k_tourn tournaments (with replacement) over cost."""
+    draws = gen.integers(len(cost), size=(n, max(1, k_tourn)))
+    return draws[np.arange(n), np.argmin(cost[draws], axis=1)]
+
+
+def select_parents(cost: np.ndarray, n_pairs: int, k_tourn: int, gen: np.random.Generator) -> np.ndarray:
+    """
+    (n_pairs, 2) parent indices from 2 * n_pairs tournaments. Pairs that drew the same
+    individual twice redraw their second parent, up to a few times, as a batch.
+    """
+    parents = tournament(cost, 2 * n_pairs, k_tourn, gen).reshape(n_pairs, 2)
+    for _ in range(_DISTINCT_ATTEMPTS):
+        same = np.flatnonzero(parents[:, 0] == parents[:, 1])
+        if len(same) == 0 or len(cost) < 2:
+            break
+        parents[same, 1] = tournament(cost, len(same), k_tourn, gen)
+    return parents
+
+
+def best_indices(cost: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k lowest costs, best first; O(P + k log k)."""
+    k = min(max(k, 0), len(cost))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    top = np.argpartition(cost, k - 1)[:k] if k < len(cost) else np.arange(len(cost))
+    return top[np.argsort(cost[top], kind="stable")]
+
+
+def worst_indices(cost: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest costs, worst first."""
+    return best_indices(-np.asarray(cost), k)
+
+
+class WorstHeap:
+    """
+    Max-heap of (cost, slot) over a cost vector that changes one slot at a time.
+    update() pushes the new entry and leaves the old one behind as stale; stale
+    entries are skipped when they surface, and the heap is rebuilt once they make up
+    half of it. worst() and update() are O(log P) amortized.
+    """
+    def __init__(self, cost: np.ndarray):
+        self.cost = cost
+        self.stamp = [0] * len(cost)
+        self._rebuild()
+
+    def _rebuild(self):
+        self.heap: List[Tuple[float, int, int]] = [(-c, i, self.stamp[i]) for i, c in enumerate(self.cost.tolist())]
+        heapq.heapify(self.heap)
+
+    def worst(self) -> int:
+        """Slot with the highest cost (ties: the lowest slot index)."""
+        heap, stamp = self.heap, self.stamp
+        while heap[0][2] != stamp[heap[0][1]]:
+            heapq.heappop(heap)
+        return heap[0][1]
+
+    def update(self, i: int, c: float):
+        """Sets cost[i] = c."""
+        self.cost[i] = c
+        self.stamp[i] += 1
+        heapq.heappush(self.heap, (-c, i, self.stamp[i]))
+        if len(self.heap) > 2 * len(self.cost):
+            self._rebuild()
@@ -0,0 +1,105 @@
+"""
+Zero-copy sharing of the distance matrix (and coordinates) with worker processes.
+
+    with SharedArrays({"dmat": dmat, "coords": pts}) as shared:
+        pool = ProcessPoolExecutor(initializer=init, initargs=(shared.handles["dmat"],))
+        ...
+    # in the worker
+    dmat = resolve(handle)     # read-only ndarray over the same pages, nothing copied
+
+The owner copies each array into multiprocessing.shared_memory once. Only the small
+handles are pickled to the workers, so the cost no longer grows with the matrix size
+times the worker count.
+"""
+import weakref
+from multiprocessing import shared_memory
+from typing import Dict, List, NamedTuple, Tuple
+import numpy as np
+
+
+class SharedArrayHandle(NamedTuple):
+    """Picklable reference to an array in shared memory."""
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+# per-process attachments: segment name -> [SharedMemory, reference count]
+_ATTACHED: Dict[str, List] = {}
+
+
+def attach(handle: SharedArrayHandle) -> np.ndarray:
+    """Read-only view of a shared array; attaching the same handle again reuses the mapping."""
+    entry = _ATTACHED.get(handle.name)
+    if entry is None:
+        entry = _ATTACHED[handle.name] = [shared_memory.SharedMemory(name=handle.name), 0]
+    entry[1] += 1
+    arr = np.ndarray(handle.shape, dtype=np.dtype(handle.dtype), buffer=entry[0].buf)
+    arr.flags.writeable = False
+    return arr
+
+
+def detach(handle: SharedArrayHandle):
+    """Drops one attach(); the mapping is closed with the last one (drop the views first)."""
+    entry = _ATTACHED.get(handle.name)
+    if entry is None:
+        return
+    entry[1] -= 1
+    if entry[1] <= 0:
+        del _ATTACHED[handle.name]
+        try:
+            entry[0].close()
+        except BufferError:
+            pass  # views still alive; the mapping goes away with them
+
+
+def resolve(obj):
+    """attach(obj) for a handle; anything else (ndarray, distance provider) is returned as is."""
+    return attach(obj) if isinstance(obj, SharedArrayHandle) else obj
+
+
+def _release(segments: List[shared_memory.SharedMemory]):
+    for shm in segments:
+        try:
+            shm.close()
+        except BufferError:
+            pass
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+    segments.clear()
+
+
+class SharedArrays:
+    """
+    Owns shared-memory copies of the given arrays. Use it as a context manager, or call
+    close(); segments are also unlinked when the object is collected or at exit.
+    handles maps each key to its SharedArrayHandle, arrays to a read-only local view.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self._segments: List[shared_memory.SharedMemory] = []
+        self._finalizer = weakref.finalize(self, _release, self._segments)
+        self.handles: Dict[str, SharedArrayHandle] = {}
+        self.arrays: Dict[str, np.ndarray] = {}
+        for key, arr in arrays.items():
+            arr = np.ascontiguousarray(arr)
+            shm = shared_memory.SharedMemory(create=True, size=max(1, arr.nbytes))
+            self._segments.append(shm)
+            view = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+            view[...] = arr
+            view.flags.writeable = False
+            self.handles[key] = SharedArrayHandle(shm.name, arr.shape, arr.dtype.str)
+            self.arrays[key] = view
+
+    def close(self):
+        """Unlinks every segment. Workers keep their mappings until they detach or exit."""
+        self.arrays = {}
+        self._finalizer()
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,159 @@
+from typing import List, Tuple
+import numpy as np
+from .fitness import batch_total_distance
+
+
+def batch_split(perms: np.ndarray, dmat, V: int, use_all: bool = False,
+                capacity=None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Optimal Split of every giant tour in perms (P, N) into at most V routes (exactly V
+    non-empty routes with use_all), ignoring any evolved cuts.
+
+    Bellman DP over route counts: with route cost(i, j) = d[0, p_i] + legs p_i..p_{j-1}
+    + d[p_{j-1}, 0] written through prefix sums of the tour legs, the best predecessor
+    of every j is a running minimum, so each of the V layers is a few O(P*N) array ops.
+
+    Returns (costs (P,), cuts (P, V-1)). Routes left unused are encoded as trailing
+    cuts equal to N (empty routes); costs are recomputed with batch_total_distance
+    so they match total_distance on the returned cuts exactly.
+
+    Without capacities and with a metric dmat, splitting a tour never shortens it, so
+    the unconstrained optimum is usually a single route; use_all keeps every vehicle busy.
+
+    capacity: optional ga.capacity.Capacity. Only routes within the capacity are
+    considered (see _capacity_cuts); tours that do not fit into V routes keep their
+    unconstrained split. Costs then include the capacity penalty.
+    """
+    perms = np.asarray(perms)
+    P, N = perms.shape
+    if capacity is not None:
+        cuts = _capacity_cuts(perms, dmat, V, use_all, capacity)
+        return capacity.batch_penalize(batch_total_distance(perms, cuts, dmat), perms, cuts), cuts
+    cuts = np.full((P, max(V-1, 0)), N, dtype=np.intp)
+    if V <= 1 or N == 0:
+        return batch_total_distance(perms, cuts, dmat), cuts
+
+    from_depot = np.asarray(dmat[0, perms], dtype=float)
+    to_depot = np.asarray(dmat[perms, 0], dtype=float)
+    prefix = np.zeros((P, N))
+    prefix[:, 1:] = np.cumsum(dmat[perms[:, :-1], perms[:, 1:]], axis=1)
+    idx = np.arange(N)
+    close = prefix + to_depot  # cost to finish a route at position j-1, minus its start terms
+
+    best = np.full((P, N+1), np.inf)  # best[:, j]: first j customers in k routes
+    best[:, 0] = 0.0
+    preds = []  # preds[k-1][:, j-1]: start of the k-th route when it ends at j
+    finals = []
+    for k in range(1, min(V, N) + 1):
+        open_cost = best[:, :N] + from_depot - prefix
+        running = np.minimum.accumulate(open_cost, axis=1)
+        pred = np.maximum.accumulate(np.where(open_cost == running, idx, -1), axis=1)
+        best = np.empty((P, N+1))
+        best[:, 0] = np.inf
+        best[:, 1:] = running + close
+        preds.append(pred)
+        finals.append(best[:, N])
+
+    finals = np.stack(finals, axis=1)
+    n_routes = np.full(P, finals.shape[1]) if use_all else np.argmin(finals, axis=1) + 1
+    _backtrack(preds, n_routes, cuts)
+    return batch_total_distance(perms, cuts, dmat), cuts
+
+
+def _backtrack(preds: List[np.ndarray], n_routes: np.ndarray, cuts: np.ndarray):
+    """Fills cuts (P, V-1), preset to N, with the route starts of n_routes routes per row."""
+    P = len(n_routes)
+    rows = np.arange(P)
+    end = np.full(P, preds[0].shape[1])
+    for k in range(len(preds), 0, -1):
+        active = n_routes >= k
+        start = preds[k-1][rows, np.maximum(end - 1, 0)]
+        if k >= 2:
+            cuts[active, k-2] = start[active]
+        end = np.where(active, start, end)
+
+
+def _range_argmin(vals: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """
+    For every (r, j): the index of the smallest vals[r, lo[r, j]:hi[r, j] + 1] (lo <= hi),
+    from a sparse table of argmins over power-of-two windows, O(P*N log N).
+    """
+    P, N = vals.shape
+    rows = np.arange(P)[:, None]
+    tables = [np.broadcast_to(np.arange(N), (P, N))]
+    span = 1
+    while 2 * span <= N:
+        prev = tables[-1]
+        a, b = prev[:, :prev.shape[1] - span], prev[:, span:]
+        tables.append(np.where(vals[rows, a] <= vals[rows, b], a, b))
+        span *= 2
+    level = np.floor(np.log2(hi - lo + 1)).astype(np.intp)
+    out = np.empty((P, lo.shape[1]), dtype=np.intp)
+    r = np.broadcast_to(rows, lo.shape)
+    for lev, table in enumerate(tables):
+        sel = level == lev
+        if not sel.any():
+            continue
+        a = table[r[sel], lo[sel]]
+        b = table[r[sel], hi[sel] - (1 << lev) + 1]
+        out[sel] = np.where(vals[r[sel], a] <= vals[r[sel], b], a, b)
+    return out
+
+
+def _capacity_cuts(perms: np.ndarray, dmat, V: int, use_all: bool, capacity) -> np.ndarray:
+    """
+    Cuts of the optimal Split that keeps every route within capacity. The same DP as
+    batch_split, but a route ending at j may only start from lo[j] on, the first
+    position whose prefix load leaves room for the rest (found by searchsorted, as
+    loads only grow along the tour), so each layer takes a range minimum instead of a
+    running one.
+    """
+    P, N = perms.shape
+    cuts = np.full((P, max(V-1, 0)), N, dtype=np.intp)
+    if V <= 1 or N == 0:
+        return cuts
+
+    load = np.zeros((P, N+1))
+    np.cumsum(capacity.demand[perms], axis=1, out=load[:, 1:])
+    lo = np.empty((P, N), dtype=np.intp)
+    for r in range(P):
+        lo[r] = np.searchsorted(load[r], load[r, 1:] - capacity.limit, side="left")
+    hi = np.broadcast_to(np.arange(N), (P, N))
+    fits = lo <= hi  # False where a single customer exceeds the capacity
+    lo = np.minimum(lo, hi)
+
+    from_depot = np.asarray(dmat[0, perms], dtype=float)
+    to_depot = np.asarray(dmat[perms, 0], dtype=float)
+    prefix = np.zeros((P, N))
+    prefix[:, 1:] = np.cumsum(dmat[perms[:, :-1], perms[:, 1:]], axis=1)
+    close = prefix + to_depot
+
+    rows = np.arange(P)[:, None]
+    best = np.full((P, N+1), np.inf)
+    best[:, 0] = 0.0
+    preds, finals = [], []
+    for k in range(1, min(V, N) + 1):
+        open_cost = best[:, :N] + from_depot - prefix
+        pred = _range_argmin(open_cost, lo, hi)
+        best = np.empty((P, N+1))
+        best[:, 0] = np.inf
+        best[:, 1:] = np.where(fits, open_cost[rows, pred] + close, np.inf)
+        preds.append(pred)
+        finals.append(best[:, N])
+
+    finals = np.stack(finals, axis=1)
+    n_routes = np.full(P, finals.shape[1]) if use_all else np.argmin(finals, axis=1) + 1
+    _backtrack(preds, n_routes, cuts)
+    bad = ~np.isfinite(finals[np.arange(P), n_routes - 1])
+    if bad.any():
+        cuts[bad] = batch_split(perms[bad], dmat, V, use_all)[1]
+    return cuts
+
+
+def split_routes(perm: List[int], dmat, V: int, use_all: bool = False,
+                 capacity=None) -> Tuple[float, List[List[int]]]:
+    """Optimal Split of one giant tour: (cost, routes), with empty routes dropped."""
+    costs, cuts = batch_split(np.asarray([perm]), dmat, V, use_all, capacity)
+    bounds = [0] + cuts[0].tolist() + [len(perm)]
+    routes = [list(perm[a:b]) for a, b in zip(bounds, bounds[1:]) if b > a]
+    return float(costs[0]), routes
@@ -0,0 +1,107 @@
+import time
+from typing import Optional
+import numpy as np
+from .chromosome import Individual
+from .fitness import EVAL_COUNTS
+
+STOP_REASONS = ("generations", "time_limit", "max_evals", "stagnation", "target_cost")
+
+# improvements smaller than this do not reset the stagnation counter
+_EPS = 1e-9
+
+
+class StoppingCriteria:
+    """
+    Decides after every generation whether a run should stop, and keeps a copy of
+    the best individual seen so far so it can be returned whenever that happens.
+
+    time_limit: wall-clock seconds. A generation is not started if the slowest one so
+    far would overrun the budget, so the run ends within it (initialization and the
+    first generation always run).
+    max_evals: full evaluations (EVAL_COUNTS["computed"]) spent in this run.
+    patience: generations without an improvement of the best cost.
+    target_cost: stop as soon as the best cost is at or below this value.
+    """
+    def __init__(self, generations: int, time_limit: Optional[float] = None,
+                 max_evals: Optional[int] = None, patience: Optional[int] = None,
+                 target_cost: Optional[float] = None):
+        self.generations = generations
+        self.time_limit = time_limit
+        self.max_evals = max_evals
+        self.patience = patience
+        self.target_cost = target_cost
+        self.start_time = time.perf_counter()
+        self.start_evals = EVAL_COUNTS["computed"]
+        self.last_time = self.start_time
+        self.slowest = 0.0
+        self.best: Optional[Individual] = None
+        self.best_cost = float("inf")
+        self.stale = 0
+        self.gens_done = 0
+        self.reason: Optional[str] = "generations" if generations <= 0 else None
+
+    def seconds(self) -> float:
+        return time.perf_counter() - self.start_time
+
+    def evaluations(self) -> int:
+        return EVAL_COUNTS["computed"] - self.start_evals
+
+    def offer(self, ind: Individual) -> bool:
+        """
+        Keeps a detached copy of ind if it beats the best so far (its cost must be
+        known). Returns whether that counts as an improvement for patience.
+        """
+        if ind.cost >= self.best_cost:
+            return False
+        improved = self.best_cost - ind.cost > _EPS
+        self.best_cost = ind.cost
+        self.best = Individual(np.asarray(ind.perm).tolist(), np.asarray(ind.cuts).tolist(), ind.cost)
+        return improved
+
+    def update(self, best: Individual) -> Optional[str]:
+        """
+        Records one finished generation whose best member is `best`. Returns the name
+        of the criterion that ends the run (also kept in self.reason), or None.
+        """
+        self.stale = 0 if self.offer(best) else self.stale + 1
+        self.gens_done += 1
+        now = time.perf_counter()
+        self.slowest = max(self.slowest, now - self.last_time)
+        self.last_time = now
+
+        if self.target_cost is not None and self.best_cost <= self.target_cost:
+            self.reason = "target_cost"
+        elif self.gens_done >= self.generations:
+            self.reason = "generations"
+        elif self.time_limit is not None and now - self.start_time + self.slowest > self.time_limit:
+            self.reason = "time_limit"
+        elif self.max_evals is not None and self.evaluations() >= self.max_evals:
+            self.reason = "max_evals"
+        elif self.patience is not None and self.stale >= self.patience:
+            self.reason = "stagnation"
+        return self.reason
+
+    def get_state(self) -> dict:
+        """JSON-able counters for a checkpoint (the best individual is stored separately)."""
+        return {"best_cost": self.best_cost, "stale": self.stale, "gens_done": self.gens_done,
+                "slowest": self.slowest, "seconds": self.seconds(),
+                "evaluations": self.evaluations(), "reason": self.reason}
+
+    def set_state(self, state: dict, best: Optional[tuple] = None):
+        """Restores get_state() output; seconds and evaluations keep counting from there."""
+        now = time.perf_counter()
+        self.start_time = now - state["seconds"]
+        self.last_time = now
+        self.start_evals = EVAL_COUNTS["computed"] - state["evaluations"]
+        self.slowest = state["slowest"]
+        self.best_cost = state["best_cost"]
+        self.best = Individual(best[0], best[1], self.best_cost) if best is not None else None
+        self.stale = state["stale"]
+        self.gens_done = state["gens_done"]
+        self.reason = state["reason"]
+
+    def info(self) -> dict:
+        """Summary of the run: stop_reason, generations, evaluations, seconds, best_cost."""
+        return {"stop_reason": self.reason, "generations": self.gens_done,
+                "evaluations": self.evaluations(), "seconds": self.seconds(),
+                "best_cost": self.best_cost}
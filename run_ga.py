@@ -1,20 +1,22 @@
-import os, shutil, time, math
+import os, shutil, hashlib, json
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+from ga.capacity import Capacity
+from ga.checkpoint import array_digest, code_digest, matrix_digest
+from ga.eval_cache import EvalCache
 from ga.ga_solver import genetic_algorithm
-from utils import customers_to_ordered_list, distance_matrix
+from ga.profiling import Profiler
+from ga.shared import SharedArrays, resolve
+from utils import customers_to_ordered_list, distance_matrix_file, open_matrix
 from plots_tables import plot_routes_matplotlib, plot_convergence_histories, plot_instance_metric
 from data.small_instances import SMALL_INSTANCE_1, SMALL_INSTANCE_2
 from data.medium_instances import MEDIUM_INSTANCE_1, MEDIUM_INSTANCE_2
 from data.large_instances import LARGE_INSTANCE_1, LARGE_INSTANCE_2
-
-# ---------------- prepare results folder ----------------
-RESULTS_DIR = "results"
-if os.path.exists(RESULTS_DIR):
-    shutil.rmtree(RESULTS_DIR)
-os.makedirs(RESULTS_DIR, exist_ok=True)
+from data.roads import road_distance_matrix
+from data.vrplib import read_vrp
 
 # ---------------- experiment config ----------------
 param_sets = {
@@ -23,216 +25,349 @@ param_sets = {
     "compact": {"pop_size":30, "generations":200, "k_tourn":5, "pc":0.7, "pm_perm":0.008, "pm_cuts":0.3}
 }
 N_RUNS = 15
+# worker processes for the run grid; VRP_GA_WORKERS=1 runs everything in this process
+N_WORKERS = int(os.environ.get("VRP_GA_WORKERS", 0)) or os.cpu_count() or 1
+# opt-in per-run checkpoints (VRP_GA_CHECKPOINTS=checkpoints) survive across invocations,
+# unlike results/; finished runs are reloaded instead of recomputed and interrupted ones
+# resume where they stopped
+CHECKPOINT_DIR = os.environ.get("VRP_GA_CHECKPOINTS") or None
+CHECKPOINT_EVERY = 25
+# per-phase timers and counters (ga.profiling), averaged over runs into results_summary.csv
+PROFILE = True
+# EvalCache settings for every run, e.g. dict(max_entries=50_000, routes=True); its hit
+# rates then appear among the Prof_cache_* columns. None runs without a cache
+EVAL_CACHE = None
 INSTANCES = [
     ("Small-1", SMALL_INSTANCE_1), ("Small-2", SMALL_INSTANCE_2),
     ("Medium-1", MEDIUM_INSTANCE_1), ("Medium-2", MEDIUM_INSTANCE_2),
     ("Large-1", LARGE_INSTANCE_1), ("Large-2", LARGE_INSTANCE_2),
 ]
+# extra CVRPLIB/TSPLIB .vrp files to run, separated by os.pathsep (data/vrplib.py)
+VRP_FILES = [p for p in os.environ.get("VRP_GA_VRP_FILES", "").split(os.pathsep) if p]
+# "<edges file><os.pathsep><nodes file>": drive over this road graph (data/roads.py)
+# instead of straight lines; its coordinates must share the instances' plane
+ROAD_NETWORK = [p for p in os.environ.get("VRP_GA_ROADS", "").split(os.pathsep) if p]
+
+# ---------------- parallel run grid ----------------
+# Every (instance, param set, seed) run is independent and fully determined by its
+# seed (genetic_algorithm owns its random.Random(seed)), so running them in a pool
+# gives bit-for-bit the same results as running them one after another.
+_WORKER_DMATS = {}
+_WORKER_CAPACITIES = {}
+
+def _init_worker(dmats, capacities):
+    # cached matrices arrive as .npy paths and are memory-mapped, in-memory ones as
+    # shared-memory handles, so all workers share one copy instead of each unpickling its own
+    _WORKER_DMATS.update({name: open_matrix(d) if isinstance(d, str) else resolve(d) for name, d in dmats.items()})
+    _WORKER_CAPACITIES.update(capacities)
+
+def _checkpoint_path(inst_name, set_name, params, data_key, seed):
+    # keyed by the parameter values, the instance data and the GA code too, so editing a
+    # param set, an instance or the GA starts its runs afresh instead of reloading stale ones
+    key = dict(params=params, data=data_key, code=code_digest())
+    tag = hashlib.sha1(json.dumps(key, sort_keys=True).encode()).hexdigest()[:12]
+    return os.path.join(CHECKPOINT_DIR, f"{inst_name}_{set_name}_{tag}_seed{seed}.npz")
+
+def _run_one(inst_name, set_name, N, V, params, data_key, seed):
+    profiler = Profiler() if PROFILE else None
+    # genetic_algorithm expects dmat and N
+    best_ind, best_dist, best_hist, info = genetic_algorithm(
+        dmat=_WORKER_DMATS[inst_name],
+        N=N,
+        V=V,
+        pop_size=params["pop_size"],
+        generations=params["generations"],
+        k_tourn=params["k_tourn"],
+        pc=params["pc"],
+        pm_perm=params["pm_perm"],
+        pm_cuts=params["pm_cuts"],
+        seed=seed,
+        log_convergence=True,
+        return_info=True,
+        checkpoint_path=_checkpoint_path(inst_name, set_name, params, data_key, seed) if CHECKPOINT_DIR else None,
+        checkpoint_every=CHECKPOINT_EVERY,
+        profiler=profiler,
+        eval_cache=EvalCache(**EVAL_CACHE) if EVAL_CACHE else None,
+        capacity=_WORKER_CAPACITIES.get(inst_name)
+    )
+    # run time accumulated over all sessions, so reloaded runs keep their original timing
+    elapsed = info["seconds"]
+    profile = profiler.as_row(prefix="Prof_") if profiler is not None else {}
+    return (best_ind, best_dist, best_hist, elapsed, profile, info.get("load_excess", 0.0),
+            info.get("resumed_gens"))
+
+class _SerialResult:
+    """Stand-in for a Future when N_WORKERS == 1."""
+    def __init__(self, fn, *args):
+        self.fn, self.args = fn, args
+
+    def result(self):
+        return self.fn(*self.args)
+
+
+def main():
+    # ---------------- prepare results folder ----------------
+    RESULTS_DIR = "results"
+    if os.path.exists(RESULTS_DIR):
+        shutil.rmtree(RESULTS_DIR)
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+
+    instances = INSTANCES + [(inst["NAME"], inst) for inst in map(read_vrp, VRP_FILES)]
+
+    # ---------------- safety check: vehicles <= customers ----------------
+    for name, inst in instances:
+        n_customers = len(inst["CUSTOMERS"])
+        v = inst["VEHICLES"]
+        if v > n_customers:
+            raise ValueError(f"Instance {name}: VEHICLES ({v}) > number of customers ({n_customers}). Fix data.")
+
+    # ---------------- run experiments ----------------
+    prepared = []
+    capacities = {}
+    data_keys = {}
+    for inst_id, (inst_name, inst) in enumerate(instances, start=1):
+        depot = inst["DEPOT"]
+        cust_keys, customers_list = customers_to_ordered_list(inst["CUSTOMERS"])
+        N = len(customers_list)
+        V = inst["VEHICLES"]
+        # numpy (N+1)x(N+1), 0 = depot, 1..N customers; .vrp files bring their own (TSPLIB rounding).
+        # Passed on as the path of the cached .npy where there is one (utils.distance_matrix_file)
+        if "DMAT" in inst:
+            dmat = inst.get("DMAT_FILE") or inst["DMAT"]
+        elif ROAD_NETWORK:
+            dmat = road_distance_matrix(depot, customers_list, *ROAD_NETWORK)
+        else:
+            dmat = distance_matrix_file(depot, customers_list)
+        prepared.append((inst_id, inst_name, depot, customers_list, N, V, dmat))
+        # instances with "CAPACITY" and "DEMANDS" run as CVRP (ga/capacity.py)
+        matrix = open_matrix(dmat) if isinstance(dmat, str) else dmat
+        capacity = Capacity.from_instance(inst, cust_keys, dmat=matrix)
+        if capacity is not None:
+            capacities[inst_name] = capacity
+        if CHECKPOINT_DIR:
+            data_keys[inst_name] = [matrix_digest(matrix), None if capacity is None else
+                                    [capacity.capacity, array_digest(capacity.demand)]]
+
+    dmats = {inst_name: dmat for _, inst_name, _, _, _, _, dmat in prepared}
+    shared = None
+    if N_WORKERS > 1:
+        shared = SharedArrays({name: d for name, d in dmats.items() if isinstance(d, np.ndarray)})
+        dmats.update(shared.handles)
+    # released in finally, so a failing run or Ctrl-C does not leave the pool or the
+    # shared-memory segments to the interpreter's exit handlers
+    pool = None
+    try:
+        pool = ProcessPoolExecutor(max_workers=N_WORKERS, initializer=_init_worker, initargs=(dmats, capacities)) if N_WORKERS > 1 else None
+        if pool is None:
+            _init_worker(dmats, capacities)
+        print(f"Running {len(instances) * len(param_sets) * N_RUNS} GA runs on {N_WORKERS} worker(s)")
+        if CHECKPOINT_DIR:
+            print(f"Checkpointing runs to {CHECKPOINT_DIR}/")
+
+        # submit the whole grid up front; each instance/param set is aggregated once all its runs are in
+        futures = {}
+        for inst_id, inst_name, depot, customers_list, N, V, dmat in prepared:
+            for set_name, params in param_sets.items():
+                for seed in range(N_RUNS):
+                    args = (inst_name, set_name, N, V, params, data_keys.get(inst_name), seed)
+                    futures[inst_name, set_name, seed] = pool.submit(_run_one, *args) if pool else _SerialResult(_run_one, *args)
+
+        results = []
+        for inst_id, inst_name, depot, customers_list, N, V, dmat in prepared:
+            print(f"\n=== Instance {inst_name}: N={N}, V={V} ===")
+
+            for set_name, params in param_sets.items():
+                print(f"  ParamSet: {set_name} -> {params}")
+                dists = []
+                times = []
+                histories_all = []
+                best_inds = []
+                profiles = []
+                excesses = []
+
+                for seed in range(N_RUNS):
+                    best_ind, best_dist, best_hist, elapsed, profile, excess, resumed = futures[inst_name, set_name, seed].result()
+
+                    dists.append(float(best_dist))
+                    times.append(float(elapsed))
+                    histories_all.append(best_hist)
+                    best_inds.append(best_ind)
+                    profiles.append(profile)
+                    excesses.append(float(excess))
+
+                    reused = ""
+                    if resumed:
+                        reused = (" (reloaded from checkpoint)" if resumed >= len(best_hist)
+                                  else f" (resumed from checkpoint at generation {resumed})")
+                    print(f"    run {seed+1}/{N_RUNS} done: best_dist={best_dist:.2f}, time={elapsed:.2f}s{reused}")
 
-# ---------------- safety check: vehicles <= customers ----------------
-for name, inst in INSTANCES:
-    n_customers = len(inst["CUSTOMERS"])
-    v = inst["VEHICLES"]
-    if v > n_customers:
-        raise ValueError(f"Instance {name}: VEHICLES ({v}) > number of customers ({n_customers}). Fix data.")
-
-# ---------------- run experiments ----------------
-results = []
-for inst_id, (inst_name, inst) in enumerate(INSTANCES, start=1):
-    depot = inst["DEPOT"]
-    cust_keys, customers_list = customers_to_ordered_list(inst["CUSTOMERS"])
-    N = len(customers_list)
-    V = inst["VEHICLES"]
-    dmat = distance_matrix(depot, customers_list)  # numpy (N+1)x(N+1), 0 = depot, 1..N customers
-
-    print(f"\n=== Instance {inst_name}: N={N}, V={V} ===")
-
-    for set_name, params in param_sets.items():
-        print(f"  ParamSet: {set_name} -> {params}")
-        dists = []
-        times = []
-        histories_all = []
-        best_inds = []
-
-        for seed in range(N_RUNS):
-            start_time = time.time()
-            # genetic_algorithm expects dmat and N
-            best_ind, best_dist, best_hist = genetic_algorithm(
-                dmat=dmat,
-                N=N,
-                V=V,
-                pop_size=params["pop_size"],
-                generations=params["generations"],
-                k_tourn=params["k_tourn"],
-                pc=params["pc"],
-                pm_perm=params["pm_perm"],
-                pm_cuts=params["pm_cuts"],
-                seed=seed,
-                log_convergence=True
-            )
-            elapsed = time.time() - start_time
-
-            dists.append(float(best_dist))
-            times.append(float(elapsed))
-            histories_all.append(best_hist)
-            best_inds.append(best_ind)
-
-            print(f"    run {seed+1}/{N_RUNS} done: best_dist={best_dist:.2f}, time={elapsed:.2f}s")
-
-        # store aggregated result row
-        results.append({
-            "InstanceID": inst_id,
-            "Instance": inst_name,
-            "ParamSet": set_name,
-            "BestDist": float(np.min(dists)),
-            "MeanDist": float(np.mean(dists)),
-            "WorstDist": float(np.max(dists)),
-            "StdDist": float(np.std(dists)),
-            "BestRuntime": float(np.min(times)),
-            "MeanRuntime": float(np.mean(times)),
-            "WorstRuntime": float(np.max(times)),
-            "RuntimeStd": float(np.std(times)),
-            "Histories": histories_all,
-            "BestInds": best_inds,
-            "Vehicles": V,
-            "Customers": N
+                # store aggregated result row
+                results.append({
+                    "InstanceID": inst_id,
+                    "Instance": inst_name,
+                    "ParamSet": set_name,
+                    "BestDist": float(np.min(dists)),
+                    "MeanDist": float(np.mean(dists)),
+                    "WorstDist": float(np.max(dists)),
+                    "StdDist": float(np.std(dists)),
+                    "BestRuntime": float(np.min(times)),
+                    "MeanRuntime": float(np.mean(times)),
+                    "WorstRuntime": float(np.max(times)),
+                    "RuntimeStd": float(np.std(times)),
+                    "Histories": histories_all,
+                    "BestInds": best_inds,
+                    "Vehicles": V,
+                    "Customers": N,
+                    # load over capacity of the best solutions (0 for feasible or uncapacitated runs)
+                    "MeanLoadExcess": float(np.mean(excesses)),
+                    # mean per-run profile: seconds per phase, evaluation and allocation counts
+                    **{key: float(np.mean([p[key] for p in profiles])) for key in profiles[0]}
+                })
+
+                # plots: take the run with the best distance
+                best_run_idx = int(np.argmin(dists))
+                out_route = os.path.join(RESULTS_DIR, f"{inst_name}_{set_name}_best_route.png")
+                out_conv = os.path.join(RESULTS_DIR, f"{inst_name}_{set_name}_convergence.png")
+
+                plot_routes_matplotlib(best_inds[best_run_idx], customers_list, depot, V,
+                                       title=f"{inst_name} Best Route ({set_name}) — {np.min(dists):.1f}",
+                                       filename=out_route)
+
+                plot_convergence_histories(histories_all, title=f"{inst_name} Convergence ({set_name})", filename=out_conv)
+                print(f"    saved plots: {out_route}, {out_conv}")
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if shared is not None:
+            shared.close()
+
+    # ---------------- save results to CSV ----------------
+    df = pd.DataFrame(results)
+    # Save full results including histories (Histories column contains list-of-lists)
+    df.to_pickle(os.path.join(RESULTS_DIR, "results_full.pkl"))  # quick reload later
+    # For CSVable summary, drop the heavy lists
+    df_csv = df.drop(columns=["Histories", "BestInds"])
+    df_csv.to_csv(os.path.join(RESULTS_DIR, "results_summary.csv"), index=False)
+    print(f"\nSaved results_summary.csv and results_full.pkl in {RESULTS_DIR}/")
+
+    # ---------------- build solution quality----------------
+    tbl_quality = df.pivot_table(index="Instance", columns="ParamSet", values=["BestDist", "MeanDist", "WorstDist"])
+    tbl_quality.to_csv(os.path.join(RESULTS_DIR, "solution_quality.csv"))
+    print("\n=== Solution quality table saved ===")
+
+    # ---------------- performance plots ----------------
+    # Mean runtime per instance for each paramset
+    plot_instance_metric(df.sort_values("Instance"), metric="MeanRuntime", filename=os.path.join(RESULTS_DIR,"mean_runtime_per_instance.png"),
+                         title="Mean Runtime per Instance (by ParamSet)")
+
+    # mean vs best distance plot
+    plt_x = np.arange(len(df))
+    plt.figure(figsize=(10,4))
+    plt.plot(plt_x, df["MeanDist"], label="MeanDist", marker='o')
+    plt.plot(plt_x, df["BestDist"], label="BestDist", marker='x')
+    plt.xticks(plt_x, df["Instance"] + " — " + df["ParamSet"], rotation=45, ha="right")
+    plt.ylabel("Distance")
+    plt.title("Mean vs Best Distance")
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(os.path.join(RESULTS_DIR, "mean_vs_best_distance.png"))
+    plt.close()
+
+    # ---------------- convergence rate (gens to within EPS) ----------------
+    EPS = 0.05
+    def gens_to_within_eps(hist, eps=EPS):
+        final = hist[-1]
+        thresh = final * (1 + eps)
+        for g, v in enumerate(hist):
+            if v <= thresh:
+                return g
+        return len(hist)-1
+
+    rows = []
+    for _, row in df.iterrows():
+        histories = row["Histories"]
+        gens_list = [gens_to_within_eps(h) for h in histories]
+        rows.append({
+            "Instance": row["Instance"],
+            "ParamSet": row["ParamSet"],
+            "Best": int(np.min(gens_list)),
+            "Avg": float(np.mean(gens_list)),
+            "Worst": int(np.max(gens_list))
         })
+    df_conv = pd.DataFrame(rows)
+    df_conv.to_csv(os.path.join(RESULTS_DIR, "convergence_rate.csv"), index=False)
+
+    # Set style for better-looking plots
+    plt.style.use('seaborn-v0_8-darkgrid')
+    sns.set_palette("husl")
 
-        # plots: take the run with the best distance
-        best_run_idx = int(np.argmin(dists))
-        out_route = os.path.join(RESULTS_DIR, f"{inst_name}_{set_name}_best_route.png")
-        out_conv = os.path.join(RESULTS_DIR, f"{inst_name}_{set_name}_convergence.png")
-
-        plot_routes_matplotlib(best_inds[best_run_idx], customers_list, depot, V,
-                               title=f"{inst_name} Best Route ({set_name}) — {np.min(dists):.1f}",
-                               filename=out_route)
-
-        plot_convergence_histories(histories_all, title=f"{inst_name} Convergence ({set_name})", filename=out_conv)
-        print(f"    saved plots: {out_route}, {out_conv}")
-
-# ---------------- save results to CSV ----------------
-df = pd.DataFrame(results)
-# Save full results including histories (Histories column contains list-of-lists)
-df.to_pickle(os.path.join(RESULTS_DIR, "results_full.pkl"))  # quick reload later
-# For CSVable summary, drop the heavy lists
-df_csv = df.drop(columns=["Histories", "BestInds"])
-df_csv.to_csv(os.path.join(RESULTS_DIR, "results_summary.csv"), index=False)
-print(f"\nSaved results_summary.csv and results_full.pkl in {RESULTS_DIR}/")
-
-# ---------------- build solution quality----------------
-tbl_quality = df.pivot_table(index="Instance", columns="ParamSet", values=["BestDist", "MeanDist", "WorstDist"])
-tbl_quality.to_csv(os.path.join(RESULTS_DIR, "solution_quality.csv"))
-print("\n=== Solution quality table saved ===")
-
-# ---------------- performance plots ----------------
-# Mean runtime per instance for each paramset
-plot_instance_metric(df.sort_values("Instance"), metric="MeanRuntime", filename=os.path.join(RESULTS_DIR,"mean_runtime_per_instance.png"),
-                     title="Mean Runtime per Instance (by ParamSet)")
-
-# mean vs best distance plot
-plt_x = np.arange(len(df))
-plt.figure(figsize=(10,4))
-plt.plot(plt_x, df["MeanDist"], label="MeanDist", marker='o')
-plt.plot(plt_x, df["BestDist"], label="BestDist", marker='x')
-plt.xticks(plt_x, df["Instance"] + " — " + df["ParamSet"], rotation=45, ha="right")
-plt.ylabel("Distance")
-plt.title("Mean vs Best Distance")
-plt.legend()
-plt.tight_layout()
-plt.savefig(os.path.join(RESULTS_DIR, "mean_vs_best_distance.png"))
-plt.close()
-
-# ---------------- convergence rate (gens to within EPS) ----------------
-EPS = 0.05
-def gens_to_within_eps(hist, eps=EPS):
-    final = hist[-1]
-    thresh = final * (1 + eps)
-    for g, v in enumerate(hist):
-        if v <= thresh:
-            return g
-    return len(hist)-1
-
-rows = []
-for _, row in df.iterrows():
-    histories = row["Histories"]
-    gens_list = [gens_to_within_eps(h) for h in histories]
-    rows.append({
-        "Instance": row["Instance"],
-        "ParamSet": row["ParamSet"],
-        "Best": int(np.min(gens_list)),
-        "Avg": float(np.mean(gens_list)),
-        "Worst": int(np.max(gens_list))
-    })
-df_conv = pd.DataFrame(rows)
-df_conv.to_csv(os.path.join(RESULTS_DIR, "convergence_rate.csv"), index=False)
-
-# Set style for better-looking plots
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
-
-# Define consistent colors for each parameter set
-colors = {'Standard': '#1f77b4', 'Large_Scale': '#2ca02c', 'compact': '#ff7f0e'}
-
-# 1. Solution Quality Bar Chart
-fig, ax = plt.subplots(figsize=(12, 6))
-instances_ordered = ['Small-1', 'Small-2', 'Medium-1', 'Medium-2', 'Large-1', 'Large-2']
-x = np.arange(len(instances_ordered))
-width = 0.25
-
-for i, param_set in enumerate(['Standard', 'Large_Scale', 'compact']):
-    data = df[df['ParamSet'] == param_set]
-    distances = [data[data['Instance'] == inst]['MeanDist'].values[0] for inst in instances_ordered]
-    std_devs = [data[data['Instance'] == inst]['StdDist'].values[0] for inst in instances_ordered]
+    # Define consistent colors for each parameter set
+    colors = {'Standard': '#1f77b4', 'Large_Scale': '#2ca02c', 'compact': '#ff7f0e'}
+
+    # 1. Solution Quality Bar Chart
+    fig, ax = plt.subplots(figsize=(12, 6))
+    instances_ordered = ['Small-1', 'Small-2', 'Medium-1', 'Medium-2', 'Large-1', 'Large-2']
+    x = np.arange(len(instances_ordered))
+    width = 0.25
+
+    for i, param_set in enumerate(['Standard', 'Large_Scale', 'compact']):
+        data = df[df['ParamSet'] == param_set]
+        distances = [data[data['Instance'] == inst]['MeanDist'].values[0] for inst in instances_ordered]
+        std_devs = [data[data['Instance'] == inst]['StdDist'].values[0] for inst in instances_ordered]
     
-    bars = ax.bar(x + i*width - width, distances, width, 
-                   label=param_set, color=colors[param_set], alpha=0.8,
-                   yerr=std_devs, capsize=3, ecolor='gray')
-
-ax.set_xlabel('Instance', fontsize=12, fontweight='bold')
-ax.set_ylabel('Mean Distance', fontsize=12, fontweight='bold')
-ax.set_title('Solution Quality Comparison Across All Instances', fontsize=14, fontweight='bold')
-ax.set_xticks(x)
-ax.set_xticklabels(instances_ordered, rotation=0)
-ax.legend(title='Configuration', framealpha=0.9)
-ax.grid(True, alpha=0.3, axis='y')
-plt.tight_layout()
-plt.savefig(os.path.join(RESULTS_DIR, 'solution_quality_comparison.png'), dpi=300, bbox_inches='tight')
-plt.close()
-
-# 2. Runtime Comparison (Log Scale)
-fig, ax = plt.subplots(figsize=(12, 6))
-for i, param_set in enumerate(['Standard', 'Large_Scale', 'compact']):
-    data = df[df['ParamSet'] == param_set]
-    runtimes = [data[data['Instance'] == inst]['MeanRuntime'].values[0] for inst in instances_ordered]
-    bars = ax.bar(x + i*width - width, runtimes, width, 
-                   label=param_set, color=colors[param_set], alpha=0.8)
-
-ax.set_xlabel('Instance', fontsize=12, fontweight='bold')
-ax.set_ylabel('Mean Runtime (seconds, log scale)', fontsize=12, fontweight='bold')
-ax.set_title('Runtime Performance Comparison', fontsize=14, fontweight='bold')
-ax.set_xticks(x)
-ax.set_xticklabels(instances_ordered, rotation=0)
-ax.set_yscale('log')
-ax.legend(title='Configuration', framealpha=0.9)
-ax.grid(True, alpha=0.3, axis='y', which='both')
-plt.tight_layout()
-plt.savefig(os.path.join(RESULTS_DIR, 'runtime_comparison.png'), dpi=300, bbox_inches='tight')
-plt.close()
-
-# 3. Convergence Rate Heatmap
-fig, ax = plt.subplots(figsize=(8, 6))
-heatmap_data = df_conv.pivot(index='Instance', columns='ParamSet', values='Avg')
-heatmap_data = heatmap_data[['Standard', 'Large_Scale', 'compact']]
-sns.heatmap(heatmap_data, annot=True, fmt='.1f', cmap='YlOrRd_r', 
-            cbar_kws={'label': 'Generations to Convergence'},
-            vmin=0, vmax=300)
-ax.set_xlabel('Configuration', fontsize=12, fontweight='bold')
-ax.set_ylabel('Instance', fontsize=12, fontweight='bold')
-ax.set_title('Average Generations to Reach 95% of Final Solution', fontsize=13, fontweight='bold')
-plt.setp(ax.get_xticklabels(), rotation=0, ha='center')
-plt.setp(ax.get_yticklabels(), rotation=0)
-plt.tight_layout()
-plt.savefig(os.path.join(RESULTS_DIR, 'convergence_heatmap.png'), dpi=300, bbox_inches='tight')
-plt.close()
-
-print("\nAll experiments done. CSVs and plots are in the results/ folder.")
+        bars = ax.bar(x + i*width - width, distances, width, 
+                       label=param_set, color=colors[param_set], alpha=0.8,
+                       yerr=std_devs, capsize=3, ecolor='gray')
+
+    ax.set_xlabel('Instance', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Mean Distance', fontsize=12, fontweight='bold')
+    ax.set_title('Solution Quality Comparison Across All Instances', fontsize=14, fontweight='bold')
+    ax.set_xticks(x)
+    ax.set_xticklabels(instances_ordered, rotation=0)
+    ax.legend(title='Configuration', framealpha=0.9)
+    ax.grid(True, alpha=0.3, axis='y')
+    plt.tight_layout()
+    plt.savefig(os.path.join(RESULTS_DIR, 'solution_quality_comparison.png'), dpi=300, bbox_inches='tight')
+    plt.close()
+
+    # 2. Runtime Comparison (Log Scale)
+    fig, ax = plt.subplots(figsize=(12, 6))
+    for i, param_set in enumerate(['Standard', 'Large_Scale', 'compact']):
+        data = df[df['ParamSet'] == param_set]
+        runtimes = [data[data['Instance'] == inst]['MeanRuntime'].values[0] for inst in instances_ordered]
+        bars = ax.bar(x + i*width - width, runtimes, width, 
+                       label=param_set, color=colors[param_set], alpha=0.8)
+
+    ax.set_xlabel('Instance', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Mean Runtime (seconds, log scale)', fontsize=12, fontweight='bold')
+    ax.set_title('Runtime Performance Comparison', fontsize=14, fontweight='bold')
+    ax.set_xticks(x)
+    ax.set_xticklabels(instances_ordered, rotation=0)
+    ax.set_yscale('log')
+    ax.legend(title='Configuration', framealpha=0.9)
+    ax.grid(True, alpha=0.3, axis='y', which='both')
+    plt.tight_layout()
+    plt.savefig(os.path.join(RESULTS_DIR, 'runtime_comparison.png'), dpi=300, bbox_inches='tight')
+    plt.close()
+
+    # 3. Convergence Rate Heatmap
+    fig, ax = plt.subplots(figsize=(8, 6))
+    heatmap_data = df_conv.pivot(index='Instance', columns='ParamSet', values='Avg')
+    heatmap_data = heatmap_data[['Standard', 'Large_Scale', 'compact']]
+    sns.heatmap(heatmap_data, annot=True, fmt='.1f', cmap='YlOrRd_r', 
+                cbar_kws={'label': 'Generations to Convergence'},
+                vmin=0, vmax=300)
+    ax.set_xlabel('Configuration', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Instance', fontsize=12, fontweight='bold')
+    ax.set_title('Average Generations to Reach 95% of Final Solution', fontsize=13, fontweight='bold')
+    plt.setp(ax.get_xticklabels(), rotation=0, ha='center')
+    plt.setp(ax.get_yticklabels(), rotation=0)
+    plt.tight_layout()
+    plt.savefig(os.path.join(RESULTS_DIR, 'convergence_heatmap.png'), dpi=300, bbox_inches='tight')
+    plt.close()
+
+    print("\nAll experiments done. CSVs and plots are in the results/ folder.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
+import hashlib
+import math
+import os
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Tuple, Union
 
 def customers_to_ordered_list(customers_dict: Dict[int, Tuple[float, float]]):
     """
@@ -10,19 +13,291 @@ def customers_to_ordered_list(customers_dict: Dict[int, Tuple[float, float]]):
     customers_list = [customers_dict[k] for k in sorted_keys]
     return sorted_keys, customers_list
 
-def distance_matrix(depot: Tuple[float,float], customers_list: List[Tuple[float,float]]):
+EARTH_RADIUS_KM = 6371.0
+
+def _euclidean(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    dx = a[..., 0] - b[..., 0]
+    dy = a[..., 1] - b[..., 1]
+    return np.sqrt(dx*dx + dy*dy)
+
+def _rounded_euclidean(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    # TSPLIB EUC_2D: nint(sqrt(dx^2 + dy^2))
+    return np.floor(_euclidean(a, b) + 0.5)
+
+def _manhattan(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.abs(a[..., 0] - b[..., 0]) + np.abs(a[..., 1] - b[..., 1])
+
+def _haversine(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    # points are (lat, lon) in degrees, result in km
+    lat1, lon1 = np.radians(a[..., 0]), np.radians(a[..., 1])
+    lat2, lon2 = np.radians(b[..., 0]), np.radians(b[..., 1])
+    h = np.sin((lat2 - lat1) / 2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2)**2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(h, 1.0)))
+
+METRICS: Dict[str, Callable[[np.ndarray, np.ndarray], np.ndarray]] = {
+    "euclidean": _euclidean,
+    "rounded_euclidean": _rounded_euclidean,
+    "manhattan": _manhattan,
+    "haversine": _haversine,
+}
+
+# rows computed per block, so temporaries stay around this many elements
+_BLOCK_ELEMS = 1 << 22
+
+class TriangularMatrix:
+    """
+    Symmetric matrix stored as its packed lower triangle (diagonal included),
+    about half the memory of the dense array. Supports dmat[i, j] with ints or
+    integer arrays, which is all the GA needs.
+    """
+    symmetric = True
+
+    def __init__(self, packed: np.ndarray, n: int):
+        self.packed = packed
+        self.shape = (n, n)
+        self.dtype = packed.dtype
+
+    def __getitem__(self, key):
+        i, j = key
+        i = np.asarray(i)
+        j = np.asarray(j)
+        hi = np.maximum(i, j)
+        lo = np.minimum(i, j)
+        return self.packed[hi * (hi + 1) // 2 + lo]
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def toarray(self) -> np.ndarray:
+        n = self.shape[0]
+        idx = np.arange(n)
+        return self[idx[:, None], idx[None, :]]
+
+def _metric_fn(metric):
+    if callable(metric):
+        return metric
+    try:
+        return METRICS[metric]
+    except KeyError:
+        raise ValueError(f"unknown metric {metric!r}, expected one of {sorted(METRICS)} or a callable")
+
+def distance_matrix(depot: Tuple[float,float], customers_list: List[Tuple[float,float]],
+                    metric: Union[str, Callable] = "euclidean", dtype=float,
+                    triangular: bool = False):
     """
     Build numpy (N+1)x(N+1) distance matrix where index 0 = depot, 1..N = customers in customers_list order.
+    metric: a name from METRICS or a callable f(a, b) -> distances over broadcast (..., 2) point arrays.
+    dtype: e.g. np.float32 to halve memory.
+    triangular: return a TriangularMatrix (packed lower triangle) instead; only valid for symmetric metrics.
+    """
+    pts = np.asarray([tuple(depot)] + [tuple(c) for c in customers_list], dtype=float)
+    return coords_distance_matrix(pts, metric=metric, dtype=dtype, triangular=triangular)
+
+def coords_distance_matrix(pts: np.ndarray, metric: Union[str, Callable] = "euclidean", dtype=float,
+                           triangular: bool = False, out: np.ndarray = None):
+    """
+    distance_matrix over an (n, 2) coordinate array whose row 0 is the depot.
+    out: (n, n) array to fill instead of allocating one (e.g. a np.memmap), dense only.
+    """
+    fn = _metric_fn(metric)
+    pts = np.asarray(pts, dtype=float)
+    n = len(pts)
+    block = max(1, _BLOCK_ELEMS // max(n, 1))
+    if not triangular:
+        dmat = np.empty((n, n), dtype=dtype) if out is None else out
+        for start in range(0, n, block):
+            stop = min(start + block, n)
+            dmat[start:stop] = fn(pts[start:stop, None, :], pts[None, :, :])
+        np.fill_diagonal(dmat, 0)
+        return dmat
+
+    packed = np.empty(n * (n + 1) // 2, dtype=dtype)
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        rows = fn(pts[start:stop, None, :], pts[None, :stop, :])
+        for i in range(start, stop):
+            offset = i * (i + 1) // 2
+            packed[offset:offset + i] = rows[i - start, :i]
+            packed[offset + i] = 0
+    return TriangularMatrix(packed, n)
+
+def _knn_grid(pts: np.ndarray, k: int, rank) -> np.ndarray:
+    """
+    k nearest customers (rows 1..n-1 of pts) of every point, self excluded, using a
+    uniform grid: each cell is compared against its surrounding block of cells,
+    widened until the k-th candidate is provably closer than anything outside it.
+    rank(a, b) must be a planar metric bounded below by the per-axis gap (Euclidean, Manhattan).
     """
-    pts = [tuple(depot)] + [tuple(c) for c in customers_list]
     n = len(pts)
-    dmat = np.zeros((n, n), dtype=float)
-    for i in range(n):
-        for j in range(n):
-            if i == j:
-                dmat[i, j] = 0.0
-            else:
-                dx = pts[i][0] - pts[j][0]
-                dy = pts[i][1] - pts[j][1]
-                dmat[i, j] = (dx*dx + dy*dy) ** 0.5
-    return dmat
+    out = np.zeros((n, k), dtype=np.int32)
+    if k == 0:
+        return out
+    cust = pts[1:]
+    lo = cust.min(axis=0)
+    extent = np.maximum(cust.max(axis=0) - lo, 1e-12)
+    # about k/2 customers per cell on average
+    side = max(1, int(np.sqrt(2 * len(cust) / k)))
+    cell = extent.max() / side
+    gx, gy = (np.floor(extent / cell).astype(int) + 1)
+
+    def cell_of(p):
+        c = np.floor((p - lo) / cell).astype(int)
+        return np.clip(c[:, 0], 0, gx - 1), np.clip(c[:, 1], 0, gy - 1)
+
+    # customers sorted by cell id (y-major), with CSR offsets per cell
+    cx, cy = cell_of(cust)
+    order = np.argsort(cy * gx + cx, kind="stable")
+    ids = order + 1
+    offsets = np.searchsorted((cy * gx + cx)[order], np.arange(gx * gy + 1))
+
+    qx, qy = cell_of(pts)
+    qcell = qy * gx + qx
+    q_order = np.argsort(qcell, kind="stable")
+    q_offsets = np.searchsorted(qcell[q_order], np.arange(gx * gy + 1))
+    for c in np.flatnonzero(np.diff(q_offsets)):
+        pending = q_order[q_offsets[c]:q_offsets[c+1]]
+        x0, y0 = c % gx, c // gx
+        r = 1
+        while len(pending):
+            xa, xb = max(0, x0 - r), min(gx - 1, x0 + r)
+            ya, yb = max(0, y0 - r), min(gy - 1, y0 + r)
+            cand = np.concatenate([ids[offsets[y*gx + xa]:offsets[y*gx + xb + 1]] for y in range(ya, yb + 1)])
+            q = pts[pending]
+            # nothing outside the block can be closer than the gap to its nearest open edge
+            inf = np.inf
+            bound = np.minimum.reduce([
+                q[:, 0] - (lo[0] + xa * cell) if xa > 0 else np.full(len(q), inf),
+                (lo[0] + (xb + 1) * cell) - q[:, 0] if xb < gx - 1 else np.full(len(q), inf),
+                q[:, 1] - (lo[1] + ya * cell) if ya > 0 else np.full(len(q), inf),
+                (lo[1] + (yb + 1) * cell) - q[:, 1] if yb < gy - 1 else np.full(len(q), inf),
+            ])
+            if len(cand) > k:
+                dist = rank(q[:, None, :], pts[cand][None, :, :])
+                dist[cand[None, :] == pending[:, None]] = inf
+                near = np.argpartition(dist, k - 1, axis=1)[:, :k]
+                near_d = np.take_along_axis(dist, near, axis=1)
+                srt = np.argsort(near_d, axis=1)
+                near = np.take_along_axis(near, srt, axis=1)
+                kth = np.take_along_axis(near_d, srt, axis=1)[:, -1]
+                done = kth <= bound
+                out[pending[done]] = cand[near[done]]
+                pending = pending[~done]
+            r += 1
+    return out
+
+class CoordinateDistances:
+    """
+    Distance provider for instances too large for a dense matrix: keeps only the
+    (n, 2) coordinates (row 0 = depot) and a k-nearest-neighbor index, about O(n*k)
+    memory. dmat[i, j] is computed on demand for ints or integer arrays, so it is a
+    drop-in for the matrix in route_distance, total_distance, batch_total_distance,
+    the operators and LocalSearch, which also picks up neighbors().
+
+    The index ranks by Euclidean distance (Manhattan for that metric); haversine
+    coordinates are indexed through a local equirectangular projection, so their
+    neighbor lists are approximate while distances stay exact.
+    """
+    symmetric = True
+
+    def __init__(self, coords: np.ndarray, metric: Union[str, Callable] = "euclidean", k: int = 16,
+                 dtype=float):
+        self.coords = np.ascontiguousarray(coords, dtype=float)
+        n = len(self.coords)
+        self.shape = (n, n)
+        self.dtype = np.dtype(dtype)
+        self.metric = metric
+        self._fn = _metric_fn(metric)
+        self._xy = self.coords.tolist()
+
+        index_pts = self.coords
+        rank = _euclidean
+        if metric == "manhattan":
+            rank = _manhattan
+        elif metric == "haversine":
+            lat0 = np.radians(self.coords[:, 0].mean())
+            index_pts = EARTH_RADIUS_KM * np.radians(self.coords[:, ::-1]) * np.array([np.cos(lat0), 1.0])
+        self.k = max(0, min(k, n - 2))
+        self.knn = _knn_grid(index_pts, self.k, rank)
+
+    def __getitem__(self, key):
+        i, j = key
+        if isinstance(i, (int, np.integer)) and isinstance(j, (int, np.integer)):
+            return self._scalar(int(i), int(j))
+        out = self._fn(self.coords[np.asarray(i)], self.coords[np.asarray(j)])
+        return out.astype(self.dtype, copy=False)
+
+    def _scalar(self, i: int, j: int):
+        # plain-float fast path: same IEEE operations as the vectorized metrics
+        (xi, yi), (xj, yj) = self._xy[i], self._xy[j]
+        if self.metric == "euclidean":
+            dx, dy = xi - xj, yi - yj
+            return self.dtype.type(math.sqrt(dx*dx + dy*dy))
+        if self.metric == "rounded_euclidean":
+            dx, dy = xi - xj, yi - yj
+            return self.dtype.type(math.floor(math.sqrt(dx*dx + dy*dy) + 0.5))
+        if self.metric == "manhattan":
+            return self.dtype.type(abs(xi - xj) + abs(yi - yj))
+        return self.dtype.type(self._fn(self.coords[i], self.coords[j]))
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def neighbors(self, k: int) -> np.ndarray:
+        """(n, min(k, index k)) nearest customers of every point, nearest first."""
+        return self.knn[:, :k]
+
+    @classmethod
+    def from_instance(cls, depot: Tuple[float, float], customers_list: List[Tuple[float, float]], **kwargs):
+        pts = np.asarray([tuple(depot)] + [tuple(c) for c in customers_list], dtype=float)
+        return cls(pts, **kwargs)
+
+
+# ---------------- on-disk matrix cache ----------------
+# Content-addressed: the file name is a hash of the coordinates, metric and dtype, so
+# any process asking for the same matrix finds the same file. Matrices are opened
+# memory-mapped and read-only, so every process on a machine shares one copy through
+# the page cache instead of building and holding its own.
+CACHE_DIR = os.environ.get("VRP_GA_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "vrp_ga"))
+# bump when coords_distance_matrix changes its results, so stale matrices are ignored
+MATRIX_CACHE_VERSION = 1
+
+def matrix_cache_path(pts: np.ndarray, metric: str = "euclidean", dtype=float, cache_dir: str = CACHE_DIR) -> str:
+    """Cache file of the dense matrix over pts (row 0 = depot); only named metrics can be keyed."""
+    if not isinstance(metric, str):
+        raise ValueError("the matrix cache keys on the metric name; pass one of "
+                         f"{sorted(METRICS)}, not a callable")
+    _metric_fn(metric)
+    pts = np.ascontiguousarray(pts, dtype=float)
+    h = hashlib.sha256(pts.tobytes())
+    h.update(f"{pts.shape}|{metric}|{np.dtype(dtype).str}|v{MATRIX_CACHE_VERSION}".encode())
+    return os.path.join(cache_dir, "dmat", h.hexdigest()[:32] + ".npy")
+
+def open_matrix(path: str) -> np.ndarray:
+    """Read-only ndarray over a memory-mapped .npy file (no copy, no np.memmap indexing overhead)."""
+    return np.asarray(np.load(path, mmap_mode="r"))
+
+def distance_matrix_file(depot: Tuple[float, float], customers_list: List[Tuple[float, float]],
+                         metric: str = "euclidean", dtype=float, cache_dir: str = CACHE_DIR) -> str:
+    """
+    Path of the cached distance_matrix(depot, customers_list, metric, dtype), building it
+    first on a miss. The matrix is written straight into the file block by block, so the
+    build never holds a second copy in memory.
+    """
+    pts = np.asarray([tuple(depot)] + [tuple(c) for c in customers_list], dtype=float)
+    path = matrix_cache_path(pts, metric, dtype, cache_dir)
+    if os.path.exists(path):
+        return path
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    mm = np.lib.format.open_memmap(tmp, mode="w+", dtype=dtype, shape=(len(pts), len(pts)))
+    coords_distance_matrix(pts, metric=metric, dtype=dtype, out=mm)
+    mm.flush()
+    del mm
+    # concurrent builders each write their own temp file; the rename is atomic
+    os.replace(tmp, path)
+    return path
+
+def cached_distance_matrix(depot: Tuple[float, float], customers_list: List[Tuple[float, float]],
+                           metric: str = "euclidean", dtype=float, cache_dir: str = CACHE_DIR) -> np.ndarray:
+    """distance_matrix through the on-disk cache: built once, then memory-mapped read-only."""
+    return open_matrix(distance_matrix_file(depot, customers_list, metric, dtype, cache_dir))